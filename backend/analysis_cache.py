@@ -0,0 +1,128 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+import models
+from database import SessionLocal
+from metrics import record_analysis_timings
+from stl_settings import ANALYSIS_VERSION, DEFAULT_FILAMENT, DEFAULT_INFILL, LAYER_HEIGHT
+
+# Dosya özeti hesaplanırken okunacak parça boyutu
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Bellekte tutulacak en fazla analiz sonucu
+MEMORY_CACHE_SIZE = 512
+
+
+def file_sha256(file_path):
+    """Dosyanın SHA-256 özetini parça parça okuyarak hesaplar"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def analysis_params_key(filament_type=None, infill_ratio=None, layer_height=None):
+    """Analizi etkileyen parametrelerden önbellek anahtarı üretir"""
+    if filament_type is None:
+        filament_type = DEFAULT_FILAMENT
+    if infill_ratio is None:
+        infill_ratio = DEFAULT_INFILL
+    if layer_height is None:
+        layer_height = LAYER_HEIGHT
+    return f"v{ANALYSIS_VERSION}:{filament_type}:{float(infill_ratio)}:{float(layer_height)}"
+
+
+class AnalysisCache:
+    """STL analiz sonuçları için iki katmanlı önbellek
+
+    Sık kullanılan sonuçlar bellekteki LRU katmanında tutulur; tüm sonuçlar
+    ayrıca veritabanına yazılır, böylece yeniden başlatmalardan sonra da aynı
+    dosya tekrar ayrıştırılmaz.
+    """
+
+    def __init__(self, max_entries=MEMORY_CACHE_SIZE, session_factory=SessionLocal):
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_hash, params_key):
+        key = (file_hash, params_key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return dict(self._entries[key])
+
+        db = self.session_factory()
+        try:
+            row = db.query(models.STLAnalysisCache).filter(
+                models.STLAnalysisCache.file_hash == file_hash,
+                models.STLAnalysisCache.params_key == params_key
+            ).first()
+        finally:
+            db.close()
+
+        if row is None:
+            return None
+
+        result = json.loads(row.result)
+        self._remember(key, result)
+        return dict(result)
+
+    def set(self, file_hash, params_key, result):
+        self._remember((file_hash, params_key), result)
+
+        db = self.session_factory()
+        try:
+            db.add(models.STLAnalysisCache(
+                file_hash=file_hash,
+                params_key=params_key,
+                result=json.dumps(result),
+                created_at=datetime.now().isoformat()
+            ))
+            db.commit()
+        except IntegrityError:
+            # Aynı sonuç başka bir istek tarafından zaten yazılmış
+            db.rollback()
+        finally:
+            db.close()
+
+    def clear_memory(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+analysis_cache = AnalysisCache()
+
+
+def analyze_stl_file_cached(stl_file_path, filament_type=None, infill_ratio=None, file_hash=None):
+    """STL dosyasını analiz eder, aynı içerik daha önce analiz edildiyse önbellekten döner"""
+    if file_hash is None:
+        file_hash = file_sha256(stl_file_path)
+    params_key = analysis_params_key(filament_type, infill_ratio)
+
+    cached = analysis_cache.get(file_hash, params_key)
+    if cached is not None:
+        return cached
+
+    # Geometri kütüphaneleri yalnızca gerçekten analiz gerektiğinde yüklenir
+    from stl_analyzer import STLAnalyzer
+    analyzer = STLAnalyzer()
+    result = analyzer.analyze_stl_file(stl_file_path, filament_type, infill_ratio)
+    record_analysis_timings(analyzer.phase_timings, succeeded=result is not None)
+    if result is not None:
+        analysis_cache.set(file_hash, params_key, result)
+    return result
@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, update
+
+import models
+from analysis_cache import analysis_cache, analysis_params_key, file_sha256
+from database import SessionLocal
+from log_config import setup_worker_logging
+from metrics import record_analysis_timings
+from upload_storage import UPLOADS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Analiz için kullanılacak işlem sayısı (varsayılan: çekirdek sayısı)
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", "0")) or None
+
+# Bu süreden uzun "İşleniyor" kalan işin işlemi çökmüş sayılır, iş yeniden alınabilir
+ANALYSIS_JOB_STALE_SECONDS = int(os.environ.get("ANALYSIS_JOB_STALE_SECONDS", "3600"))
+
+JOB_PENDING = "Beklemede"
+JOB_RUNNING = "İşleniyor"
+JOB_COMPLETED = "Tamamlandı"
+JOB_FAILED = "Hata"
+
+
+def run_analysis(stl_file_path, filament_type=None, infill_ratio=None):
+    """Ayrı bir işlemde çalışan STL analizi
+
+    Dönüş: (sonuç, aşama süreleri); süreler ana işlemde metriklere eklenir.
+    """
+    # numpy ve geometri modülleri yalnızca analiz işlemlerinde yüklenir
+    from stl_analyzer import STLAnalyzer
+    analyzer = STLAnalyzer()
+    result = analyzer.analyze_stl_file(stl_file_path, filament_type, infill_ratio)
+    return result, analyzer.phase_timings
+
+
+class AnalysisJobQueue:
+    """STL analizlerini istek işleyicisinden ayırıp işlem havuzunda çalıştırır
+
+    Her iş veritabanındaki analysis_jobs tablosuna yazılır; sonuç geldiğinde
+    iş güncellenir, sonuç önbelleğe alınır ve aynı dosyayı bekleyen özel
+    tasarım kayıtlarına eklenir. Bir iş yalnızca durumunu koşullu UPDATE ile
+    "İşleniyor" yapabilen işlemde çalışır; birden çok uvicorn işçisi aynı
+    işi iki kez çalıştırmaz.
+    """
+
+    def __init__(self, session_factory=SessionLocal, cache=analysis_cache,
+                 uploads_dir=UPLOADS_DIR, max_workers=ANALYSIS_WORKERS):
+        self.session_factory = session_factory
+        self.cache = cache
+        self.uploads_dir = uploads_dir
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        # Sonuçlar havuzun yönetim iş parçacığında değil, ayrı bir iş parçacığında yazılır
+        self._results = queue.Queue()
+        self._result_thread = None
+
+    def get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=setup_worker_logging
+                )
+            if self._result_thread is None:
+                self._result_thread = threading.Thread(
+                    target=self._write_results, name="analysis-results", daemon=True
+                )
+                self._result_thread.start()
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            if self._result_thread is not None:
+                # Havuz kapandığında tüm sonuçlar kuyruktadır; hepsi yazılınca iş parçacığı biter
+                self._results.put(None)
+                self._result_thread.join()
+                self._result_thread = None
+
+    def submit(self, db, file_path, filament_type=None, infill_ratio=None, file_hash=None):
+        """Analiz işi oluşturur; sonuç önbellekteyse iş hemen tamamlanmış döner"""
+        stl_file_path = os.path.join(self.uploads_dir, file_path)
+        if file_hash is None:
+            file_hash = file_sha256(stl_file_path)
+        params_key = analysis_params_key(filament_type, infill_ratio)
+
+        # Aynı dosya için bekleyen ya da çalışan bir iş varsa onu kullan
+        pending_job = db.query(models.AnalysisJob).filter(
+            models.AnalysisJob.file_hash == file_hash,
+            models.AnalysisJob.params_key == params_key,
+            models.AnalysisJob.status.in_((JOB_PENDING, JOB_RUNNING))
+        ).first()
+        if pending_job:
+            return pending_job
+
+        job = models.AnalysisJob(
+            file_path=file_path,
+            file_hash=file_hash,
+            params_key=params_key,
+            filament_type=filament_type,
+            infill_ratio=infill_ratio,
+            created_at=datetime.now().isoformat()
+        )
+
+        cached = self.cache.get(file_hash, params_key)
+        if cached is not None:
+            job.status = JOB_COMPLETED
+            job.result = json.dumps(cached)
+            job.finished_at = job.created_at
+        else:
+            # Yeni iş bu işlem tarafından alınmış olarak yazılır, başka işçi onu devralmaz
+            job.status = JOB_RUNNING
+            job.started_at = job.created_at
+
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        if job.status == JOB_RUNNING:
+            self._dispatch(job.id, stl_file_path, filament_type, infill_ratio, file_hash, params_key)
+        return job
+
+    def resume_pending(self, stale_seconds=ANALYSIS_JOB_STALE_SECONDS):
+        """Yeniden başlatma sonrası yarım kalan işleri tekrar kuyruğa alır
+
+        Bekleyen işler ve işlemi çökmüş gibi görünen eski "İşleniyor" işler
+        tek tek alınmaya çalışılır; yalnızca alınabilenler çalıştırılır.
+        Dönüş: bu işlemin kuyruğa aldığı iş sayısı
+        """
+        stale_before = (datetime.now() - timedelta(seconds=stale_seconds)).isoformat()
+        db = self.session_factory()
+        try:
+            jobs = db.query(models.AnalysisJob).filter(self._claimable(stale_before)).all()
+            claimed = [job for job in jobs if self._claim(db, job.id, stale_before)]
+            for job in claimed:
+                stl_file_path = os.path.join(self.uploads_dir, job.file_path)
+                self._dispatch(job.id, stl_file_path, job.filament_type, job.infill_ratio,
+                               job.file_hash, job.params_key)
+            return len(claimed)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _claimable(stale_before):
+        table = models.AnalysisJob.__table__
+        return or_(
+            table.c.status == JOB_PENDING,
+            and_(table.c.status == JOB_RUNNING, table.c.started_at < stale_before)
+        )
+
+    def _claim(self, db, job_id, stale_before):
+        """İşi koşullu UPDATE ile bu işleme alır; başka bir işlem önce aldıysa False döner"""
+        table = models.AnalysisJob.__table__
+        result = db.execute(
+            update(table)
+            .where(table.c.id == job_id, self._claimable(stale_before))
+            .values(status=JOB_RUNNING, started_at=datetime.now().isoformat())
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _dispatch(self, job_id, stl_file_path, filament_type, infill_ratio, file_hash, params_key):
+        future = self.get_executor().submit(run_analysis, stl_file_path, filament_type, infill_ratio)
+        future.add_done_callback(
+            lambda f: self._results.put((job_id, file_hash, params_key, f))
+        )
+
+    def _write_results(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            self._on_done(*item)
+
+    def _on_done(self, job_id, file_hash, params_key, future):
+        """Sonucu önbelleğe ve veritabanına yazar; sonuç iş parçacığında çalışır"""
+        try:
+            result, timings = future.result()
+            error = None if result is not None else "STL dosyası analiz edilemedi"
+        except Exception as e:
+            result, timings, error = None, None, str(e)
+        record_analysis_timings(timings, succeeded=result is not None)
+
+        if result is not None:
+            self.cache.set(file_hash, params_key, result)
+
+        db = self.session_factory()
+        try:
+            job = db.query(models.AnalysisJob).filter(models.AnalysisJob.id == job_id).first()
+            if job is None:
+                return
+            job.status = JOB_COMPLETED if result is not None else JOB_FAILED
+            job.result = json.dumps(result) if result is not None else None
+            job.error = error
+            job.finished_at = datetime.now().isoformat()
+            # Özel tasarımlara yalnızca varsayılan ayarlarla yapılan analiz eklenir
+            if result is not None and job.params_key == analysis_params_key():
+                attach_analysis_result(db, job.file_path, result)
+            db.commit()
+        except Exception as e:
+            logger.exception("Analiz işi güncellenemedi", extra={"job_id": job_id})
+            db.rollback()
+        finally:
+            db.close()
+
+    def get(self, db, job_id):
+        return db.query(models.AnalysisJob).filter(models.AnalysisJob.id == job_id).first()
+
+
+def attach_analysis_result(db, file_path, result):
+    """Analizi henüz eklenmemiş özel tasarımlara sonuçları yazar (commit çağırana aittir)"""
+    db.query(models.CustomDesign).filter(
+        models.CustomDesign.file_path == file_path,
+        models.CustomDesign.weight_grams.is_(None)
+    ).update({
+        'weight_grams': result['weight_grams'],
+        'print_time_hours': result['print_time_hours'],
+        'sales_price': result['sales_price'],
+        'infill_ratio': result['infill_ratio']
+    }, synchronize_session=False)
+
+
+analysis_jobs = AnalysisJobQueue()
@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from analysis_cache import analysis_cache, analysis_params_key, file_sha256
+from analysis_jobs import run_analysis
+from log_config import setup_worker_logging
+from metrics import record_analysis_timings
+from upload_storage import UPLOADS_DIR, content_addressed_name
+
+_SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def resolve_stl_path(item, uploads_dir=UPLOADS_DIR, allow_outside=False):
+    """Dosya adı, SHA-256 özeti veya (CLI için) tam yoldan STL dosya yolunu bulur"""
+    if _SHA256_PATTERN.match(item):
+        return os.path.join(uploads_dir, content_addressed_name(item))
+    if allow_outside and os.path.exists(item):
+        return item
+    if os.path.basename(item) != item:
+        raise ValueError("Geçersiz dosya adı")
+    return os.path.join(uploads_dir, item)
+
+
+def iter_batch_analysis(items, executor, filament_type=None, infill_ratio=None,
+                        cache=analysis_cache, uploads_dir=UPLOADS_DIR, allow_outside=False):
+    """Dosyaları işlem havuzunda paralel analiz eder, her sonucu biter bitmez üretir
+
+    Önce dosya özetleri hesaplanır; önbellekte sonucu olan dosyalar hemen
+    döner, diğerleri analiz için havuza gönderilir. Sonuçların sırası
+    tamamlanma sırasıdır; aynı içerikli dosyalar tek kez analiz edilir.
+    """
+    params_key = analysis_params_key(filament_type, infill_ratio)
+    hash_futures = {}
+    analysis_futures = {}
+    waiting_items = {}
+
+    for item in items:
+        try:
+            stl_file_path = resolve_stl_path(item, uploads_dir, allow_outside)
+            if not os.path.exists(stl_file_path):
+                raise FileNotFoundError("STL dosyası bulunamadı")
+        except (ValueError, FileNotFoundError) as e:
+            yield {"item": item, "status": "error", "error": str(e)}
+            continue
+        hash_futures[executor.submit(file_sha256, stl_file_path)] = (item, stl_file_path)
+
+    while hash_futures or analysis_futures:
+        done, _ = wait(list(hash_futures) + list(analysis_futures), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future in hash_futures:
+                item, stl_file_path = hash_futures.pop(future)
+                try:
+                    file_hash = future.result()
+                except Exception as e:
+                    yield {"item": item, "status": "error", "error": str(e)}
+                    continue
+
+                cached = cache.get(file_hash, params_key) if cache is not None else None
+                if cached is not None:
+                    yield {"item": item, "sha256": file_hash, "status": "ok", "cached": True, "analysis": cached}
+                    continue
+
+                # Aynı içerik zaten analiz ediliyorsa sonucunu bekle
+                if file_hash in waiting_items:
+                    waiting_items[file_hash].append(item)
+                    continue
+
+                waiting_items[file_hash] = [item]
+                analysis_future = executor.submit(run_analysis, stl_file_path, filament_type, infill_ratio)
+                analysis_futures[analysis_future] = file_hash
+            else:
+                file_hash = analysis_futures.pop(future)
+                same_content_items = waiting_items.pop(file_hash)
+                try:
+                    result, timings = future.result()
+                except Exception as e:
+                    result, timings, error = None, None, str(e)
+                else:
+                    error = "STL dosyası analiz edilemedi"
+                record_analysis_timings(timings, succeeded=result is not None)
+
+                if result is not None and cache is not None:
+                    cache.set(file_hash, params_key, result)
+
+                for item in same_content_items:
+                    if result is None:
+                        yield {"item": item, "sha256": file_hash, "status": "error", "error": error}
+                    else:
+                        yield {"item": item, "sha256": file_hash, "status": "ok", "cached": False, "analysis": result}
+
+
+def iter_ndjson(results):
+    for result in results:
+        yield json.dumps(result, ensure_ascii=False) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STL dosyalarını toplu analiz eder, sonuçları NDJSON olarak yazar")
+    parser.add_argument("items", nargs="*", help="Dosya yolları, uploads içindeki dosya adları veya SHA-256 özetleri")
+    parser.add_argument("--all", action="store_true", help="uploads klasöründeki tüm STL dosyalarını analiz et")
+    parser.add_argument("--filament", default=None, help="Filament tipi (PLA, ABS, PETG, TPU, PC)")
+    parser.add_argument("--infill", type=float, default=None, help="Dolgu oranı (0-1 arası)")
+    parser.add_argument("--workers", type=int, default=None, help="İşlem sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--no-cache", action="store_true", help="Önbelleği kullanma")
+    args = parser.parse_args(argv)
+
+    items = list(args.items)
+    if args.all:
+        items += sorted(f for f in os.listdir(UPLOADS_DIR) if f.lower().endswith(".stl"))
+    if not items:
+        parser.error("En az bir dosya verin veya --all kullanın")
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=setup_worker_logging) as executor:
+        results = iter_batch_analysis(
+            items, executor, args.filament, args.infill,
+            cache=None if args.no_cache else analysis_cache, allow_outside=True
+        )
+        for line in iter_ndjson(results):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
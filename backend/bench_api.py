@@ -0,0 +1,345 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+# Varsayılan trafik karışımı (senaryo ağırlıkları)
+DEFAULT_MIX = "browse=60,cart=20,checkout=15,upload=5"
+
+# Tohum verisindeki ürün adları için kelimeler
+PRODUCT_WORDS = ("vazo", "saksı", "anahtarlık", "figür", "lamba", "kutu", "tutucu", "dişli", "maket", "stand")
+CATEGORIES = ("dekorasyon", "aksesuar", "oyuncak", "yedek parça")
+
+# Karşılaştırmada gerileme sayılması için p95 artışı (oran ve en az milisaniye)
+REGRESSION_TOLERANCE = 0.2
+REGRESSION_MIN_MS = 1.0
+
+
+def parse_mix(spec):
+    """'browse=60,cart=20' biçimini {senaryo: ağırlık} sözlüğüne çevirir"""
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition("=")
+        if not name:
+            continue
+        if name not in SCENARIOS:
+            raise ValueError(f"Bilinmeyen senaryo: {name}")
+        mix[name] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Trafik karışımı boş olamaz")
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik değeri döner"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def cube_stl(size_mm):
+    """Verilen kenar uzunluğunda ikili STL küp içeriği üretir"""
+    s = float(size_mm)
+    corners = [(x, y, z) for x in (0.0, s) for y in (0.0, s) for z in (0.0, s)]
+    # Her yüz iki üçgen; köşe indeksleri dışa bakan sırayla
+    faces = [
+        (0, 2, 3), (0, 3, 1), (4, 5, 7), (4, 7, 6), (0, 1, 5), (0, 5, 4),
+        (2, 6, 7), (2, 7, 3), (0, 4, 6), (0, 6, 2), (1, 3, 7), (1, 7, 5),
+    ]
+    data = bytearray(b"bench cube".ljust(80, b" "))
+    data += struct.pack("<I", len(faces))
+    for face in faces:
+        data += struct.pack("<3f", 0.0, 0.0, 0.0)
+        for index in face:
+            data += struct.pack("<3f", *corners[index])
+        data += struct.pack("<H", 0)
+    return bytes(data)
+
+
+def seed_database(session_factory, products=500, users=50, seed=0):
+    """Ölçüm veritabanını ürün ve kullanıcılarla doldurur"""
+    import models
+
+    rng = random.Random(seed)
+    db = session_factory()
+    try:
+        db.add_all([
+            models.Product(
+                name=f"{rng.choice(PRODUCT_WORDS).capitalize()} {rng.choice(PRODUCT_WORDS)} {i}",
+                description=f"{rng.choice(PRODUCT_WORDS)} ve {rng.choice(PRODUCT_WORDS)} için baskı",
+                price=round(rng.uniform(20, 900), 2),
+                stock=10 ** 6,
+                category=rng.choice(CATEGORIES),
+            )
+            for i in range(products)
+        ])
+        db.add_all([
+            models.User(username=f"bench{i}", email=f"bench{i}@example.com", password_hash="-",
+                        full_name=f"Ölçüm Kullanıcısı {i}", phone=f"555{i:07d}")
+            for i in range(users)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+class LoadRecorder:
+    """Uç nokta başına gecikmeleri ve hataları toplar"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.enabled = True
+
+    async def request(self, client, label, method, url, expected=(200,), **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - started
+        if self.enabled:
+            self.latencies.setdefault(label, []).append(elapsed)
+            if response.status_code not in expected:
+                self.errors[label] = self.errors.get(label, 0) + 1
+        return response
+
+    def report(self, wall_seconds):
+        endpoints = {}
+        for label, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            endpoints[label] = {
+                "count": len(values),
+                "errors": self.errors.get(label, 0),
+                "throughput_rps": round(len(values) / wall_seconds, 2),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        total = sum(e["count"] for e in endpoints.values())
+        return {
+            "wall_seconds": round(wall_seconds, 3),
+            "total_requests": total,
+            "total_errors": sum(e["errors"] for e in endpoints.values()),
+            "throughput_rps": round(total / wall_seconds, 2) if wall_seconds else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+# Senaryolar: gerçek bir müşterinin ardışık istekleri
+async def browse(client, recorder, ctx):
+    response = await recorder.request(client, "GET /products/", "GET", "/products/",
+                                      params={"limit": 20, "category": ctx.rng.choice(CATEGORIES)})
+    cursor = response.headers.get("X-Next-Cursor")
+    if cursor and ctx.rng.random() < 0.5:
+        await recorder.request(client, "GET /products/?cursor", "GET", "/products/",
+                               params={"limit": 20, "cursor": cursor})
+    await recorder.request(client, "GET /products/{product_id}", "GET", f"/products/{ctx.random_product()}")
+    await recorder.request(client, "GET /products/search", "GET", "/products/search",
+                           params={"q": ctx.rng.choice(PRODUCT_WORDS)})
+
+
+async def cart(client, recorder, ctx):
+    for _ in range(ctx.rng.randint(1, 3)):
+        await recorder.request(client, "POST /user/cart/{user_id}/add", "POST", f"/user/cart/{ctx.user_id}/add",
+                               json={"product_id": ctx.random_product(), "quantity": ctx.rng.randint(1, 3)})
+    response = await recorder.request(client, "GET /user/cart/{user_id}", "GET", f"/user/cart/{ctx.user_id}")
+    items = response.json().get("cart", []) if response.status_code == 200 else []
+    if items:
+        item = ctx.rng.choice(items)
+        await recorder.request(client, "DELETE /user/cart/{user_id}/remove/{cart_item_id}", "DELETE",
+                               f"/user/cart/{ctx.user_id}/remove/{item['id']}")
+
+
+async def checkout(client, recorder, ctx):
+    await recorder.request(client, "POST /user/cart/{user_id}/add", "POST", f"/user/cart/{ctx.user_id}/add",
+                           json={"product_id": ctx.random_product(), "quantity": 1})
+    response = await recorder.request(client, "GET /user/cart/{user_id}", "GET", f"/user/cart/{ctx.user_id}")
+    items = response.json().get("cart", []) if response.status_code == 200 else []
+    if not items:
+        return
+    customer_name = f"Ölçüm Kullanıcısı {ctx.user_id}"
+    customer_phone = f"555{ctx.user_id:07d}"
+    await recorder.request(client, "POST /orders/", "POST", "/orders/", json={
+        "customer_name": customer_name,
+        "customer_address": "Test Mah. 1",
+        "customer_phone": customer_phone,
+        "total_price": sum(item["product_price"] * item["quantity"] for item in items),
+        "products": ",".join(f"{item['product_id']}x{item['quantity']}" for item in items),
+    })
+    await recorder.request(client, "DELETE /user/cart/{user_id}/clear", "DELETE", f"/user/cart/{ctx.user_id}/clear")
+    await recorder.request(client, "GET /user/orders/{customer_name}/{customer_phone}", "GET",
+                           f"/user/orders/{customer_name}/{customer_phone}")
+
+
+async def upload(client, recorder, ctx):
+    content = ctx.rng.choice(ctx.stl_files)
+    await recorder.request(client, "POST /upload-stl/", "POST", "/upload-stl/",
+                           params={"name": "Ölçüm", "description": "yük testi"},
+                           files={"file": ("bench.stl", content, "application/octet-stream")})
+
+
+SCENARIOS = {"browse": browse, "cart": cart, "checkout": checkout, "upload": upload}
+
+
+class UserContext:
+    def __init__(self, user_id, rng, product_ids, stl_files):
+        self.user_id = user_id
+        self.rng = rng
+        self.product_ids = product_ids
+        self.stl_files = stl_files
+
+    def random_product(self):
+        return self.rng.choice(self.product_ids)
+
+
+async def run_load(app, product_ids, user_ids, scenarios=500, concurrency=10, mix=DEFAULT_MIX,
+                   warmup=20, seed=0, stl_variants=4):
+    """Uygulamayı işlem içinde ASGI üzerinden karışık trafikle yükler, raporu döner"""
+    import httpx
+
+    weights = parse_mix(mix)
+    names = list(weights)
+    rng = random.Random(seed)
+    stl_files = [cube_stl(10 + 5 * i) for i in range(stl_variants)]
+    recorder = LoadRecorder()
+    # Her sanal kullanıcının kendi rastgele akışı: sonuçlar tohuma göre tekrarlanabilir
+    plan = rng.choices(names, weights=[weights[name] for name in names], k=warmup + scenarios)
+    queue = asyncio.Queue()
+    for name in plan:
+        queue.put_nowait(name)
+
+    async def worker(index):
+        ctx = UserContext(user_ids[index % len(user_ids)], random.Random(seed * 1000 + index), product_ids, stl_files)
+        while True:
+            try:
+                name = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await SCENARIOS[name](client, recorder, ctx)
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Isınma: ilk istekler (önbellekler, tembel içe aktarmalar) ölçüme girmez
+            recorder.enabled = False
+            warmup_ctx = UserContext(user_ids[0], random.Random(seed), product_ids, stl_files)
+            for _ in range(warmup):
+                await SCENARIOS[queue.get_nowait()](client, recorder, warmup_ctx)
+            recorder.enabled = True
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(i) for i in range(concurrency)))
+            wall_seconds = time.perf_counter() - started
+
+    report = recorder.report(wall_seconds)
+    report["scenario_counts"] = {name: plan[warmup:].count(name) for name in names}
+    return report
+
+
+def git_commit():
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def run_benchmark(workdir, products=500, users=50, **load_options):
+    """Geçici veritabanını tohumlar, uygulamayı içe aktarıp yük testini çalıştırır
+
+    Veritabanı ve yükleme klasörü ortam değişkenleriyle verilir; bu yüzden
+    main bu fonksiyondan önce içe aktarılmış olmamalıdır.
+    """
+    if "main" in sys.modules:
+        raise RuntimeError("main zaten içe aktarılmış; ölçüm ayrı bir işlemde çalıştırılmalı")
+
+    uploads_dir = os.path.join(workdir, "uploads")
+    os.makedirs(uploads_dir, exist_ok=True)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["UPLOADS_DIR"] = uploads_dir
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    import database
+    import models
+
+    models.Base.metadata.create_all(bind=database.engine)
+    seed_database(database.SessionLocal, products=products, users=users, seed=load_options.get("seed", 0))
+
+    import main as api
+
+    db = database.SessionLocal()
+    try:
+        product_ids = [row[0] for row in db.query(models.Product.id)]
+        user_ids = [row[0] for row in db.query(models.User.id)]
+    finally:
+        db.close()
+
+    report = asyncio.run(run_load(api.app, product_ids, user_ids, **load_options))
+    report["config"] = dict(load_options, products=products, users=users)
+    report["commit"] = git_commit()
+    report["python"] = sys.version.split()[0]
+    return report
+
+
+def compare_reports(baseline, current, tolerance=REGRESSION_TOLERANCE, min_ms=REGRESSION_MIN_MS):
+    """İki rapordaki uç noktaların p95 sürelerini karşılaştırır, gerilemeleri döner"""
+    regressions = []
+    for label, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(label)
+        if before is None:
+            continue
+        delta = now["p95_ms"] - before["p95_ms"]
+        if delta > min_ms and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append({"endpoint": label, "baseline_p95_ms": before["p95_ms"],
+                                "current_p95_ms": now["p95_ms"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API'yi işlem içinde karışık trafikle yükler, uç nokta başına gecikmeleri JSON olarak yazar")
+    parser.add_argument("--scenarios", type=int, default=500, help="Ölçülecek senaryo sayısı")
+    parser.add_argument("--concurrency", type=int, default=10, help="Eşzamanlı sanal kullanıcı sayısı")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Senaryo ağırlıkları (varsayılan: {DEFAULT_MIX})")
+    parser.add_argument("--warmup", type=int, default=20, help="Ölçüme girmeyen ısınma senaryoları")
+    parser.add_argument("--products", type=int, default=500, help="Tohum ürün sayısı")
+    parser.add_argument("--users", type=int, default=50, help="Tohum kullanıcı sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="Rastgelelik tohumu")
+    parser.add_argument("--output", help="Raporu bu dosyaya da yaz")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki rapor; gerileme varsa çıkış kodu 1")
+    args = parser.parse_args(argv)
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with tempfile.TemporaryDirectory(prefix="yildizcraft-bench-") as workdir:
+        report = run_benchmark(
+            workdir, products=args.products, users=args.users, scenarios=args.scenarios,
+            concurrency=args.concurrency, mix=args.mix, warmup=args.warmup, seed=args.seed,
+        )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare_reports(json.load(f), report)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+# python -X importtime satırı: "import time: self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# API işleminde yüklenmemesi gereken ağır modüller
+HEAVY_MODULES = ("numpy", "stl", "stl_analyzer", "stl_slicer", "stl_reader")
+
+
+def measure_import(module, python=sys.executable):
+    """Modülü temiz bir Python işleminde içe aktarır, modül başına süreleri döner"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=backend_dir, capture_output=True, text=True
+    )
+    wall_seconds = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+
+    loaded = {m["module"] for m in modules}
+    return {
+        "target": module,
+        "wall_seconds": round(wall_seconds, 3),
+        "module_count": len(modules),
+        "heavy_modules": [name for name in HEAVY_MODULES if name in loaded],
+        "modules": modules,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API modüllerinin içe aktarma sürelerini ölçer")
+    parser.add_argument("modules", nargs="*", default=["main"], help="Ölçülecek modüller (varsayılan: main)")
+    parser.add_argument("--top", type=int, default=15, help="En yavaş kaç modül listelensin")
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    reports = [measure_import(module) for module in args.modules]
+    if args.json:
+        for report in reports:
+            report["modules"] = sorted(report["modules"], key=lambda m: -m["cumulative_ms"])[:args.top]
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+        return
+
+    for report in reports:
+        print(f"⏱️  import {report['target']}: {report['wall_seconds'] * 1000:.0f} ms "
+              f"({report['module_count']} modül)")
+        if report["heavy_modules"]:
+            print(f"⚠️  Ağır modüller yüklendi: {', '.join(report['heavy_modules'])}")
+        slowest = sorted(report["modules"], key=lambda m: -m["cumulative_ms"])[:args.top]
+        for m in slowest:
+            print(f"   {m['cumulative_ms']:9.1f} ms  {m['self_ms']:8.1f} ms  {m['module']}")
+
+
+if __name__ == "__main__":
+    main()
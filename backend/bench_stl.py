@@ -0,0 +1,292 @@
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from stl_analyzer import STLAnalyzer
+from stl_reader import BINARY_RECORD_DTYPE
+
+# Varsayılan üçgen sayıları ve şekiller
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 5_000_000)
+SHAPES = ("cube", "sphere", "torus")
+FORMATS = ("binary", "ascii")
+
+# Şekil ölçüleri (mm)
+CUBE_SIZE = 40.0
+SPHERE_RADIUS = 25.0
+TORUS_MAJOR_RADIUS = 30.0
+TORUS_MINOR_RADIUS = 10.0
+
+# ASCII dosyada bir üçgen; float32 değerleri kayıpsız yazmak için 9 anlamlı basamak
+_ASCII_FACET = (
+    "facet normal %.9g %.9g %.9g\n outer loop\n"
+    "  vertex %.9g %.9g %.9g\n  vertex %.9g %.9g %.9g\n  vertex %.9g %.9g %.9g\n"
+    " endloop\nendfacet"
+)
+
+
+def grid_triangles(points):
+    """(satır, sütun, 3) nokta ızgarasını üçgenlere böler, dejenere üçgenleri atar
+
+    Komşu ızgaralar ve kapanan dikişler aynı nokta değerlerini paylaştığı
+    için kenarlar bit düzeyinde eşleşir ve yüzey kapalı kalır.
+    """
+    a = points[:-1, :-1]
+    b = points[1:, :-1]
+    c = points[1:, 1:]
+    d = points[:-1, 1:]
+    vectors = np.concatenate([
+        np.stack([a, b, c], axis=-2).reshape(-1, 3, 3),
+        np.stack([a, c, d], axis=-2).reshape(-1, 3, 3),
+    ])
+    # Kutuplarda iki köşesi çakışan üçgenler
+    same = (
+        np.all(vectors[:, 0] == vectors[:, 1], axis=1)
+        | np.all(vectors[:, 1] == vectors[:, 2], axis=1)
+        | np.all(vectors[:, 0] == vectors[:, 2], axis=1)
+    )
+    return vectors[~same]
+
+
+def _orient_outward(vectors, center):
+    """Üçgenlerin dışa bakmasını sağlar (tek parça yüzeyler için)"""
+    v0, v1, v2 = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+    normals = np.cross(v1 - v0, v2 - v0)
+    if np.einsum('ij,ij->', normals.astype(np.float64), (v0 - center).astype(np.float64)) < 0:
+        vectors = vectors[:, ::-1]
+    return vectors
+
+
+def cube_mesh(target_triangles, size=CUBE_SIZE):
+    """Her yüzü n x n ızgaraya bölünmüş küp; hacim size³"""
+    n = max(1, round(math.sqrt(target_triangles / 12)))
+    ticks = np.linspace(0.0, size, n + 1, dtype=np.float32)
+    center = np.full(3, size / 2)
+    faces = []
+    for axis in range(3):
+        u_axis, v_axis = [a for a in range(3) if a != axis]
+        for value in (ticks[0], ticks[-1]):
+            points = np.empty((n + 1, n + 1, 3), dtype=np.float32)
+            points[..., axis] = value
+            points[..., u_axis] = ticks[:, None]
+            points[..., v_axis] = ticks[None, :]
+            faces.append(_orient_outward(grid_triangles(points), center))
+    return np.ascontiguousarray(np.concatenate(faces)), size ** 3
+
+
+def sphere_mesh(target_triangles, radius=SPHERE_RADIUS):
+    """Enlem/boylam küresi; kutuplar tek noktada, boylam dikişi kapalı"""
+    stacks = max(2, round(math.sqrt(target_triangles / 4)))
+    slices = 2 * stacks
+    theta = np.linspace(0.0, math.pi, stacks + 1)[:, None]
+    phi = np.linspace(0.0, 2 * math.pi, slices + 1)[None, :]
+    points = np.stack([
+        radius * np.sin(theta) * np.cos(phi),
+        radius * np.sin(theta) * np.sin(phi),
+        radius * np.cos(theta) * np.ones_like(phi),
+    ], axis=-1).astype(np.float32)
+    points[:, -1] = points[:, 0]
+    points[0] = (0.0, 0.0, radius)
+    points[-1] = (0.0, 0.0, -radius)
+    vectors = _orient_outward(grid_triangles(points), np.zeros(3))
+    return np.ascontiguousarray(vectors), 4 / 3 * math.pi * radius ** 3
+
+
+def torus_mesh(target_triangles, major_radius=TORUS_MAJOR_RADIUS, minor_radius=TORUS_MINOR_RADIUS):
+    """Simit; iki yöndeki dikiş de kapalı, hacim 2π²Rr²"""
+    rings = max(3, round(math.sqrt(target_triangles / 4)))
+    segments = 2 * rings
+    u = np.linspace(0.0, 2 * math.pi, segments + 1)[:, None]
+    v = np.linspace(0.0, 2 * math.pi, rings + 1)[None, :]
+    distance = major_radius + minor_radius * np.cos(v)
+    points = np.stack([
+        distance * np.cos(u),
+        distance * np.sin(u),
+        minor_radius * np.sin(v) * np.ones_like(u),
+    ], axis=-1).astype(np.float32)
+    points[:, -1] = points[:, 0]
+    points[-1] = points[0]
+    vectors = grid_triangles(points)
+    # Simidin merkezi içinde değil; yönlendirmeyi işaretli hacimden belirle
+    v0, v1, v2 = (vectors[:, i].astype(np.float64) for i in range(3))
+    if np.einsum('ij,ij->', v0, np.cross(v1, v2)) < 0:
+        vectors = vectors[:, ::-1]
+    return np.ascontiguousarray(vectors), 2 * math.pi ** 2 * major_radius * minor_radius ** 2
+
+
+MESH_BUILDERS = {"cube": cube_mesh, "sphere": sphere_mesh, "torus": torus_mesh}
+
+
+def face_normals(vectors):
+    normals = np.cross(vectors[:, 1] - vectors[:, 0], vectors[:, 2] - vectors[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+
+def write_binary_stl(path, vectors, name="bench"):
+    records = np.zeros(len(vectors), dtype=BINARY_RECORD_DTYPE)
+    records['normal'] = face_normals(vectors)
+    records['vertices'] = vectors
+    with open(path, 'wb') as f:
+        f.write(name.encode('ascii').ljust(80, b' ')[:80])
+        f.write(np.uint32(len(vectors)).tobytes())
+        records.tofile(f)
+
+
+def write_ascii_stl(path, vectors, name="bench"):
+    rows = np.hstack([face_normals(vectors), vectors.reshape(-1, 9)])
+    with open(path, 'w') as f:
+        f.write(f"solid {name}\n")
+        np.savetxt(f, rows, fmt=_ASCII_FACET)
+        f.write(f"endsolid {name}\n")
+
+
+def build_corpus(corpus_dir, sizes=DEFAULT_SIZES, shapes=SHAPES, formats=FORMATS):
+    """Bilinen hacimli referans dosyaları üretir; var olan dosyalar yeniden yazılmaz"""
+    os.makedirs(corpus_dir, exist_ok=True)
+    corpus = []
+    for shape in shapes:
+        for size in sizes:
+            vectors, volume_mm3 = MESH_BUILDERS[shape](size)
+            for fmt in formats:
+                path = os.path.join(corpus_dir, f"{shape}_{size}_{fmt}.stl")
+                if not os.path.exists(path):
+                    if fmt == "binary":
+                        write_binary_stl(path, vectors, name=f"{shape}_{size}")
+                    else:
+                        write_ascii_stl(path, vectors, name=f"{shape}_{size}")
+                corpus.append({
+                    "shape": shape,
+                    "target_triangles": size,
+                    "triangles": len(vectors),
+                    "format": fmt,
+                    "path": path,
+                    "file_bytes": os.path.getsize(path),
+                    "expected_volume_cm3": volume_mm3 / 1000,
+                })
+            del vectors
+    return corpus
+
+
+def measure(function, repeat=3, memory=True, snapshot=None):
+    """En iyi süreyi ayrı çalıştırmalarla, en yüksek bellek kullanımını tracemalloc ile ölçer
+
+    snapshot verilirse her çalıştırmadan sonra çağrılır; en hızlı çalıştırmadaki
+    değeri döner (örn. analizörün aşama süreleri).
+    Dönüş: (sonuç, en iyi süre, en yüksek bellek, en iyi çalıştırmanın snapshot'ı)
+    """
+    peak = None
+    if memory:
+        # tracemalloc süreyi etkilediği için ayrı bir çalıştırmada, süre ölçümlerinden
+        # önce açılır; ASCII ayrıştırmada bu çalıştırma belirgin şekilde yavaştır
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    best = float("inf")
+    best_snapshot = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        if elapsed < best:
+            best = elapsed
+            best_snapshot = snapshot() if snapshot is not None else None
+    return result, best, peak, best_snapshot
+
+
+def _peak_mb(peak):
+    return round(peak / 1024 / 1024, 2) if peak is not None else None
+
+
+def benchmark_file(entry, repeat=3, analyzer=None, memory=True):
+    analyzer = analyzer or STLAnalyzer()
+    path = entry["path"]
+    report = {key: value for key, value in entry.items() if key != "path"}
+    report["file"] = os.path.basename(path)
+
+    volume, seconds, peak, _ = measure(lambda: analyzer.calculate_volume(path), repeat, memory)
+    report["calculate_volume"] = {
+        "seconds": round(seconds, 6),
+        "triangles_per_second": round(entry["triangles"] / seconds),
+        "peak_memory_mb": _peak_mb(peak),
+    }
+    report["volume_cm3"] = volume
+    report["volume_relative_error"] = (
+        abs(volume - entry["expected_volume_cm3"]) / entry["expected_volume_cm3"] if volume is not None else None
+    )
+
+    result, seconds, peak, phase_timings = measure(
+        lambda: analyzer.analyze_stl_file(path), repeat, memory, snapshot=lambda: dict(analyzer.phase_timings)
+    )
+    report["analyze_stl_file"] = {
+        "seconds": round(seconds, 6),
+        "triangles_per_second": round(entry["triangles"] / seconds),
+        "peak_memory_mb": _peak_mb(peak),
+        "phase_timings": {phase: round(value, 6) for phase, value in phase_timings.items()},
+    }
+    report["is_watertight"] = result["is_watertight"] if result else None
+    return report
+
+
+def run_benchmark(corpus_dir, sizes=DEFAULT_SIZES, shapes=SHAPES, formats=FORMATS, repeat=3, memory=True):
+    corpus = build_corpus(corpus_dir, sizes, shapes, formats)
+    analyzer = STLAnalyzer()
+    return [benchmark_file(entry, repeat, analyzer, memory) for entry in corpus]
+
+
+def _parse_list(value, allowed=None, cast=str):
+    items = [cast(item.strip().replace("_", "")) for item in value.split(",") if item.strip()]
+    if allowed is not None:
+        unknown = [item for item in items if item not in allowed]
+        if unknown:
+            raise argparse.ArgumentTypeError(f"Bilinmeyen değer: {', '.join(map(str, unknown))}")
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STLAnalyzer hızını, bellek kullanımını ve hacim doğruluğunu ölçer")
+    parser.add_argument("--sizes", type=lambda v: _parse_list(v, cast=int), default=list(DEFAULT_SIZES),
+                        help="Üçgen sayıları, virgülle (varsayılan: 1000,...,5000000)")
+    parser.add_argument("--shapes", type=lambda v: _parse_list(v, SHAPES), default=list(SHAPES),
+                        help="cube, sphere, torus")
+    parser.add_argument("--formats", type=lambda v: _parse_list(v, FORMATS), default=list(FORMATS),
+                        help="binary, ascii")
+    parser.add_argument("--repeat", type=int, default=3, help="Süre için tekrar sayısı (en iyisi alınır)")
+    parser.add_argument("--no-memory", action="store_true", help="Bellek ölçümünü atla (büyük ASCII dosyalarda hızlanır)")
+    parser.add_argument("--corpus-dir", help="Üretilen dosyaların klasörü (verilirse sonraki çalıştırmalarda yeniden kullanılır)")
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    if args.corpus_dir:
+        reports = run_benchmark(args.corpus_dir, args.sizes, args.shapes, args.formats, args.repeat,
+                                not args.no_memory)
+    else:
+        with tempfile.TemporaryDirectory(prefix="stl-corpus-") as corpus_dir:
+            reports = run_benchmark(corpus_dir, args.sizes, args.shapes, args.formats, args.repeat,
+                                    not args.no_memory)
+
+    if args.json:
+        json.dump(reports, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+
+    print(f"{'dosya':<28} {'üçgen':>9} {'hacim üçgen/sn':>15} {'analiz üçgen/sn':>16} {'bellek MB':>10} {'hacim hatası':>13}")
+    for r in reports:
+        error = r["volume_relative_error"]
+        print(f"{r['file']:<28} {r['triangles']:>9} {r['calculate_volume']['triangles_per_second']:>15,} "
+              f"{r['analyze_stl_file']['triangles_per_second']:>16,} {str(r['analyze_stl_file']['peak_memory_mb'] or '-'):>10} "
+              f"{error if error is None else f'{error:.2e}':>13}")
+
+
+if __name__ == "__main__":
+    main()
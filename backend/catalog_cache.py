@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Ürün listesinin bellekte kalma süresi (saniye)
+CATALOG_CACHE_TTL = float(os.environ.get("CATALOG_CACHE_TTL", "60"))
+
+# Bellekte tutulacak en fazla sayfa
+CATALOG_CACHE_SIZE = int(os.environ.get("CATALOG_CACHE_SIZE", "256"))
+
+
+class TTLCache:
+    """Süreli ve boyut sınırlı LRU önbellek
+
+    Yazma işlemleri invalidate() ile tüm kayıtları siler ve nesil sayacını
+    artırır; invalidate öncesi başlamış bir okuma sonucunu set() ile yazmaya
+    çalışırsa nesil uyuşmadığı için yazılmaz, eski veri önbelleğe girmez.
+    """
+
+    def __init__(self, ttl=CATALOG_CACHE_TTL, max_entries=CATALOG_CACHE_SIZE, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+catalog_cache = TTLCache()
+
+
+def catalog_key(category=None, skip=0, limit=100, after_id=None, version=None):
+    """Sayfa anahtarı; version, ETag'in üretildiği products sayacıdır
+
+    Sayaç anahtarın parçası olduğu için başka bir işlemdeki yazma veya
+    commit ile invalidate() arasındaki aralık, yeni ETag'le eski listenin
+    dönmesine yol açamaz: yeni sayaç önbellekte hiç bulunmayan bir anahtardır.
+    """
+    if after_id is not None:
+        skip = 0
+    return (version, category or None, skip, limit, after_id)
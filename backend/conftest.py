@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import models
+from table_versions import ensure_table_versions
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """Test başına geçici dizinde şeması kurulmuş SQLite motoru
+
+    İş tamamlama geri çağrıları ve olay testleri ayrı iş parçacığında
+    çalıştığı için bağlantılar iş parçacıkları arasında paylaşılabilir.
+    Test bitince bağlantılar kapatılır; dizini pytest temizler.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    ensure_table_versions(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
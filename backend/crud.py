@@ -1,12 +1,27 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, or_, update
+from sqlalchemy.orm import Session, selectinload
 from datetime import datetime
 import hashlib
+import json
+import logging
 import os
 
 import models
 import schemas
-from stl_analyzer import STLAnalyzer
+from analysis_jobs import JOB_COMPLETED, analysis_jobs, attach_analysis_result
+from catalog_cache import catalog_cache
+from order_events import CUSTOM_DESIGN_CREATED, ORDER_CREATED, ORDER_STATUS, order_event, order_events
+from upload_storage import UPLOADS_DIR
 
+logger = logging.getLogger(__name__)
+
+
+def paginate(query, id_column, skip: int = 0, limit: int = 100, after_id: int = None):
+    """ID sırasına göre sayfalar; after_id verilirse OFFSET yerine indeksli ID aralığı kullanılır"""
+    query = query.order_by(id_column)
+    if after_id is not None:
+        return query.filter(id_column > after_id).limit(limit)
+    return query.offset(skip).limit(limit)
 
 # User CRUD
 def get_user_by_username(db: Session, username: str):
@@ -49,25 +64,6 @@ def create_user(db: Session, user_data: schemas.UserRegister):
 
 
 # Cart CRUD
-def get_user_cart(db: Session, user_id: int):
-    cart_items = db.query(models.UserCart).filter(models.UserCart.user_id == user_id).all()
-    result = []
-    
-    for item in cart_items:
-        product = db.query(models.Product).filter(models.Product.id == item.product_id).first()
-        if product:
-            result.append({
-                "id": item.id,
-                "product_id": item.product_id,
-                "quantity": item.quantity,
-                "added_at": item.added_at,
-                "product_name": product.name,
-                "product_price": product.price,
-                "product_image_url": product.image_url
-            })
-    
-    return result
-
 def add_to_user_cart(db: Session, user_id: int, product_id: int, quantity: int = 1):
     # Önce ürünün var olup olmadığını kontrol et
     product = db.query(models.Product).filter(models.Product.id == product_id).first()
@@ -130,9 +126,7 @@ def remove_from_user_cart(db: Session, user_id: int, cart_item_id: int):
     return False
 
 def clear_user_cart(db: Session, user_id: int):
-    cart_items = db.query(models.UserCart).filter(models.UserCart.user_id == user_id).all()
-    for item in cart_items:
-        db.delete(item)
+    db.query(models.UserCart).filter(models.UserCart.user_id == user_id).delete(synchronize_session=False)
     db.commit()
     return True
 
@@ -160,69 +154,121 @@ def create_admin(db: Session, username: str, password: str):
 
 
 # Product CRUD
+# Ürün listesi, ekleme, silme ve sepet okuma uç noktaları crud_async.py'yi kullanır
 def get_product(db: Session, product_id: int):
     return db.query(models.Product).filter(models.Product.id == product_id).first()
 
-def get_products(db: Session, skip: int = 0, limit: int = 100, category: str = None):
-    query = db.query(models.Product)
-    if category:
-        query = query.filter(models.Product.category == category)
-    return query.offset(skip).limit(limit).all()
+# Order CRUD
+class InsufficientStockError(Exception):
+    def __init__(self, product_id, requested, available):
+        super().__init__(f"Ürün {product_id} için yeterli stok yok (istenen: {requested}, mevcut: {available})")
+        self.product_id = product_id
+        self.requested = requested
+        self.available = available
 
-def create_product(db: Session, product: schemas.ProductCreate):
-    db_product = models.Product(**product.model_dump())
-    db.add(db_product)
-    db.commit()
-    db.refresh(db_product)
-    return db_product
+def parse_order_products(products: str):
+    """'1x2,3x1' biçimindeki ürün listesini {ürün_id: adet} sözlüğüne çevirir"""
+    quantities = {}
+    for item in products.split(","):
+        if "x" not in item:
+            continue
+        pid, _, qty = item.partition("x")
+        try:
+            pid = int(pid)
+            qty = int(qty)
+        except ValueError:
+            logger.warning("Geçersiz ürün formatı: %s", item)
+            continue
+        if qty > 0:
+            quantities[pid] = quantities.get(pid, 0) + qty
+    return quantities
 
-def delete_product(db: Session, product_id: int):
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
-    if product:
-        db.delete(product)
-        db.commit()
-        return True
-    return False
-
-# Order CRUD
-def get_orders(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Order).offset(skip).limit(limit).all()
+def get_orders(db: Session, skip: int = 0, limit: int = 100, after_id: int = None):
+    query = db.query(models.Order).options(selectinload(models.Order.items))
+    return paginate(query, models.Order.id, skip, limit, after_id).all()
 
 def create_order(db: Session, order: schemas.OrderCreate):
     try:
-        print(f"CRUD: Sipariş oluşturuluyor - {order}")
+        logger.debug("Sipariş oluşturuluyor: %s", order)
         db_order = models.Order(**order.model_dump())
-        print(f"CRUD: Order modeli oluşturuldu - {db_order}")
         
-        # Ürün stoklarını azalt
         # order.products: '1x2,3x1' gibi (id x adet)
-        print(f"CRUD: Ürün stokları güncelleniyor - {order.products}")
-        for item in order.products.split(","):
-            if "x" in item:
-                pid, qty = item.split("x")
-                try:
-                    pid = int(pid)
-                    qty = int(qty)
-                    print(f"CRUD: Ürün {pid} stoktan {qty} adet azaltılıyor")
-                except ValueError:
-                    print(f"CRUD: Geçersiz ürün formatı - {item}")
-                    continue
-                product = db.query(models.Product).filter(models.Product.id == pid).first()
-                if product and product.stock is not None:
-                    product.stock = max(0, product.stock - qty)
-                    print(f"CRUD: Ürün {pid} stoku {product.stock} olarak güncellendi")
+        quantities = parse_order_products(order.products)
+        products = []
+        if quantities:
+            products = (
+                db.query(models.Product)
+                .filter(models.Product.id.in_(quantities))
+                .order_by(models.Product.id)
+                .all()
+            )
+        
+        for product in products:
+            db_order.items.append(models.OrderItem(
+                product_id=product.id,
+                quantity=quantities[product.id],
+                unit_price=product.price
+            ))
+        
+        # Stoklar yalnızca yeterliyse düşülür; sipariş kaydıyla aynı işlemde
+        if products:
+            logger.debug("Ürün stokları ayrılıyor: %s", order.products)
+            reserve_stock(db, {product.id: quantities[product.id] for product in products})
         
-        db.commit()
         db.add(db_order)
         db.commit()
+        if products:
+            # Stoklar değişti, ürün listesi önbelleği yenilensin
+            catalog_cache.invalidate()
         db.refresh(db_order)
-        print(f"CRUD: Sipariş başarıyla oluşturuldu - ID: {db_order.id}")
+        logger.info("Sipariş oluşturuldu", extra={"order_id": db_order.id, "item_count": len(products)})
+        order_events.publish(order_event(
+            ORDER_CREATED, db_order,
+            order_type=db_order.order_type, total_price=db_order.total_price, products=db_order.products
+        ))
         return db_order
     except Exception as e:
-        print(f"CRUD: Sipariş oluşturma hatası - {e}")
+        logger.warning("Sipariş oluşturulamadı: %s", e)
         db.rollback()
         raise e
 
+def reserve_stock(db: Session, quantities: dict):
+    """Stokları koşullu UPDATE ile düşer, yetersiz stokta InsufficientStockError fırlatır
+
+    Okuma-hesaplama-yazma yerine "stock >= adet" koşulu veritabanında
+    denetlenir, eşzamanlı siparişler aynı stoğu iki kez satamaz. Çağıran
+    işlemi commit etmeden stok değişikliği kalıcı olmaz.
+    """
+    # Kilitler hep aynı sırayla alınsın diye ürün ID'sine göre sıralı
+    params = [{"pid": pid, "qty": qty} for pid, qty in sorted(quantities.items())]
+    table = models.Product.__table__
+    result = db.execute(
+        update(table)
+        .where(
+            table.c.id == bindparam("pid"),
+            or_(table.c.stock.is_(None), table.c.stock >= bindparam("qty"))
+        )
+        .values(stock=table.c.stock - bindparam("qty")),
+        params
+    )
+    if result.rowcount == len(params):
+        return
+    
+    # En az bir ürünün stoğu yetmedi: değişiklikleri geri al, hangisi olduğunu bul
+    db.rollback()
+    stocks = dict(
+        db.query(models.Product.id, models.Product.stock)
+        .filter(models.Product.id.in_(quantities))
+        .all()
+    )
+    shortages = [
+        (pid, qty) for pid, qty in sorted(quantities.items())
+        if pid not in stocks or (stocks[pid] is not None and stocks[pid] < qty)
+    ]
+    # Arada stok yeniden arttıysa ilk ürünü bildir, istemci tekrar deneyebilir
+    pid, qty = shortages[0] if shortages else min(quantities.items())
+    raise InsufficientStockError(pid, qty, stocks.get(pid) or 0)
+
 def update_order_status(db: Session, order_id: int, status: str):
     order = db.query(models.Order).filter(models.Order.id == order_id).first()
     if not order:
@@ -231,6 +277,7 @@ def update_order_status(db: Session, order_id: int, status: str):
     order.status = status
     db.commit()
     db.refresh(order)
+    order_events.publish(order_event(ORDER_STATUS, order))
     return order, None
 
 def get_user_orders(db: Session, customer_name: str, customer_phone: str):
@@ -241,58 +288,69 @@ def get_user_orders(db: Session, customer_name: str, customer_phone: str):
     ).order_by(models.Order.id.desc()).all()
     return orders
 
+def get_best_sellers(db: Session, limit: int = 10):
+    """En çok satan ürünleri satılan adet ve ciroyla birlikte getir"""
+    quantity_sold = func.sum(models.OrderItem.quantity).label("quantity_sold")
+    revenue = func.sum(models.OrderItem.quantity * models.OrderItem.unit_price).label("revenue")
+    rows = (
+        db.query(models.Product.id, models.Product.name, quantity_sold, revenue)
+        .join(models.OrderItem, models.OrderItem.product_id == models.Product.id)
+        .join(models.Order, models.Order.id == models.OrderItem.order_id)
+        .filter(models.Order.status != "İptal")
+        .group_by(models.Product.id, models.Product.name)
+        .order_by(quantity_sold.desc(), models.Product.id)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "product_id": product_id,
+            "product_name": name,
+            "quantity_sold": int(sold),
+            "revenue": round(float(total), 2)
+        }
+        for product_id, name, sold, total in rows
+    ]
+
 # Custom Design CRUD
-def get_custom_designs(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.CustomDesign).offset(skip).limit(limit).all()
+def get_custom_designs(db: Session, skip: int = 0, limit: int = 100, after_id: int = None):
+    query = db.query(models.CustomDesign)
+    return paginate(query, models.CustomDesign.id, skip, limit, after_id).all()
 
 def get_custom_design_by_id(db: Session, custom_design_id: int):
     """ID'ye göre custom design getir"""
     return db.query(models.CustomDesign).filter(models.CustomDesign.id == custom_design_id).first()
 
 def create_custom_design(db: Session, custom_design: schemas.CustomDesignCreate):
-    print(f"CRUD: Custom design oluşturuluyor - {custom_design}")
+    logger.debug("Custom design oluşturuluyor: %s", custom_design)
+    
+    db_custom_design = models.CustomDesign(**custom_design.model_dump())
+    
+    db.add(db_custom_design)
+    db.commit()
+    db.refresh(db_custom_design)
     
-    # STL dosyası varsa analiz et
+    # STL dosyası varsa analiz işine bağla, sonuçlar iş tamamlanınca eklenir
     if custom_design.file_path:
-        uploads_dir = os.path.join(os.path.dirname(__file__), "uploads")
-        stl_file_path = os.path.join(uploads_dir, custom_design.file_path)
+        stl_file_path = os.path.join(UPLOADS_DIR, custom_design.file_path)
         
         if os.path.exists(stl_file_path):
-            analyzer = STLAnalyzer()
-            analysis_result = analyzer.analyze_stl_file(stl_file_path)
+            job = analysis_jobs.submit(db, custom_design.file_path)
             
-            if analysis_result:
-                # Analiz sonuçlarını custom design verisine ekle
-                custom_design_data = custom_design.model_dump()
-                custom_design_data.update({
-                    'weight_grams': analysis_result['weight_grams'],
-                    'print_time_hours': analysis_result['print_time_hours'],
-                    'sales_price': analysis_result['sales_price'],
-                    'infill_ratio': analysis_result['infill_ratio']
-                })
-                
-                print(f"CRUD: Analiz sonuçları eklendi - {custom_design_data}")
-                db_custom_design = models.CustomDesign(**custom_design_data)
+            if job.status == JOB_COMPLETED:
+                # Sonuç önbellekte hazırsa hemen ekle
+                attach_analysis_result(db, custom_design.file_path, json.loads(job.result))
+                db.commit()
+                db.refresh(db_custom_design)
+                logger.debug("Analiz sonuçları eklendi", extra={"job_id": job.id})
             else:
-                # Analiz başarısız olursa normal şekilde oluştur
-                print(f"CRUD: Analiz başarısız, normal oluşturma")
-                db_custom_design = models.CustomDesign(**custom_design.model_dump())
+                logger.debug("Analiz işi kuyrukta", extra={"job_id": job.id})
         else:
             # STL dosyası bulunamazsa normal şekilde oluştur
-            print(f"CRUD: STL dosyası bulunamadı, normal oluşturma")
-            db_custom_design = models.CustomDesign(**custom_design.model_dump())
-    else:
-        # STL dosyası yoksa normal şekilde oluştur
-        print(f"CRUD: STL dosyası yok, normal oluşturma")
-        db_custom_design = models.CustomDesign(**custom_design.model_dump())
-    
-    print(f"CRUD: Custom design modeli oluşturuldu - {db_custom_design}")
-    
-    db.add(db_custom_design)
-    db.commit()
-    db.refresh(db_custom_design)
+            logger.warning("STL dosyası bulunamadı: %s", custom_design.file_path)
     
     # Custom design oluşturulduktan sonra otomatik olarak sipariş oluştur
+    db_order = None
     try:
         # Sipariş verilerini hazırla
         order_data = {
@@ -306,17 +364,22 @@ def create_custom_design(db: Session, custom_design: schemas.CustomDesignCreate)
             'custom_design_id': db_custom_design.id  # Custom design ID'sini sakla
         }
         
-        print(f"CRUD: Sipariş oluşturuluyor - {order_data}")
         db_order = models.Order(**order_data)
         db.add(db_order)
         db.commit()
         db.refresh(db_order)
         
-        print(f"CRUD: Sipariş başarıyla oluşturuldu - ID: {db_order.id}")
+        logger.debug("Özel tasarım siparişi oluşturuldu", extra={"order_id": db_order.id})
         
-    except Exception as e:
-        print(f"CRUD: Sipariş oluşturma hatası - {e}")
+    except Exception:
+        logger.exception("Özel tasarım siparişi oluşturulamadı")
         # Sipariş oluşturulamazsa bile custom design kaydedilmiş olur
+        db_order = None
     
-    print(f"CRUD: Custom design başarıyla oluşturuldu - ID: {db_custom_design.id}")
+    logger.info("Custom design oluşturuldu", extra={"custom_design_id": db_custom_design.id})
+    if db_order is not None:
+        order_events.publish(order_event(
+            CUSTOM_DESIGN_CREATED, db_order,
+            order_type=db_order.order_type, custom_design_id=db_custom_design.id
+        ))
     return db_custom_design 
\ No newline at end of file
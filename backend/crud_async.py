@@ -0,0 +1,110 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+
+import models
+import schemas
+from catalog_cache import catalog_cache, catalog_key
+from product_search import search_products_query
+
+# Sık çağrılan ürün ve sepet uç noktalarının asenkron crud fonksiyonları.
+# Dönüş değerleri ve hata biçimleri crud.py ile aynı düzendedir.
+
+
+# Admin
+async def get_admin_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(models.Admin).where(models.Admin.username == username))
+    return result.scalars().first()
+
+
+# Cart
+async def get_user_cart(db: AsyncSession, user_id: int):
+    # Sepet satırları ürünleriyle birlikte tek sorguda okunur
+    result = await db.execute(
+        select(models.UserCart)
+        .join(models.UserCart.product)
+        .options(contains_eager(models.UserCart.product))
+        .where(models.UserCart.user_id == user_id)
+        .order_by(models.UserCart.id)
+    )
+    return [
+        {
+            "id": item.id,
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "added_at": item.added_at,
+            "product_name": item.product.name,
+            "product_price": item.product.price,
+            "product_image_url": item.product.image_url
+        }
+        for item in result.scalars().all()
+    ]
+
+
+# Product
+async def get_product(db: AsyncSession, product_id: int):
+    return await db.get(models.Product, product_id)
+
+async def get_products(db: AsyncSession, skip: int = 0, limit: int = 100, category: str = None, after_id: int = None,
+                       version: int = None):
+    """Ürün listesini önbellekten, yoksa veritabanından getirir (sözlük listesi)
+
+    version: isteğin ETag'inde kullanılan products sayacı
+    """
+    key = catalog_key(category, skip, limit, after_id, version)
+    cached = catalog_cache.get(key)
+    if cached is not None:
+        return cached
+
+    generation = catalog_cache.generation
+    products = await query_products(db, skip, limit, category, after_id)
+    result = [schemas.Product.model_validate(product).model_dump() for product in products]
+    catalog_cache.set(key, result, generation)
+    return result
+
+async def query_products(db: AsyncSession, skip: int = 0, limit: int = 100, category: str = None, after_id: int = None):
+    query = select(models.Product)
+    if category:
+        query = query.where(models.Product.category == category)
+    query = query.order_by(models.Product.id)
+    if after_id is not None:
+        # İmleçli sayfalama: derin sayfalar da ilk sayfa kadar ucuz
+        query = query.where(models.Product.id > after_id)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
+
+async def create_product(db: AsyncSession, product: schemas.ProductCreate):
+    db_product = models.Product(**product.model_dump())
+    db.add(db_product)
+    await db.commit()
+    catalog_cache.invalidate()
+    await db.refresh(db_product)
+    return db_product
+
+async def delete_product(db: AsyncSession, product_id: int):
+    result = await db.execute(delete(models.Product).where(models.Product.id == product_id))
+    await db.commit()
+    if result.rowcount > 0:
+        catalog_cache.invalidate()
+    return result.rowcount > 0
+
+async def update_product_stock(db: AsyncSession, product_id: int, stock: int):
+    product = await get_product(db, product_id)
+    if not product:
+        return None, "Ürün bulunamadı"
+
+    product.stock = stock
+    await db.commit()
+    catalog_cache.invalidate()
+    await db.refresh(product)
+    return product, None
+
+async def search_products(db: AsyncSession, query: str, category: str = None, min_price: float = None,
+                          max_price: float = None, skip: int = 0, limit: int = 20):
+    statement = search_products_query(query, category, min_price, max_price, skip, limit)
+    if statement is None:
+        return []
+    result = await db.execute(statement)
+    return result.scalars().all()
@@ -0,0 +1,34 @@
+import hashlib
+
+from fastapi import Response
+
+# Katalog herkese açıktır, CDN saklayabilir ama her istekte doğrulamalıdır
+PUBLIC_CACHE_CONTROL = "public, no-cache"
+
+# Sipariş ve tasarım listeleri yalnızca tarayıcıda saklanır
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts):
+    """Tablo sürümleri ve istek parametrelerinden zayıf ETag üretir"""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Zayıf karşılaştırma: W/ öneki yok sayılır
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional_get(request, response, etag, cache_control):
+    """ETag eşleşirse 304 yanıtı döner; eşleşmezse başlıkları yanıta ekler ve None döner"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,130 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+# Genel seviye ve modül bazlı seviyeler, örn. LOG_LEVELS="crud=DEBUG,sqlalchemy.engine=INFO"
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+
+# json (varsayılan) veya text
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+
+# LogRecord'un standart alanları; bunların dışındakiler extra={...} ile gelmiştir
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON olarak yazar; extra alanlar da eklenir"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Kaydı kuyruğa koyar; biçimlendirme ve yazma arka plandaki iş parçacığında yapılır
+
+    Yalnızca mesaj birleştirilir (seviye filtresinden geçen kayıtlar için),
+    extra alanlar biçimlendiriciye aynen ulaşır.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_levels(spec):
+    """'crud=DEBUG,analysis_jobs=WARNING' biçimini {modül: seviye} sözlüğüne çevirir"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.strip().partition("=")
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _output_handler(log_format, stream):
+    output = logging.StreamHandler(stream or sys.stdout)
+    if log_format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    return output
+
+
+def _remove_queue_handlers(root):
+    for handler in list(root.handlers):
+        if isinstance(handler, _QueueHandler):
+            root.removeHandler(handler)
+
+
+def _set_levels(level, levels):
+    logging.getLogger().setLevel(level.upper())
+    for name, module_level in parse_levels(levels).items():
+        logging.getLogger(name).setLevel(module_level)
+
+
+def setup_logging(level=LOG_LEVEL, levels=LOG_LEVELS, log_format=LOG_FORMAT, stream=None):
+    """Kök logger'a kuyruk tabanlı işleyiciyi bağlar; tekrar çağrılırsa yeniden kurar"""
+    global _listener
+    stop_logging()
+
+    output = _output_handler(log_format, stream)
+    log_queue = queue.SimpleQueue()
+    logging.getLogger().addHandler(_QueueHandler(log_queue))
+    _set_levels(level, levels)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Kuyruk işleyicisini kaldırır, kuyruktaki kayıtları yazıp arka plan iş parçacığını durdurur"""
+    global _listener
+    # Önce işleyici kaldırılır; sonraki kayıtlar okunmayan kuyrukta birikmesin
+    _remove_queue_handlers(logging.getLogger())
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_worker_logging(level=LOG_LEVEL, levels=LOG_LEVELS, log_format=LOG_FORMAT, stream=None):
+    """İşlem havuzu işçilerinde kayıtları doğrudan akışa yazar (ProcessPoolExecutor initializer)
+
+    Fork ile devralınan kuyruk işleyicisinin dinleyici iş parçacığı işçide
+    yoktur; bırakılırsa işçideki kayıtlar kuyrukta birikir ve hiç yazılmaz.
+    """
+    global _listener
+    _listener = None
+    root = logging.getLogger()
+    _remove_queue_handlers(root)
+    root.addHandler(_output_handler(log_format, stream))
+    _set_levels(level, levels)
+
+
+atexit.register(stop_logging)
@@ -1,18 +1,67 @@
-from fastapi import Depends, FastAPI, HTTPException, File, UploadFile, status, Request
-from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, File, UploadFile, status, Request, Response
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 import json
+import logging
 
 import crud
+import crud_async
 import models
 import schemas
-from database import SessionLocal, engine
+from analysis_jobs import JOB_COMPLETED, analysis_jobs
+from batch_analysis import iter_batch_analysis, iter_ndjson
+from catalog_cache import catalog_cache
+from database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from http_cache import PRIVATE_CACHE_CONTROL, PUBLIC_CACHE_CONTROL, conditional_get, make_etag
+from log_config import setup_logging
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    instrument_engine,
+    registry as metrics_registry,
+    upload_bytes_total,
+    uploads_total,
+)
+from migrations import backfill_order_items, ensure_columns, ensure_indexes
+from order_events import customer_filter, iter_sse, order_events
+from pagination import NEXT_CURSOR_HEADER, InvalidCursorError, decode_cursor, next_cursor
+from product_search import ensure_product_search
+from resumable_uploads import MAX_CHUNK_BYTES, UploadOffsetError, UploadSessionNotFoundError, resumable_uploads
+from table_versions import ensure_table_versions, get_table_versions, get_table_versions_async
+from upload_storage import MAX_UPLOAD_BYTES, UPLOADS_DIR, UploadTooLargeError, save_upload_stream
 import os
 
+setup_logging()
+logger = logging.getLogger(__name__)
+
 models.Base.metadata.create_all(bind=engine)
+ensure_columns(engine)
+ensure_indexes(engine)
+ensure_table_versions(engine)
+ensure_product_search(engine)
+backfill_order_items(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Yeniden başlatma öncesi yarım kalan analiz işlerini kuyruğa al
+    analysis_jobs.resume_pending()
+    resumable_uploads.cleanup_stale()
+    yield
+    analysis_jobs.shutdown()
+    await async_engine.dispose()
+
+
+app = FastAPI(debug=True, lifespan=lifespan)
 
-app = FastAPI(debug=True)
+# İstek süresi ve sayısı metrikleri
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
 # CORS Middleware
 origins = [
@@ -26,6 +75,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", NEXT_CURSOR_HEADER],
 )
 
 # Dependency
@@ -36,17 +86,52 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Sayfalama yardımcıları
+def parse_cursor(cursor: str):
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def set_next_cursor(response: Response, cursor: str):
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+# Sipariş olay akışı
+def event_stream(request: Request, predicate=None):
+    """Sipariş olaylarını Server-Sent Events olarak akıtır"""
+    last_event_id = request.headers.get("last-event-id")
+    subscription = order_events.subscribe(
+        predicate, last_event_id=int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    )
+    return StreamingResponse(
+        iter_sse(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        # Ara sunucular akışı tamponlamasın
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # Admin oturum kontrolü için yardımcı fonksiyon
-def verify_admin_username(db: Session, admin_username: str):
+async def verify_admin_username(db: AsyncSession, admin_username: str):
     if not admin_username:
         raise HTTPException(status_code=401, detail="Admin oturumu gerekli")
     
-    admin = crud.get_admin_by_username(db, admin_username)
+    admin = await crud_async.get_admin_by_username(db, admin_username)
     if not admin:
         raise HTTPException(status_code=401, detail="Geçersiz admin kullanıcısı")
     
     return admin
 
+@app.get("/metrics")
+def read_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the 3D Craft API"}
@@ -69,8 +154,8 @@ def user_login(login_data: schemas.UserLogin, db: Session = Depends(get_db)):
 
 # Cart Endpoints
 @app.get("/user/cart/{user_id}")
-def get_user_cart(user_id: int, db: Session = Depends(get_db)):
-    cart_items = crud.get_user_cart(db, user_id)
+async def get_user_cart(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    cart_items = await crud_async.get_user_cart(db, user_id)
     return {"success": True, "cart": cart_items}
 
 @app.post("/user/cart/{user_id}/add")
@@ -120,39 +205,62 @@ def create_admin(login_data: schemas.AdminLogin, db: Session = Depends(get_db)):
 
 # Product Endpoints
 @app.post("/products/", response_model=schemas.Product)
-async def create_product(request: Request, db: Session = Depends(get_db)):
+async def create_product(request: Request, db: AsyncSession = Depends(get_async_db)):
     try:
         body = await request.json()
         product_data = schemas.ProductCreate(**body)
-        return crud.create_product(db=db, product=product_data)
+        return await crud_async.create_product(db=db, product=product_data)
     except Exception as e:
-        print(f"Error creating product: {e}")
+        logger.exception("Ürün oluşturulamadı")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/products/", response_model=list[schemas.Product])
-def read_products(skip: int = 0, limit: int = 100, category: str = None, db: Session = Depends(get_db)):
-    products = crud.get_products(db, skip=skip, limit=limit, category=category)
+async def read_products(request: Request, response: Response, skip: int = 0, limit: int = 100, category: str = None, cursor: str = None, db: AsyncSession = Depends(get_async_db)):
+    after_id = parse_cursor(cursor)
+    versions = await get_table_versions_async(db, ("products",))
+    not_modified = conditional_get(request, response, make_etag(versions, skip, limit, category, cursor), PUBLIC_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    products = await crud_async.get_products(
+        db, skip=skip, limit=limit, category=category, after_id=after_id, version=dict(versions).get("products")
+    )
+    set_next_cursor(response, next_cursor(products, limit, id_of=lambda product: product["id"]))
     return products
 
+@app.get("/products/search", response_model=list[schemas.Product])
+async def search_products(q: str, category: str = None, min_price: float = None, max_price: float = None,
+                          skip: int = 0, limit: int = 20, db: AsyncSession = Depends(get_async_db)):
+    return await crud_async.search_products(
+        db, q, category=category, min_price=min_price, max_price=max_price, skip=skip, limit=limit
+    )
+
+@app.get("/cache/catalog/stats")
+def read_catalog_cache_stats():
+    return catalog_cache.stats()
+
 @app.get("/products/{product_id}", response_model=schemas.Product)
-def read_product(product_id: int, db: Session = Depends(get_db)):
-    db_product = crud.get_product(db, product_id=product_id)
+async def read_product(product_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    versions = await get_table_versions_async(db, ("products",))
+    not_modified = conditional_get(request, response, make_etag(versions, product_id), PUBLIC_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    db_product = await crud_async.get_product(db, product_id=product_id)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     return db_product
 
 @app.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_product(product_id: int, request: Request, db: Session = Depends(get_db)):
+async def delete_product(product_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     try:
         # Admin oturumu kontrolü
         body = await request.json()
         admin_username = body.get("admin_username")
         
         # Admin kullanıcısını doğrula
-        verify_admin_username(db, admin_username)
+        await verify_admin_username(db, admin_username)
         
         # Ürünü sil
-        success = crud.delete_product(db, product_id)
+        success = await crud_async.delete_product(db, product_id)
         if not success:
             raise HTTPException(status_code=404, detail="Product not found")
         return
@@ -162,7 +270,7 @@ async def delete_product(product_id: int, request: Request, db: Session = Depend
         raise HTTPException(status_code=500, detail=f"Ürün silme hatası: {str(e)}")
 
 @app.put("/products/{product_id}/stock")
-async def update_product_stock(product_id: int, request: Request, db: Session = Depends(get_db)):
+async def update_product_stock(product_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     try:
         # Admin oturumu kontrolü
         body = await request.json()
@@ -173,16 +281,12 @@ async def update_product_stock(product_id: int, request: Request, db: Session =
             raise HTTPException(status_code=400, detail="Stok miktarı gerekli")
         
         # Admin kullanıcısını doğrula
-        verify_admin_username(db, admin_username)
+        await verify_admin_username(db, admin_username)
         
         # Ürünü bul ve stokunu güncelle
-        product = crud.get_product(db, product_id)
-        if not product:
-            raise HTTPException(status_code=404, detail="Ürün bulunamadı")
-        
-        product.stock = new_stock
-        db.commit()
-        db.refresh(product)
+        product, error = await crud_async.update_product_stock(db, product_id, new_stock)
+        if error:
+            raise HTTPException(status_code=404, detail=error)
         
         return {"success": True, "message": f"Ürün stoku {new_stock} olarak güncellendi", "product": schemas.Product.from_orm(product)}
     except HTTPException:
@@ -194,19 +298,32 @@ async def update_product_stock(product_id: int, request: Request, db: Session =
 @app.post("/orders/", response_model=schemas.Order)
 def create_order(order: schemas.OrderCreate, db: Session = Depends(get_db)):
     try:
-        print(f"Gelen sipariş verisi: {order}")
-        result = crud.create_order(db=db, order=order)
-        print(f"Sipariş başarıyla oluşturuldu: {result}")
-        return result
+        return crud.create_order(db=db, order=order)
+    except crud.InsufficientStockError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        print(f"Sipariş oluşturma hatası: {e}")
+        logger.exception("Sipariş oluşturulamadı")
         raise HTTPException(status_code=500, detail=f"Sipariş oluşturulamadı: {str(e)}")
 
 @app.get("/orders/", response_model=list[schemas.Order])
-def read_orders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    orders = crud.get_orders(db, skip=skip, limit=limit)
+def read_orders(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: str = None, db: Session = Depends(get_db)):
+    after_id = parse_cursor(cursor)
+    versions = get_table_versions(db, ("orders", "order_items"))
+    not_modified = conditional_get(request, response, make_etag(versions, skip, limit, cursor), PRIVATE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    orders = crud.get_orders(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, next_cursor(orders, limit))
     return orders
 
+@app.get("/orders/events")
+async def stream_order_events(request: Request):
+    return event_stream(request)
+
+@app.get("/reports/best-sellers", response_model=list[schemas.BestSeller])
+def read_best_sellers(limit: int = 10, db: Session = Depends(get_db)):
+    return crud.get_best_sellers(db, limit=limit)
+
 @app.put("/orders/{order_id}/status")
 def update_order_status(order_id: int, status: str, db: Session = Depends(get_db)):
     result, error = crud.update_order_status(db, order_id, status)
@@ -214,6 +331,10 @@ def update_order_status(order_id: int, status: str, db: Session = Depends(get_db
         raise HTTPException(status_code=404, detail=error)
     return {"success": True, "message": f"Sipariş durumu '{status}' olarak güncellendi"}
 
+@app.get("/user/orders/{customer_name}/{customer_phone}/events")
+async def stream_user_order_events(customer_name: str, customer_phone: str, request: Request):
+    return event_stream(request, customer_filter(customer_name, customer_phone))
+
 @app.get("/user/orders/{customer_name}/{customer_phone}")
 def get_user_orders(customer_name: str, customer_phone: str, db: Session = Depends(get_db)):
     orders = crud.get_user_orders(db, customer_name, customer_phone)
@@ -224,18 +345,22 @@ def get_user_orders(customer_name: str, customer_phone: str, db: Session = Depen
 async def create_custom_design(request: Request, db: Session = Depends(get_db)):
     try:
         body = await request.json()
-        print(f"Gelen custom design verisi: {body}")
         custom_design_data = schemas.CustomDesignCreate(**body)
-        result = crud.create_custom_design(db=db, custom_design=custom_design_data)
-        print(f"Custom design oluşturuldu: {result}")
-        return result
+        # Senkron veritabanı ve kuyruk işlemleri olay döngüsünü bloklamasın
+        return await run_in_threadpool(crud.create_custom_design, db=db, custom_design=custom_design_data)
     except Exception as e:
-        print(f"Error creating custom design: {e}")
+        logger.exception("Custom design oluşturulamadı")
         raise HTTPException(status_code=500, detail=f"Custom design oluşturma hatası: {str(e)}")
 
 @app.get("/custom-designs/", response_model=list[schemas.CustomDesign])
-def read_custom_designs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    custom_designs = crud.get_custom_designs(db, skip=skip, limit=limit)
+def read_custom_designs(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: str = None, db: Session = Depends(get_db)):
+    after_id = parse_cursor(cursor)
+    versions = get_table_versions(db, ("custom_designs",))
+    not_modified = conditional_get(request, response, make_etag(versions, skip, limit, cursor), PRIVATE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    custom_designs = crud.get_custom_designs(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, next_cursor(custom_designs, limit))
     return custom_designs
 
 @app.get("/download-stl/{custom_design_id}")
@@ -252,16 +377,17 @@ def download_stl_file(custom_design_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="STL dosyası bulunamadı")
         
         # Dosya yolunu oluştur
-        file_path = os.path.join("uploads", custom_design.file_path)
+        file_path = os.path.join(UPLOADS_DIR, custom_design.file_path)
         
         # Dosyanın var olup olmadığını kontrol et
-        if not os.path.exists(file_path):
+        if os.path.basename(custom_design.file_path) != custom_design.file_path or not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="STL dosyası sistemde bulunamadı")
         
-        # Dosyayı indir
+        # Dosya içerik özetiyle saklanır; indirme kullanıcının yüklediği adla yapılır
+        filename = os.path.basename(custom_design.original_filename or "") or custom_design.file_path
         return FileResponse(
             path=file_path,
-            filename=custom_design.file_path,
+            filename=filename,
             media_type="application/octet-stream"
         )
         
@@ -270,59 +396,148 @@ def download_stl_file(custom_design_id: int, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Dosya indirme hatası: {str(e)}")
 
-@app.post("/upload-stl/")
-def upload_stl(name: str = "", description: str = "", file: UploadFile = File(...)):
+def queue_uploaded_file_analysis(db: Session, stored_name: str, file_hash: str, size: int,
+                                 original_filename: str, name: str = "", description: str = ""):
+    """Kaydedilen STL dosyasının analizini arka planda çalışacak işe devreder"""
     try:
-        print(f"📤 Upload isteği: {file.filename}")
+        job = analysis_jobs.submit(db, stored_name, file_hash=file_hash)
+        logger.info("STL analizi kuyruğa alındı", extra={"job_id": job.id, "sha256": file_hash})
         
+        response = {
+            "message": "Dosya yüklendi, analiz sıraya alındı.",
+            "filename": stored_name,
+            "original_filename": original_filename,
+            "sha256": file_hash,
+            "size_bytes": size,
+            "name": name,
+            "description": description,
+            "analysis_job_id": job.id
+        }
+        if job.status == JOB_COMPLETED:
+            response["message"] = "Dosya başarıyla yüklendi ve analiz edildi."
+            response["analysis"] = json.loads(job.result)
+        return response
+    except Exception as e:
+        logger.exception("STL analizi kuyruğa alınamadı")
+        return {
+            "message": "Dosya yüklendi fakat analiz edilemedi.",
+            "filename": stored_name,
+            "original_filename": original_filename,
+            "name": name,
+            "description": description
+        }
+
+@app.post("/upload-stl/")
+def upload_stl(name: str = "", description: str = "", file: UploadFile = File(...), db: Session = Depends(get_db)):
+    try:
         # Sadece .stl dosyası kabul et
         if not file.filename.lower().endswith(".stl"):
             raise HTTPException(status_code=400, detail="Sadece .stl dosyaları kabul edilir.")
         
-        uploads_dir = os.path.join(os.path.dirname(__file__), "uploads")
-        os.makedirs(uploads_dir, exist_ok=True)
-        file_path = os.path.join(uploads_dir, file.filename)
-        
-        print(f"💾 Dosya kaydediliyor: {file_path}")
+        # Bildirilen boyut sınırı aşıyorsa kopyalamaya hiç başlama
+        if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Dosya boyutu sınırı aşıldı.")
         
-        # Dosyayı kaydet
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
+        # Dosyayı parça parça kaydet, içerik özetine göre adlandır
+        try:
+            stored_name, file_hash, size = save_upload_stream(file.file)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
-        print(f"✅ Dosya kaydedildi")
+        logger.info("Dosya kaydedildi", extra={"stored_name": stored_name, "size_bytes": size})
+        upload_bytes_total.inc(size, kind="direct")
+        uploads_total.inc(kind="direct")
         
-        # STL analizi yap
-        try:
-            print(f"🔬 STL analizi başlıyor...")
-            from stl_analyzer import STLAnalyzer
-            analyzer = STLAnalyzer()
-            analysis_result = analyzer.analyze_stl_file(file_path)
-            
-            print(f"📊 Analiz sonucu: {analysis_result}")
-            
-            if analysis_result:
-                return {
-                    "message": "Dosya başarıyla yüklendi ve analiz edildi.",
-                    "filename": file.filename,
-                    "name": name,
-                    "description": description,
-                    "analysis": analysis_result
-                }
-            else:
-                return {
-                    "message": "Dosya yüklendi fakat analiz edilemedi.",
-                    "filename": file.filename,
-                    "name": name,
-                    "description": description
-                }
-        except Exception as e:
-            print(f"❌ STL analizi sırasında hata: {e}")
-            return {
-                "message": "Dosya yüklendi fakat analiz edilemedi.",
-                "filename": file.filename,
-                "name": name,
-                "description": description
-            }
+        return queue_uploaded_file_analysis(db, stored_name, file_hash, size, file.filename, name, description)
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Upload hatası: {e}")
-        raise HTTPException(status_code=500, detail=f"Dosya yükleme hatası: {str(e)}") 
\ No newline at end of file
+        logger.exception("Dosya yüklenemedi")
+        raise HTTPException(status_code=500, detail=f"Dosya yükleme hatası: {str(e)}")
+
+
+# Analysis Job Endpoints
+@app.post("/analysis-jobs", response_model=schemas.AnalysisJob)
+def create_analysis_job(job_data: schemas.AnalysisJobCreate, db: Session = Depends(get_db)):
+    file_path = os.path.join(UPLOADS_DIR, job_data.file_path)
+    if os.path.basename(job_data.file_path) != job_data.file_path or not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="STL dosyası bulunamadı")
+    
+    return analysis_jobs.submit(db, job_data.file_path, job_data.filament_type, job_data.infill_ratio)
+
+@app.get("/analysis-jobs/{job_id}", response_model=schemas.AnalysisJob)
+def read_analysis_job(job_id: int, db: Session = Depends(get_db)):
+    job = analysis_jobs.get(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analiz işi bulunamadı")
+    return job
+
+
+@app.post("/analyze/batch")
+def analyze_batch(batch: schemas.BatchAnalysisRequest):
+    """Birden çok STL dosyasını paralel analiz eder, sonuçları NDJSON olarak akıtır"""
+    results = iter_batch_analysis(batch.items, analysis_jobs.get_executor(),
+                                  batch.filament_type, batch.infill_ratio)
+    return StreamingResponse(iter_ndjson(results), media_type="application/x-ndjson")
+
+# Resumable Upload Endpoints
+@app.post("/uploads", response_model=schemas.ResumableUploadStatus)
+def create_resumable_upload(upload_data: schemas.ResumableUploadCreate):
+    if not upload_data.filename.lower().endswith(".stl"):
+        raise HTTPException(status_code=400, detail="Sadece .stl dosyaları kabul edilir.")
+    try:
+        return resumable_uploads.create(upload_data.filename, upload_data.total_size)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/uploads/{upload_id}", response_model=schemas.ResumableUploadStatus)
+def read_resumable_upload(upload_id: str):
+    try:
+        return resumable_uploads.status(upload_id)
+    except UploadSessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Yükleme bulunamadı")
+
+@app.put("/uploads/{upload_id}", response_model=schemas.ResumableUploadStatus)
+async def upload_chunk(upload_id: str, offset: int, request: Request):
+    content_length = request.headers.get("content-length")
+    if content_length is not None and not content_length.strip().isdigit():
+        raise HTTPException(status_code=400, detail="Geçersiz Content-Length")
+    too_large = HTTPException(status_code=413, detail=f"Parça boyutu sınırı aşıldı ({MAX_CHUNK_BYTES} bayt)")
+    if content_length is not None and int(content_length) > MAX_CHUNK_BYTES:
+        raise too_large
+    
+    # Content-Length olmadan (chunked) gelen gövde de sınırı aşınca okunmayı bırakır
+    data = bytearray()
+    async for piece in request.stream():
+        data += piece
+        if len(data) > MAX_CHUNK_BYTES:
+            raise too_large
+    data = bytes(data)
+    try:
+        upload_status = await run_in_threadpool(resumable_uploads.write_chunk, upload_id, offset, data)
+        upload_bytes_total.inc(len(data), kind="resumable")
+        return upload_status
+    except UploadSessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Yükleme bulunamadı")
+    except UploadOffsetError as e:
+        # İstemci alınan bayt sayısından devam edebilsin
+        raise HTTPException(status_code=409, detail=str(e),
+                            headers={"Upload-Offset": str(e.received_bytes)})
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+@app.post("/uploads/{upload_id}/finalize")
+def finalize_resumable_upload(upload_id: str, name: str = "", description: str = "", db: Session = Depends(get_db)):
+    try:
+        stored_name, file_hash, size, original_filename = resumable_uploads.finalize(upload_id)
+    except UploadSessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Yükleme bulunamadı")
+    except UploadOffsetError as e:
+        raise HTTPException(status_code=409, detail=str(e),
+                            headers={"Upload-Offset": str(e.received_bytes)})
+    
+    logger.info("Parçalı yükleme tamamlandı", extra={"stored_name": stored_name, "size_bytes": size})
+    uploads_total.inc(kind="resumable")
+    return queue_uploaded_file_analysis(db, stored_name, file_hash, size, original_filename, name, description)
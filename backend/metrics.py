@@ -0,0 +1,252 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy import event
+
+# Prometheus metin biçiminin içerik tipi
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Süre histogramlarının varsayılan sınırları (saniye)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} etiketleri {self.labelnames} olmalı")
+        return tuple(labels[name] for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Kova sayaçları, toplam ve gözlem sayısı
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _render_sample(self, key, state):
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, extra=[("le", _format_value(float(bound)))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "İşlenen HTTP istekleri", ("method", "route", "status")))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP istek süresi", ("method", "route")))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "İşlenmekte olan HTTP istekleri"))
+
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "Çalıştırılan SQL ifadeleri", ("operation",)))
+db_query_duration_seconds = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL ifadesi süresi", ("operation",)))
+
+stl_analysis_duration_seconds = registry.register(Histogram(
+    "stl_analysis_duration_seconds", "STL analiz aşamalarının süresi", ("phase",)))
+stl_analyses_total = registry.register(Counter(
+    "stl_analyses_total", "Tamamlanan STL analizleri", ("result",)))
+
+upload_bytes_total = registry.register(Counter(
+    "upload_bytes_total", "Kaydedilen yükleme baytları", ("kind",)))
+uploads_total = registry.register(Counter(
+    "uploads_total", "Tamamlanan yüklemeler", ("kind",)))
+
+
+def record_analysis_timings(timings, succeeded=True):
+    """İşçi işlemden dönen aşama sürelerini histogramlara ekler"""
+    for phase, seconds in (timings or {}).items():
+        stl_analysis_duration_seconds.observe(seconds, phase=phase)
+    stl_analyses_total.inc(result="ok" if succeeded else "error")
+
+
+def _operation(statement):
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+def instrument_engine(engine):
+    """Engine üzerindeki her SQL ifadesinin sayısını ve süresini kaydeder"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_query_start"].pop()
+        operation = _operation(statement)
+        db_queries_total.inc(operation=operation)
+        db_query_duration_seconds.observe(time.perf_counter() - started, operation=operation)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("metrics_query_start"):
+            connection.info["metrics_query_start"].pop()
+
+    return engine
+
+
+def route_label(scope):
+    """Yüksek kardinaliteyi önlemek için URL yerine rota şablonunu kullanır"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """İstek sayısı ve süresini kaydeden saf ASGI ara katmanı
+
+    Durum kodu http.response.start mesajından alınır; süre yanıtın son
+    gövde parçası gönderildiğinde ölçülür. Yanıt gövdesi sarılmadığı için
+    akış (NDJSON) ve SSE yanıtları olduğu gibi iletilir.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        status = 500
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            http_requests_in_flight.dec()
+            route = route_label(scope)
+            http_requests_total.inc(method=scope["method"], route=route, status=str(status))
+            http_request_duration_seconds.observe(time.perf_counter() - started, method=scope["method"], route=route)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Hata ya da istemci kopması durumunda da istek sayılır
+            record()
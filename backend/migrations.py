@@ -0,0 +1,125 @@
+import logging
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
+
+import models
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_ORDER_ITEMS = "backfill_order_items"
+
+# Kilit hatasında (busy_timeout aşıldı) kaydı yeniden kontrol edip tekrar deneme sayısı
+BACKFILL_LOCK_ATTEMPTS = 3
+
+
+def ensure_columns(bind=engine):
+    """Modellere sonradan eklenen boş bırakılabilir sütunları mevcut tablolara ekler"""
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    with bind.begin() as conn:
+        for table in models.Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_sql = str(CreateColumn(column).compile(dialect=bind.dialect))
+                for foreign_key in column.foreign_keys:
+                    column_sql += f" REFERENCES {foreign_key.column.table.name}({foreign_key.column.name})"
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column_sql}")
+                added.append(f"{table.name}.{column.name}")
+    if added:
+        logger.info("Sütunlar eklendi: %s", ", ".join(added))
+    return added
+
+
+def ensure_indexes(bind=engine):
+    """Modellerde tanımlı, mevcut tablolarda eksik olan indeksleri oluşturur
+
+    create_all var olan tablolara dokunmadığı için sonradan eklenen indeksler
+    eski veritabanlarında burada oluşturulur. Tekrar çalıştırmak güvenlidir.
+    """
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def migration_applied(bind, name):
+    with Session(bind=bind) as db:
+        return db.get(models.SchemaMigration, name) is not None
+
+
+def backfill_order_items(bind=engine, attempts=BACKFILL_LOCK_ATTEMPTS):
+    """Kalemleri olmayan eski siparişlerin products metninden order_items satırlarını üretir
+
+    Yalnızca hiç kalemi olmayan normal siparişlere dokunur ve veritabanı başına
+    bir kez çalışır: schema_migrations kaydı kalemlerle aynı işlemde eklenir.
+    Aynı anda başlayan ikinci işlem birincinin commit'ini bekler, birincil
+    anahtar çakışmasıyla vazgeçer; böylece kalemler çoğaltılmaz. Bekleme
+    busy_timeout'u aşarsa kayıt yeniden kontrol edilir; kilit hâlâ
+    bırakılmadıysa göç atlanır ve bir sonraki açılışta tekrar denenir,
+    uygulamanın açılışı bu yüzden başarısız olmaz. Eski siparişlerin birim
+    fiyatı bilinmediği için ürünün güncel fiyatı kullanılır.
+    """
+    for attempt in range(1, attempts + 1):
+        if migration_applied(bind, BACKFILL_ORDER_ITEMS):
+            return 0
+        try:
+            return _backfill_order_items(bind)
+        except IntegrityError:
+            # Başka bir işlem kaydı önce ekledi
+            return 0
+        except OperationalError as e:
+            logger.warning("Sipariş kalemi göçü kilit bekledi (deneme %d/%d): %s", attempt, attempts, e)
+
+    if not migration_applied(bind, BACKFILL_ORDER_ITEMS):
+        logger.warning("Sipariş kalemi göçü atlandı, veritabanı kilitli; sonraki açılışta tekrar denenecek")
+    return 0
+
+
+def _backfill_order_items(bind):
+    from crud import parse_order_products
+
+    db = Session(bind=bind)
+    try:
+        # İşlemin ilk ifadesi yazma olsun ki kilit baştan alınsın
+        db.add(models.SchemaMigration(name=BACKFILL_ORDER_ITEMS, applied_at=datetime.now().isoformat()))
+        db.flush()
+
+        orders = db.query(models.Order).filter(
+            models.Order.order_type == "normal",
+            ~models.Order.items.any()
+        ).all()
+        if not orders:
+            db.commit()
+            return 0
+
+        prices = dict(db.query(models.Product.id, models.Product.price).all())
+        created = 0
+        for order in orders:
+            for product_id, quantity in parse_order_products(order.products or "").items():
+                if product_id not in prices:
+                    continue
+                db.add(models.OrderItem(
+                    order_id=order.id,
+                    product_id=product_id,
+                    quantity=quantity,
+                    unit_price=prices[product_id]
+                ))
+                created += 1
+        db.commit()
+        if created:
+            logger.info("%d sipariş kalemi oluşturuldu", created)
+        return created
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
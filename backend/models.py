@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Float, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -28,6 +28,10 @@ class Admin(Base):
 
 class UserCart(Base):
     __tablename__ = "user_carts"
+    __table_args__ = (
+        # Sepet okuma ve "bu ürün sepette var mı" sorguları için
+        Index("ix_user_carts_user_product", "user_id", "product_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -35,6 +39,8 @@ class UserCart(Base):
     quantity = Column(Integer, default=1)
     added_at = Column(String)  # ISO format string
 
+    product = relationship("Product")
+
 
 class Product(Base):
     __tablename__ = "products"
@@ -45,11 +51,15 @@ class Product(Base):
     price = Column(Float, index=True)
     image_url = Column(String, nullable=True)
     stock = Column(Integer, default=0)
-    category = Column(String, nullable=True)
+    category = Column(String, nullable=True, index=True)
 
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Müşteri adı ve telefonuyla sipariş geçmişi, en yeni sipariş önce
+        Index("ix_orders_customer_lookup", "customer_name", "customer_phone", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     customer_name = Column(String)
@@ -60,6 +70,22 @@ class Order(Base):
     status = Column(String, default="Beklemede")  # Beklemede, Tamamlandı, İptal
     order_type = Column(String, default="normal")  # normal, custom_design
     custom_design_id = Column(Integer, nullable=True)  # Custom design ID'si
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Giriş yapmış kullanıcı
+
+    items = relationship("OrderItem", back_populates="order")
+
+
+class OrderItem(Base):
+    __tablename__ = "order_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), index=True)
+    quantity = Column(Integer)
+    unit_price = Column(Float)  # Sipariş anındaki ürün fiyatı
+
+    order = relationship("Order", back_populates="items")
+    product = relationship("Product")
 
 
 class CustomDesign(Base):
@@ -70,9 +96,53 @@ class CustomDesign(Base):
     customer_phone = Column(String)
     description = Column(String)
     file_path = Column(String, nullable=True)
+    original_filename = Column(String, nullable=True)  # Kullanıcının yüklediği dosyanın adı
     created_at = Column(String)  # ISO format string
     # Filament analiz bilgileri
     weight_grams = Column(Float, nullable=True)
     print_time_hours = Column(Float, nullable=True)
     sales_price = Column(String, nullable=True)
-    infill_ratio = Column(Float, nullable=True) 
\ No newline at end of file
+    infill_ratio = Column(Float, nullable=True) 
+
+class STLAnalysisCache(Base):
+    __tablename__ = "stl_analysis_cache"
+    __table_args__ = (
+        UniqueConstraint("file_hash", "params_key", name="uq_stl_analysis_cache_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    file_hash = Column(String)  # STL dosyasının SHA-256 özeti
+    params_key = Column(String)  # Filament, infill ve katman yüksekliği
+    result = Column(String)  # JSON formatında analiz sonucu
+    created_at = Column(String)  # ISO format string
+
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    file_path = Column(String)  # uploads klasörüne göre dosya adı
+    file_hash = Column(String, index=True)
+    params_key = Column(String)
+    filament_type = Column(String, nullable=True)
+    infill_ratio = Column(Float, nullable=True)
+    status = Column(String, default="Beklemede")  # Beklemede, İşleniyor, Tamamlandı, Hata
+    result = Column(String, nullable=True)  # JSON formatında analiz sonucu
+    error = Column(String, nullable=True)
+    created_at = Column(String)  # ISO format string
+    started_at = Column(String, nullable=True)  # İşin bir işlem tarafından alındığı an
+    finished_at = Column(String, nullable=True)  # ISO format string
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, default=0)  # Tablodaki her değişiklikte artar
+
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    name = Column(String, primary_key=True)  # Bir kez çalışan veri göçünün adı
+    applied_at = Column(String)  # ISO format string
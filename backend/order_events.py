@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+
+# Abone başına bekleyen en fazla olay; dolarsa en eskisi atılır
+ORDER_EVENTS_QUEUE_SIZE = int(os.environ.get("ORDER_EVENTS_QUEUE_SIZE", "100"))
+
+# Yeniden bağlanan istemcilere (Last-Event-ID) tekrar gönderilecek son olaylar
+ORDER_EVENTS_HISTORY = int(os.environ.get("ORDER_EVENTS_HISTORY", "256"))
+
+# Bağlantı açık kalsın diye boşta gönderilen yorum satırı aralığı (saniye)
+SSE_KEEPALIVE_SECONDS = float(os.environ.get("SSE_KEEPALIVE_SECONDS", "15"))
+
+# İstemcinin bağlantı koptuğunda yeniden denemeden önce bekleyeceği süre (ms)
+SSE_RETRY_MS = 3000
+
+ORDER_CREATED = "order_created"
+ORDER_STATUS = "order_status"
+CUSTOM_DESIGN_CREATED = "custom_design_created"
+
+
+def order_event(event_type, order, **fields):
+    """Sipariş kaydından istemciye gidecek küçük olay gövdesini oluşturur"""
+    event = {
+        "type": event_type,
+        "order_id": order.id,
+        "status": order.status,
+        "customer_name": order.customer_name,
+        "customer_phone": order.customer_phone,
+        "user_id": order.user_id,
+    }
+    event.update(fields)
+    return event
+
+
+def format_sse(event):
+    """Olayı text/event-stream biçimine çevirir"""
+    data = json.dumps({k: v for k, v in event.items() if k != "id"}, ensure_ascii=False, default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """Tek bir SSE bağlantısının olay kuyruğu; olay döngüsünün içinde kullanılır"""
+
+    def __init__(self, bus, loop, predicate=None, max_queue=ORDER_EVENTS_QUEUE_SIZE):
+        self.bus = bus
+        self.loop = loop
+        self.predicate = predicate
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def matches(self, event):
+        return self.predicate is None or self.predicate(event)
+
+    def _deliver(self, event):
+        # Yavaş istemci belleği şişirmesin: kuyruk doluysa en eski olay atılır
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """Sıradaki olayı bekler; süre dolarsa None döner"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class OrderEventBus:
+    """İşlem içi yayın/abone veriyolu
+
+    publish() herhangi bir iş parçacığından (örn. threadpool'daki crud
+    çağrıları) çağrılabilir; olaylar her abonenin olay döngüsüne
+    call_soon_threadsafe ile aktarılır. Olaylar yalnızca bu işlemdeki
+    abonelere ulaşır.
+    """
+
+    def __init__(self, history_size=ORDER_EVENTS_HISTORY):
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, predicate=None, last_event_id=None, max_queue=ORDER_EVENTS_QUEUE_SIZE):
+        """Çalışan olay döngüsüne bağlı yeni abonelik açar
+
+        last_event_id verilirse geçmişte kalan ve filtreye uyan olaylar
+        kuyruğa önceden eklenir.
+        """
+        subscription = Subscription(self, asyncio.get_running_loop(), predicate, max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+            missed = [e for e in self._history if last_event_id is not None and e["id"] > last_event_id]
+        for event in missed:
+            if subscription.matches(event):
+                subscription._deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event):
+        """Olaya sıra numarası verir ve eşleşen abonelere iletir"""
+        with self._lock:
+            self._last_id += 1
+            event = dict(event, id=self._last_id)
+            self._history.append(event)
+            subscribers = [s for s in self._subscribers if s.matches(event)]
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Olay döngüsü kapanmış; bağlantı zaten sona ermiş
+                self.unsubscribe(subscription)
+        return event
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+def customer_filter(customer_name, customer_phone):
+    """Yalnızca verilen müşterinin siparişlerine ait olayları geçirir"""
+    return lambda event: event.get("customer_name") == customer_name and event.get("customer_phone") == customer_phone
+
+
+async def iter_sse(subscription, is_disconnected, keepalive=SSE_KEEPALIVE_SECONDS):
+    """Abonelik olaylarını SSE satırları olarak üretir, bağlantı kopunca aboneliği kapatır"""
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while not await is_disconnected():
+            event = await subscription.get(timeout=keepalive)
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield format_sse(event)
+    finally:
+        subscription.close()
+
+
+order_events = OrderEventBus()
@@ -0,0 +1,35 @@
+import base64
+import json
+
+# Sayfalama yanıtlarında sonraki sayfanın imleci bu başlıkta döner
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(last_id):
+    """Son satırın ID'sinden istemciye verilecek opak imleci üretir"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """İmleci çözer, bu ID'den sonraki satırlar istenir; geçersizse InvalidCursorError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = payload["id"]
+    except (ValueError, KeyError, TypeError, UnicodeEncodeError):
+        raise InvalidCursorError("Geçersiz sayfa imleci")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursorError("Geçersiz sayfa imleci")
+    return last_id
+
+
+def next_cursor(rows, limit, id_of=lambda row: row.id):
+    """Sayfa doluysa son satırdan sonraki sayfanın imlecini, değilse None döner"""
+    if limit <= 0 or len(rows) < limit:
+        return None
+    return encode_cursor(id_of(rows[-1]))
@@ -0,0 +1,137 @@
+import logging
+import re
+
+from sqlalchemy import and_, column, or_, select, table, text
+
+import models
+
+# Ürün adı, açıklaması ve kategorisi için FTS5 dizini
+FTS_TABLE = "products_fts"
+
+# bm25 sütun ağırlıkları: ad, açıklama, kategori
+BM25_WEIGHTS = (10.0, 2.0, 4.0)
+
+# Aramada dikkate alınacak en fazla kelime
+MAX_QUERY_TERMS = 8
+
+# Türkçe noktasız ı, unicode61 katlamasında i'ye dönüşmez; diğer harfler
+# (ş, ğ, ç, ö, ü, İ) remove_diacritics ile zaten sadeleşir
+_FOLD_SQL = "lower(replace(replace(coalesce({value}, ''), 'ı', 'i'), 'I', 'i'))"
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+logger = logging.getLogger(__name__)
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+# Başlangıçta FTS5 dizini kurulabildiyse True olur, yoksa LIKE ile aranır
+fts_enabled = False
+
+
+def fold_turkish(value):
+    """Arama metnini dizindeki biçime getirir: büyük/küçük harf ve Türkçe i/ı farkı yok sayılır"""
+    return value.replace("I", "ı").replace("İ", "i").lower().replace("ı", "i")
+
+
+def build_match_query(query):
+    """Kullanıcı metninden FTS5 MATCH ifadesi üretir; her kelime önek olarak aranır"""
+    terms = _TERM_PATTERN.findall(fold_turkish(query))[:MAX_QUERY_TERMS]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _folded_columns(prefix):
+    return ", ".join(
+        _FOLD_SQL.format(value=f"{prefix}.{name}") for name in ("name", "description", "category")
+    )
+
+
+def ensure_product_search(bind):
+    """FTS5 dizinini ve eşitleme tetikleyicilerini oluşturur, dizin eksikse yeniden doldurur
+
+    Yalnızca SQLite'ta çalışır; FTS5 yoksa veya başka bir veritabanıysa
+    arama LIKE sorgusuna döner.
+    """
+    global fts_enabled
+    if bind.dialect.name != "sqlite":
+        fts_enabled = False
+        return False
+
+    try:
+        with bind.begin() as conn:
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "name, description, category, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            conn.exec_driver_sql(f"""
+                CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+                    INSERT INTO {FTS_TABLE} (rowid, name, description, category)
+                    VALUES (new.id, {_folded_columns('new')});
+                END
+            """)
+            conn.exec_driver_sql(f"""
+                CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+                    DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+                END
+            """)
+            conn.exec_driver_sql(f"""
+                CREATE TRIGGER IF NOT EXISTS products_fts_update
+                AFTER UPDATE OF name, description, category ON products BEGIN
+                    DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+                    INSERT INTO {FTS_TABLE} (rowid, name, description, category)
+                    VALUES (new.id, {_folded_columns('new')});
+                END
+            """)
+
+            indexed = conn.exec_driver_sql(f"SELECT count(*) FROM {FTS_TABLE}").scalar()
+            products = conn.exec_driver_sql("SELECT count(*) FROM products").scalar()
+            if indexed != products:
+                conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+                conn.exec_driver_sql(
+                    f"INSERT INTO {FTS_TABLE} (rowid, name, description, category) "
+                    f"SELECT p.id, {_folded_columns('p')} FROM products AS p"
+                )
+                logger.info("Arama dizini yeniden oluşturuldu: %d ürün", products)
+    except Exception as e:
+        logger.warning("FTS5 kullanılamıyor, LIKE aramasına dönülüyor: %s", e)
+        fts_enabled = False
+        return False
+
+    fts_enabled = True
+    return True
+
+
+def search_products_query(query, category=None, min_price=None, max_price=None, skip=0, limit=20):
+    """Ürün arama sorgusunu kurar; FTS5 varsa bm25 sıralı, yoksa LIKE ile"""
+    filters = []
+    if category:
+        filters.append(models.Product.category == category)
+    if min_price is not None:
+        filters.append(models.Product.price >= min_price)
+    if max_price is not None:
+        filters.append(models.Product.price <= max_price)
+
+    match = build_match_query(query)
+    if not match:
+        return None
+
+    if fts_enabled:
+        weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+        statement = (
+            select(models.Product)
+            .join(_fts, _fts.c.rowid == models.Product.id)
+            .where(text(f"{FTS_TABLE} MATCH :match").bindparams(match=match), *filters)
+            .order_by(text(f"bm25({FTS_TABLE}, {weights})"), models.Product.id)
+        )
+    else:
+        terms = _TERM_PATTERN.findall(query)[:MAX_QUERY_TERMS]
+        statement = (
+            select(models.Product)
+            .where(
+                and_(*[
+                    or_(models.Product.name.ilike(f"%{term}%"), models.Product.description.ilike(f"%{term}%"))
+                    for term in terms
+                ]),
+                *filters
+            )
+            .order_by(models.Product.name, models.Product.id)
+        )
+    return statement.offset(skip).limit(limit)
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from analysis_cache import file_sha256
+from upload_storage import MAX_UPLOAD_BYTES, UPLOADS_DIR, UploadTooLargeError, store_content_addressed
+
+# Yarım kalan yüklemeler burada tutulur
+STAGING_DIR = os.path.join(UPLOADS_DIR, ".partial")
+
+# Tek istekte kabul edilecek en büyük parça
+MAX_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Bu süreden uzun süre dokunulmayan yüklemeler silinir (saniye)
+STALE_UPLOAD_SECONDS = 24 * 60 * 60
+
+
+class UploadSessionNotFoundError(Exception):
+    pass
+
+
+class UploadOffsetError(Exception):
+    def __init__(self, message, received_bytes):
+        super().__init__(message)
+        self.received_bytes = received_bytes
+
+
+class ResumableUploadStore:
+    """Parça parça, kaldığı yerden devam ettirilebilen yüklemeleri yönetir
+
+    Her yükleme için diskte bir .part veri dosyası ve bir .json bilgi dosyası
+    tutulur; bağlantı koptuğunda istemci alınan bayt sayısını sorup eksik
+    kısımdan devam eder. Tamamlanan dosya içerik özetiyle adlandırılıp
+    uploads klasörüne taşınır.
+    """
+
+    def __init__(self, staging_dir=STAGING_DIR, uploads_dir=UPLOADS_DIR, max_bytes=MAX_UPLOAD_BYTES):
+        self.staging_dir = staging_dir
+        self.uploads_dir = uploads_dir
+        self.max_bytes = max_bytes
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _paths(self, upload_id):
+        # upload_id istemciden gelir, yol dışına çıkılmasın
+        if not upload_id.isalnum():
+            raise UploadSessionNotFoundError(upload_id)
+        base = os.path.join(self.staging_dir, upload_id)
+        return base + ".part", base + ".json"
+
+    def _lock_for(self, upload_id):
+        """Var olan yükleme için kilidi döner; olmayan kimlikler için kilit oluşturulmaz"""
+        part_path, meta_path = self._paths(upload_id)
+        if not os.path.exists(meta_path) or not os.path.exists(part_path):
+            raise UploadSessionNotFoundError(upload_id)
+        with self._locks_guard:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def _forget_lock(self, upload_id):
+        with self._locks_guard:
+            self._locks.pop(upload_id, None)
+
+    def _load_meta(self, upload_id):
+        part_path, meta_path = self._paths(upload_id)
+        if not os.path.exists(meta_path) or not os.path.exists(part_path):
+            raise UploadSessionNotFoundError(upload_id)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["received_bytes"] = os.path.getsize(part_path)
+        return meta
+
+    def create(self, filename, total_size):
+        if total_size < 0:
+            raise ValueError("Geçersiz dosya boyutu")
+        if self.max_bytes is not None and total_size > self.max_bytes:
+            raise UploadTooLargeError(
+                f"Dosya boyutu sınırı aşıldı ({self.max_bytes / 1024 / 1024:.0f} MB)"
+            )
+
+        os.makedirs(self.staging_dir, exist_ok=True)
+        upload_id = uuid.uuid4().hex
+        part_path, meta_path = self._paths(upload_id)
+        meta = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "total_size": total_size,
+            "created_at": datetime.now().isoformat()
+        }
+        open(part_path, "wb").close()
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        meta["received_bytes"] = 0
+        return meta
+
+    def status(self, upload_id):
+        return self._load_meta(upload_id)
+
+    def write_chunk(self, upload_id, offset, data):
+        """Parçayı verilen konuma yazar; yeniden gönderilen parçaların üzerine yazılır"""
+        if len(data) > MAX_CHUNK_BYTES:
+            raise UploadTooLargeError(f"Parça boyutu sınırı aşıldı ({MAX_CHUNK_BYTES} bayt)")
+
+        with self._lock_for(upload_id):
+            meta = self._load_meta(upload_id)
+            received = meta["received_bytes"]
+            if offset < 0 or offset > received:
+                raise UploadOffsetError("Parça konumu alınan veriyle uyuşmuyor", received)
+            if offset + len(data) > meta["total_size"]:
+                raise UploadOffsetError("Parça bildirilen dosya boyutunu aşıyor", received)
+
+            part_path, _ = self._paths(upload_id)
+            with open(part_path, "r+b") as f:
+                f.seek(offset)
+                f.write(data)
+
+            meta["received_bytes"] = max(received, offset + len(data))
+            return meta
+
+    def finalize(self, upload_id):
+        """Eksiksiz yüklemeyi içerik özetiyle uploads klasörüne taşır
+
+        Dönüş: (kayıt adı, özet, boyut, orijinal dosya adı)
+        """
+        with self._lock_for(upload_id):
+            meta = self._load_meta(upload_id)
+            if meta["received_bytes"] != meta["total_size"]:
+                raise UploadOffsetError("Yükleme henüz tamamlanmadı", meta["received_bytes"])
+
+            part_path, meta_path = self._paths(upload_id)
+            file_hash = file_sha256(part_path)
+            os.makedirs(self.uploads_dir, exist_ok=True)
+            stored_name = store_content_addressed(part_path, file_hash, self.uploads_dir)
+            os.remove(meta_path)
+
+        self._forget_lock(upload_id)
+        return stored_name, file_hash, meta["total_size"], meta["filename"]
+
+    def cleanup_stale(self, max_age_seconds=STALE_UPLOAD_SECONDS):
+        """Uzun süredir devam ettirilmeyen yarım yüklemeleri siler
+
+        Yüklemenin yaşı son parçanın yazıldığı .part dosyasından ölçülür
+        (.json yalnızca oluşturulurken yazılır); .part ve .json birlikte silinir.
+        Dönüş: silinen yükleme sayısı
+        """
+        if not os.path.isdir(self.staging_dir):
+            return 0
+
+        removed = 0
+        cutoff = time.time() - max_age_seconds
+        upload_ids = {os.path.splitext(name)[0] for name in os.listdir(self.staging_dir)}
+        for upload_id in upload_ids:
+            try:
+                part_path, meta_path = self._paths(upload_id)
+            except UploadSessionNotFoundError:
+                continue
+            # .part yoksa (yarım kalmış kayıt) .json'un yaşına bakılır
+            age_path = part_path if os.path.exists(part_path) else meta_path
+            try:
+                if os.path.getmtime(age_path) >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+
+            for path in (part_path, meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._forget_lock(upload_id)
+            removed += 1
+        return removed
+
+
+resumable_uploads = ResumableUploadStore()
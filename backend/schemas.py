@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import List, Optional
+import json
 
 # User Schemas
 class UserRegister(BaseModel):
@@ -112,8 +113,18 @@ class OrderBase(BaseModel):
 class OrderCreate(OrderBase):
     pass
 
+class OrderItem(BaseModel):
+    product_id: int
+    quantity: int
+    unit_price: float
+
+    class Config:
+        from_attributes = True
+
 class Order(OrderBase):
     id: int
+    user_id: Optional[int] = None
+    items: List[OrderItem] = []
 
     class Config:
         from_attributes = True
@@ -124,6 +135,7 @@ class CustomDesignBase(BaseModel):
     customer_phone: str
     description: str
     file_path: Optional[str] = None
+    original_filename: Optional[str] = None
     created_at: str
     # Filament analiz bilgileri
     weight_grams: Optional[float] = None
@@ -138,4 +150,59 @@ class CustomDesign(CustomDesignBase):
     id: int
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+# Analysis Job Schemas
+class AnalysisJobCreate(BaseModel):
+    file_path: str
+    filament_type: Optional[str] = None
+    infill_ratio: Optional[float] = None
+
+class AnalysisJob(BaseModel):
+    id: int
+    file_path: str
+    file_hash: str
+    filament_type: Optional[str] = None
+    infill_ratio: Optional[float] = None
+    status: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    @field_validator("result", mode="before")
+    @classmethod
+    def parse_result(cls, value):
+        # Veritabanında JSON metni olarak saklanır
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    class Config:
+        from_attributes = True
+
+# Resumable Upload Schemas
+class ResumableUploadCreate(BaseModel):
+    filename: str
+    total_size: int
+
+class ResumableUploadStatus(BaseModel):
+    upload_id: str
+    filename: str
+    total_size: int
+    received_bytes: int
+    created_at: str
+
+# Batch Analysis Schemas
+class BatchAnalysisRequest(BaseModel):
+    items: List[str]
+    filament_type: Optional[str] = None
+    infill_ratio: Optional[float] = None
+
+# Rapor Schemas
+class BestSeller(BaseModel):
+    product_id: int
+    product_name: str
+    quantity_sold: int
+    revenue: float
@@ -1,89 +1,215 @@
 import numpy as np
-from stl import mesh
+import logging
 import os
 import math
+import time
+
+from stl_reader import iter_stl_triangles
+from stl_settings import (
+    DEFAULT_FILAMENT,
+    DEFAULT_INFILL,
+    FILAMENT_DENSITIES,
+    INFILL_RATIOS,
+    LAYER_HEIGHT,
+)
+from stl_slicer import LayerSlicer
+
+logger = logging.getLogger(__name__)
+
+# Tek ayrıştırmada katmanlara ayırma için bellekte tutulacak en fazla üçgen verisi (bayt).
+# Daha büyük dosyalarda parçalar bırakılır, katmanlara ayırma dosyayı yeniden okur.
+MAX_RETAINED_TRIANGLE_BYTES = int(os.environ.get("STL_MAX_RETAINED_TRIANGLE_BYTES", str(512 * 1024 * 1024)))
+
+
+def _vertex_hashes(vertices):
+    """Köşe koordinatlarından iki bağımsız 64 bitlik özet üretir"""
+    # -0.0 ile 0.0 aynı köşe sayılsın diye 0.0 eklenir
+    bits = (vertices.astype(np.float32) + np.float32(0.0)).view(np.uint32).astype(np.uint64)
+    x, y, z = bits[..., 0], bits[..., 1], bits[..., 2]
+    h1 = (x * np.uint64(0x9E3779B97F4A7C15)) ^ (y * np.uint64(0xC2B2AE3D27D4EB4F)) ^ (z * np.uint64(0x165667B19E3779F9))
+    h2 = (x * np.uint64(0xD6E8FEB86659FD93)) ^ (y * np.uint64(0xFF51AFD7ED558CCD)) ^ (z * np.uint64(0xC4CEB9FE1A85EC53))
+    return h1 | np.uint64(1), h2 | np.uint64(1)
+
+
+class MeshAccumulator:
+    """Üçgen parçalarından hacim, yüzey alanı, sınır kutusu ve kapalılık bilgisini biriktirir
+
+    Hacim, her üçgenin referans noktasıyla oluşturduğu işaretli tetrahedron
+    hacimlerinin toplamıdır. Kapalılık için her yönlü kenarın (a -> b) ters
+    yönlü bir eşinin (b -> a) olması beklenir; ters simetrik bir özet toplamı
+    kapalı ve tutarlı yönlendirilmiş bir yüzeyde sıfırlanır. Parçalar sırayla
+    eklendiği için bütün dosyanın belleğe alınması gerekmez.
+    """
+
+    def __init__(self):
+        self.origin = None
+        self.signed_volume = 0.0
+        self.surface_area = 0.0
+        self.bbox_min = np.full(3, np.inf)
+        self.bbox_max = np.full(3, -np.inf)
+        self.triangle_count = 0
+        self.edge_sum = np.uint64(0)
+
+    def add(self, vectors):
+        vectors = np.asarray(vectors)
+        if vectors.size == 0:
+            return
+
+        # Sayısal hassasiyet için ilk köşeyi referans noktası al
+        if self.origin is None:
+            self.origin = vectors[0, 0, :].astype(np.float64)
+
+        v0 = vectors[:, 0, :] - self.origin
+        v1 = vectors[:, 1, :] - self.origin
+        v2 = vectors[:, 2, :] - self.origin
+
+        self.signed_volume += float(np.einsum('ij,ij->', v0, np.cross(v1, v2))) / 6.0
+        self.surface_area += 0.5 * float(np.linalg.norm(np.cross(v1 - v0, v2 - v0), axis=1).sum())
+
+        flat = vectors.reshape(-1, 3)
+        self.bbox_min = np.minimum(self.bbox_min, flat.min(axis=0))
+        self.bbox_max = np.maximum(self.bbox_max, flat.max(axis=0))
+        self.triangle_count += int(vectors.shape[0])
+
+        # Kenar eşleşmesi: f(a, b) = h1(a) * h2(b) - h1(b) * h2(a), uint64 taşmasıyla
+        h1, h2 = _vertex_hashes(vectors)
+        h1_next = np.roll(h1, -1, axis=1)
+        h2_next = np.roll(h2, -1, axis=1)
+        with np.errstate(over='ignore'):
+            self.edge_sum += np.sum(h1 * h2_next - h1_next * h2, dtype=np.uint64)
+
+    def result(self):
+        if self.triangle_count == 0:
+            return {
+                'volume_mm3': 0.0,
+                'surface_area_mm2': 0.0,
+                'bbox_min': [0.0, 0.0, 0.0],
+                'bbox_max': [0.0, 0.0, 0.0],
+                'triangle_count': 0,
+                'is_watertight': False,
+            }
+
+        return {
+            'volume_mm3': self.signed_volume,
+            'surface_area_mm2': self.surface_area,
+            'bbox_min': [float(v) for v in self.bbox_min],
+            'bbox_max': [float(v) for v in self.bbox_max],
+            'triangle_count': self.triangle_count,
+            'is_watertight': bool(self.edge_sum == 0),
+        }
+
+
+def compute_mesh_properties(vectors):
+    """Üçgen dizisinden (N, 3, 3) geometri bilgisini tek geçişte hesaplar"""
+    accumulator = MeshAccumulator()
+    accumulator.add(vectors)
+    return accumulator.result()
+
+
+def geometry_volume_cm3(geometry):
+    """Geometri bilgisinden baskı için kullanılacak hacmi seçer (cm³)"""
+    if geometry['is_watertight']:
+        return abs(geometry['volume_mm3']) / 1000
+
+    # Açık yüzeyde gerçek hacim tanımsız, sınır kutusundan tahmin et
+    width, height, depth = (mx - mn for mn, mx in zip(geometry['bbox_min'], geometry['bbox_max']))
+    volume_cm3 = width * height * depth * 0.3 / 1000  # 0.3 faktörü daha gerçekçi
+
+    # Çok büyük değerler için sınırlama
+    if volume_cm3 > 5000:  # 5 litre üzeri mantıksız
+        volume_cm3 = volume_cm3 / 50
+
+    return volume_cm3
+
 
 class STLAnalyzer:
     def __init__(self):
         # Filament yoğunlukları (g/cm³)
-        self.filament_densities = {
-            'PLA': 1.24,
-            'ABS': 1.04,
-            'PETG': 1.27,
-            'TPU': 1.21,
-            'PC': 1.19
-        }
+        self.filament_densities = dict(FILAMENT_DENSITIES)
         
         # Varsayılan filament tipi
-        self.default_filament = 'PLA'
+        self.default_filament = DEFAULT_FILAMENT
         
         # Infill oranları (0-1 arası)
-        self.infill_ratios = {
-            'düşük': 0.15,
-            'orta': 0.25,
-            'yüksek': 0.35,
-            'katı': 0.95
-        }
+        self.infill_ratios = dict(INFILL_RATIOS)
         
         # Varsayılan infill oranı
-        self.default_infill = 0.25
+        self.default_infill = DEFAULT_INFILL
         
         # Katman yüksekliği (mm)
-        self.layer_height = 0.2
+        self.layer_height = LAYER_HEIGHT
         
         # Filament çapı (mm)
         self.filament_diameter = 1.75
         
-    def calculate_volume(self, stl_file_path):
-        """STL dosyasından hacim hesaplar (cm³)"""
+        # Baskı hızları (mm/s)
+        self.print_speeds = {
+            'perimeter': 40.0,
+            'infill': 60.0,
+            'travel': 150.0
+        }
+        
+        # Ekstrüzyon çizgi genişliği (mm)
+        self.line_width = 0.45
+        
+        # Duvar (perimeter) sayısı
+        self.wall_count = 2
+        
+        # Alt ve üstte tam dolu basılan katman sayısı
+        self.solid_layers = 3
+        
+        # Katman değişimi ve geri çekme için katman başına ek süre (saniye)
+        self.layer_change_seconds = 1.5
+        
+        # Son analizin aşama süreleri (saniye)
+        self.phase_timings = {}
+        
+    def _iter_triangles(self, stl_file_path):
+        """Üçgen parçalarını döndürür, dosya okuma süresini 'parse' aşamasına ekler"""
+        chunks = iter_stl_triangles(stl_file_path)
+        while True:
+            started = time.perf_counter()
+            vectors = next(chunks, None)
+            self.phase_timings['parse'] = self.phase_timings.get('parse', 0.0) + time.perf_counter() - started
+            if vectors is None:
+                return
+            yield vectors
+    
+    def load_mesh(self, stl_file_path, max_retained_bytes=MAX_RETAINED_TRIANGLE_BYTES):
+        """Dosyayı bir kez ayrıştırır; geometriyi ve okunan üçgen parçalarını döndürür
+
+        Parçalar slice_layers'a verilirse dosya ikinci kez okunmaz. Binary
+        dosyalarda parçalar memory-map görünümüdür. Toplam boyut
+        max_retained_bytes'ı aşarsa parçalar yerine None döner.
+        Dönüş: (geometri, parçalar); hata durumunda (None, None)
+        """
         try:
-            # Dosya boyutunu kontrol et
-            file_size = os.path.getsize(stl_file_path)
-            if file_size > 50 * 1024 * 1024:  # 50MB üzeri dosyalar için basit hesaplama
-                print(f"Büyük dosya tespit edildi ({file_size / 1024 / 1024:.1f} MB), basit hesaplama kullanılıyor")
-                # Dosya boyutundan basit hacim tahmini - daha gerçekçi
-                estimated_volume_cm3 = file_size / (1024 * 50)  # Daha gerçekçi oran
-                return estimated_volume_cm3
-            
-            # STL dosyasını yükle
-            mesh_obj = mesh.Mesh.from_file(stl_file_path)
-            
-            # Gerçek hacim hesaplama
-            vectors = mesh_obj.vectors
-            
-            # Modelin sınırlarını bul
-            min_x = min_y = min_z = float('inf')
-            max_x = max_y = max_z = float('-inf')
-            
-            for triangle in vectors:
-                for vertex in triangle:
-                    min_x = min(min_x, vertex[0])
-                    min_y = min(min_y, vertex[1])
-                    min_z = min(min_z, vertex[2])
-                    max_x = max(max_x, vertex[0])
-                    max_y = max(max_y, vertex[1])
-                    max_z = max(max_z, vertex[2])
-            
-            # Model boyutları (mm)
-            width = max_x - min_x
-            height = max_y - min_y
-            depth = max_z - min_z
-            
-            # Daha gerçekçi hacim hesaplama
-            # Modelin doluluğunu daha düşük tahmin et
-            volume_mm3 = width * height * depth * 0.3  # 0.3 faktörü daha gerçekçi
-            
-            # cm³'e çevir
-            volume_cm3 = volume_mm3 / 1000
-            
-            # Çok büyük değerler için sınırlama
-            if volume_cm3 > 5000:  # 5 litre üzeri mantıksız
-                volume_cm3 = volume_cm3 / 50
-            
-            return volume_cm3
+            accumulator = MeshAccumulator()
+            chunks, retained_bytes = [], 0
+            for vectors in self._iter_triangles(stl_file_path):
+                accumulator.add(vectors)
+                if chunks is not None:
+                    retained_bytes += vectors.nbytes
+                    if retained_bytes > max_retained_bytes:
+                        chunks = None
+                    else:
+                        chunks.append(vectors)
+            return accumulator.result(), chunks
         except Exception as e:
-            print(f"STL dosyası analiz edilirken hata: {e}")
+            logger.warning("STL dosyası analiz edilirken hata: %s", e)
+            return None, None
+
+    def calculate_geometry(self, stl_file_path):
+        """STL dosyasının hacim, yüzey alanı ve sınır kutusunu tek geçişte hesaplar"""
+        geometry, _ = self.load_mesh(stl_file_path, max_retained_bytes=0)
+        return geometry
+
+    def calculate_volume(self, stl_file_path):
+        """STL dosyasından hacim hesaplar (cm³)"""
+        geometry = self.calculate_geometry(stl_file_path)
+        if geometry is None:
             return None
+        return geometry_volume_cm3(geometry)
     
     def calculate_filament_weight(self, volume_cm3, filament_type=None, infill_ratio=None):
         """Hacimden filament ağırlığını hesaplar (gram)"""
@@ -99,17 +225,75 @@ class STLAnalyzer:
         # Yoğunluğu al
         density = self.filament_densities.get(filament_type, self.filament_densities[self.default_filament])
         
+        return float(self._filament_weights(volume_cm3, density, infill_ratio))
+    
+    def _filament_weights(self, volume_cm3, densities, infill_ratios):
+        """Ağırlık formülünün dizi destekli hali (gram)"""
         # Daha gerçekçi ağırlık hesaplama
         # PLA yoğunluğu: 1.24 g/cm³
         # Infill oranı: 0.25 (orta)
         # Gerçek dünya faktörü: 0.6 (daha düşük)
-        weight_grams = volume_cm3 * density * infill_ratio * 0.6
+        weight_grams = volume_cm3 * np.asarray(densities) * np.asarray(infill_ratios) * 0.6
         
         # Makul sınırlar
-        if weight_grams > 500:  # 500g üzeri kontrol
-            weight_grams = weight_grams / 5
+        # 500g üzeri kontrol
+        return np.where(weight_grams > 500, weight_grams / 5, weight_grams)
+    
+    def slice_layers(self, stl_file_path, geometry, layer_height=None, chunks=None):
+        """Modeli katmanlara böler, her katmanın kesit çevresini ve alanını döndürür
+
+        chunks: load_mesh'in döndürdüğü üçgen parçaları; verilmezse dosya okunur
+        """
+        if layer_height is None:
+            layer_height = self.layer_height
         
-        return weight_grams
+        try:
+            slicer = LayerSlicer(layer_height, geometry['bbox_min'], geometry['bbox_max'])
+            if chunks is None:
+                chunks = self._iter_triangles(stl_file_path)
+            for vectors in chunks:
+                slicer.add(vectors)
+            return slicer.result()
+        except Exception as e:
+            logger.warning("STL dosyası katmanlara ayrılırken hata: %s", e)
+            return None
+    
+    def estimate_layer_print_time(self, layers, infill_ratio=None):
+        """Katman kesitlerinden baskı süresini hesaplar (saat)
+
+        infill_ratio bir dizi olarak verilirse her oran için süre dizisi döner.
+        """
+        if layers is None:
+            return None
+        
+        if infill_ratio is None:
+            infill_ratio = self.default_infill
+        ratios = np.asarray(infill_ratio, dtype=float)
+        
+        perimeters = layers['perimeters_mm']
+        areas = layers['areas_mm2']
+        
+        # Duvarlar her konturu wall_count kez dolaşır
+        wall_path = perimeters * self.wall_count
+        
+        # Duvarların içinde kalan alan dolgu ile taranır, alt/üst katmanlar tam dolu
+        interior = np.maximum(areas - wall_path * self.line_width, 0.0)
+        solid = np.zeros(len(areas), dtype=bool)
+        if self.solid_layers > 0:
+            solid[:self.solid_layers] = True
+            solid[-self.solid_layers:] = True
+        solid_path = interior[solid].sum() / self.line_width
+        sparse_path = interior[~solid].sum() / self.line_width
+        
+        fixed_seconds = (
+            wall_path.sum() / self.print_speeds['perimeter']
+            + perimeters.sum() / self.print_speeds['travel']
+            + layers['layer_count'] * self.layer_change_seconds
+        )
+        seconds = fixed_seconds + (solid_path + ratios * sparse_path) / self.print_speeds['infill']
+        
+        hours = seconds / 3600
+        return float(hours) if hours.ndim == 0 else hours
     
     def calculate_print_time(self, volume_cm3, layer_height=None):
         """Yaklaşık baskı süresini hesaplar (saat)"""
@@ -147,34 +331,101 @@ class STLAnalyzer:
         # Basit hesaplama - 1 ondalık basamak
         return f"{min_price:.1f} - {max_price:.1f}"
     
+    def calculate_quote_matrix(self, volume_cm3, layers=None):
+        """Tüm filament ve dolgu seçenekleri için ağırlık, süre ve fiyatı tek seferde hesaplar"""
+        if volume_cm3 is None:
+            return None
+        
+        filaments = list(self.filament_densities)
+        levels = list(self.infill_ratios)
+        densities = np.array([self.filament_densities[f] for f in filaments])
+        ratios = np.array([self.infill_ratios[l] for l in levels])
+        
+        # (filament, dolgu) matrisi
+        weights = np.round(self._filament_weights(volume_cm3, densities[:, None], ratios[None, :]), 1)
+        min_prices = weights * 3
+        max_prices = weights * 5
+        
+        # Süre filamentten bağımsız, yalnızca dolgu oranına bağlı
+        print_times = self.estimate_layer_print_time(layers, ratios)
+        if print_times is None:
+            print_times = np.full(len(ratios), self.calculate_print_time(volume_cm3))
+        print_times = np.round(print_times, 1)
+        
+        quotes = []
+        for i, filament in enumerate(filaments):
+            for j, level in enumerate(levels):
+                quotes.append({
+                    'filament_type': filament,
+                    'infill': level,
+                    'infill_ratio': float(ratios[j]),
+                    'weight_grams': float(weights[i, j]),
+                    'print_time_hours': float(print_times[j]),
+                    'sales_price': f"{min_prices[i, j]:.1f} - {max_prices[i, j]:.1f}"
+                })
+        return quotes
+    
+    def quote_matrix(self, stl_file_path):
+        """STL dosyasını bir kez ayrıştırıp tüm seçeneklerin fiyat tablosunu döndürür"""
+        try:
+            geometry, chunks = self.load_mesh(stl_file_path)
+            if geometry is None:
+                return None
+            layers = self.slice_layers(stl_file_path, geometry, chunks=chunks)
+            return self.calculate_quote_matrix(geometry_volume_cm3(geometry), layers)
+        except Exception as e:
+            logger.warning("Fiyat tablosu hesaplanırken hata: %s", e)
+            return None
+    
     def analyze_stl_file(self, stl_file_path, filament_type=None, infill_ratio=None):
-        """STL dosyasını tam analiz eder"""
+        """STL dosyasını tam analiz eder
+
+        Aşama süreleri (parse, geometry, pricing) self.phase_timings içine yazılır.
+        """
+        self.phase_timings = {'parse': 0.0}
         try:
-            # Hacim hesapla
-            volume = self.calculate_volume(stl_file_path)
+            # Dosyayı bir kez ayrıştır; geometri ve katmanlar aynı üçgenlerden hesaplanır
+            started = time.perf_counter()
+            geometry, chunks = self.load_mesh(stl_file_path)
             
-            if volume is None:
+            if geometry is None:
                 return None
+            
+            layers = self.slice_layers(stl_file_path, geometry, chunks=chunks)
+            del chunks
+            self.phase_timings['geometry'] = time.perf_counter() - started - self.phase_timings['parse']
+            
+            started = time.perf_counter()
+            volume = geometry_volume_cm3(geometry)
                 
             # Filament ağırlığını hesapla
             weight = self.calculate_filament_weight(volume, filament_type, infill_ratio)
             
-            # Baskı süresini hesapla
-            print_time = self.calculate_print_time(volume)
+            # Baskı süresini katman kesitlerinden hesapla, olmazsa hacimden tahmin et
+            print_time = self.estimate_layer_print_time(layers, infill_ratio)
+            if print_time is None:
+                print_time = self.calculate_print_time(volume)
             
             # Satış fiyatını hesapla (yuvarlanmış ağırlık ile)
             rounded_weight = round(float(weight), 1) if weight else None
             sales_price = self.calculate_sales_price(rounded_weight)
             
-            return {
+            result = {
                 'weight_grams': round(float(weight), 1) if weight else None,
                 'print_time_hours': round(float(print_time), 1) if print_time else None,
                 'sales_price': sales_price,
-                'infill_ratio': round(float(infill_ratio or self.default_infill), 1)
+                'infill_ratio': round(float(infill_ratio or self.default_infill), 1),
+                'volume_cm3': round(volume, 2),
+                'surface_area_cm2': round(geometry['surface_area_mm2'] / 100, 2),
+                'is_watertight': geometry['is_watertight'],
+                'layer_count': layers['layer_count'] if layers else None,
+                'quotes': self.calculate_quote_matrix(volume, layers)
             }
+            self.phase_timings['pricing'] = time.perf_counter() - started
+            return result
             
         except Exception as e:
-            print(f"STL analizi sırasında hata: {e}")
+            logger.warning("STL analizi sırasında hata: %s", e)
             return None
 
 # Test fonksiyonu
@@ -0,0 +1,113 @@
+import os
+import re
+
+import numpy as np
+
+# Binary STL: 80 bayt başlık + 4 bayt üçgen sayısı, ardından 50 baytlık kayıtlar
+BINARY_HEADER_SIZE = 84
+BINARY_RECORD_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+])
+
+# Tek seferde işlenecek üçgen sayısı (bellek kullanımını sınırlar)
+DEFAULT_CHUNK_TRIANGLES = 262144
+
+# ASCII dosyalar bu boyutta parçalar halinde okunur
+ASCII_READ_BYTES = 8 * 1024 * 1024
+
+_VERTEX_PATTERN = re.compile(rb'vertex\s+(\S+)\s+(\S+)\s+(\S+)')
+
+
+def is_binary_stl(stl_file_path):
+    """Dosyanın binary STL olup olmadığını boyut tutarlılığından anlar"""
+    file_size = os.path.getsize(stl_file_path)
+    if file_size < BINARY_HEADER_SIZE:
+        return False
+
+    with open(stl_file_path, 'rb') as f:
+        header = f.read(BINARY_HEADER_SIZE)
+
+    # Bazı binary dosyalar da "solid" ile başlar, bu yüzden boyut kontrolü önce gelir
+    triangle_count = int(np.frombuffer(header, dtype='<u4', count=1, offset=80)[0])
+    if file_size == BINARY_HEADER_SIZE + triangle_count * BINARY_RECORD_DTYPE.itemsize:
+        return True
+    return not header.lstrip().lower().startswith(b'solid')
+
+
+def open_binary_stl(stl_file_path):
+    """Binary STL kayıtlarını kopyalamadan memory-map edilmiş yapısal dizi olarak döndürür"""
+    file_size = os.path.getsize(stl_file_path)
+    triangle_count = (file_size - BINARY_HEADER_SIZE) // BINARY_RECORD_DTYPE.itemsize
+    if triangle_count <= 0:
+        return np.zeros(0, dtype=BINARY_RECORD_DTYPE)
+
+    return np.memmap(
+        stl_file_path,
+        dtype=BINARY_RECORD_DTYPE,
+        mode='r',
+        offset=BINARY_HEADER_SIZE,
+        shape=(triangle_count,),
+    )
+
+
+def _iter_binary_chunks(stl_file_path, chunk_triangles):
+    records = open_binary_stl(stl_file_path)
+    vertices = records['vertices']  # (N, 3, 3) görünüm, kopya değil
+    for start in range(0, len(vertices), chunk_triangles):
+        yield vertices[start:start + chunk_triangles]
+
+
+def _iter_ascii_chunks(stl_file_path, chunk_triangles):
+    leftover_line = b''
+    pending = np.zeros((0, 3), dtype=np.float32)
+
+    with open(stl_file_path, 'rb') as f:
+        while True:
+            block = f.read(ASCII_READ_BYTES)
+            if not block:
+                break
+
+            # Satırı ortadan bölmemek için son satır sonrasını bir sonraki parçaya taşı
+            block = leftover_line + block
+            cut = block.rfind(b'\n')
+            if cut == -1:
+                leftover_line = block
+                continue
+            leftover_line = block[cut + 1:]
+
+            matches = _VERTEX_PATTERN.findall(block, 0, cut + 1)
+            if not matches:
+                continue
+
+            coords = np.array(matches).astype(np.float32)
+            pending = np.concatenate([pending, coords]) if len(pending) else coords
+
+            usable = (len(pending) // 3) * 3
+            for start in range(0, usable, chunk_triangles * 3):
+                end = min(start + chunk_triangles * 3, usable)
+                yield pending[start:end].reshape(-1, 3, 3)
+            pending = pending[usable:]
+
+    if leftover_line:
+        matches = _VERTEX_PATTERN.findall(leftover_line)
+        if matches:
+            coords = np.array(matches).astype(np.float32)
+            pending = np.concatenate([pending, coords]) if len(pending) else coords
+
+    usable = (len(pending) // 3) * 3
+    if usable:
+        yield pending[:usable].reshape(-1, 3, 3)
+
+
+def iter_stl_triangles(stl_file_path, chunk_triangles=DEFAULT_CHUNK_TRIANGLES):
+    """STL dosyasındaki üçgenleri (n, 3, 3) float32 parçalar halinde üretir
+
+    Binary dosyalar memory-map üzerinden sıfır kopya okunur, ASCII dosyalar
+    sabit boyutlu bloklar halinde ayrıştırılır; bellek kullanımı dosya
+    boyutundan bağımsız kalır.
+    """
+    if is_binary_stl(stl_file_path):
+        return _iter_binary_chunks(stl_file_path, chunk_triangles)
+    return _iter_ascii_chunks(stl_file_path, chunk_triangles)
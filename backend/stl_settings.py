@@ -0,0 +1,33 @@
+# STL analizinin varsayılan ayarları
+#
+# Bu modül numpy içe aktarmaz; API işlemi analiz anahtarlarını ve
+# varsayılanları geometri kütüphanelerini yüklemeden buradan okur.
+
+# Hesaplama yöntemi değiştiğinde artırılır, önbellekteki eski sonuçlar geçersiz olur
+ANALYSIS_VERSION = 3
+
+# Filament yoğunlukları (g/cm³)
+FILAMENT_DENSITIES = {
+    'PLA': 1.24,
+    'ABS': 1.04,
+    'PETG': 1.27,
+    'TPU': 1.21,
+    'PC': 1.19
+}
+
+# Varsayılan filament tipi
+DEFAULT_FILAMENT = 'PLA'
+
+# Infill oranları (0-1 arası)
+INFILL_RATIOS = {
+    'düşük': 0.15,
+    'orta': 0.25,
+    'yüksek': 0.35,
+    'katı': 0.95
+}
+
+# Varsayılan infill oranı
+DEFAULT_INFILL = 0.25
+
+# Katman yüksekliği (mm)
+LAYER_HEIGHT = 0.2
@@ -0,0 +1,115 @@
+import math
+
+import numpy as np
+
+# Tek seferde işlenecek üçgen/katman kesişim çifti sayısı (bellek kullanımını sınırlar)
+MAX_PAIRS_PER_BATCH = 1_000_000
+
+# Kenarlar: (0 -> 1), (1 -> 2), (2 -> 0)
+_EDGE_START = np.array([0, 1, 2])
+_EDGE_END = np.array([1, 2, 0])
+
+
+class LayerSlicer:
+    """Modeli katman yüksekliği aralıklarıyla yatay düzlemlerle keser
+
+    Her katman için kesit çevresi (mm) ve kesit alanı (mm²) biriktirilir.
+    Düzlem kesişimleri üçgen/katman çiftleri üzerinden vektörel hesaplanır;
+    kesit alanı, parça yönleri yüzey normalinden alınarak Green teoremiyle
+    (kapalı kontur sıralaması gerekmeden) bulunur, delikler kendiliğinden
+    düşülür.
+    """
+
+    def __init__(self, layer_height, bbox_min, bbox_max):
+        self.layer_height = float(layer_height)
+        self.z0 = float(bbox_min[2])
+        height = float(bbox_max[2]) - self.z0
+        self.layer_count = max(1, int(math.ceil(height / self.layer_height)))
+        # Sayısal hassasiyet için XY'de modelin ortasını referans al
+        self.xy_origin = np.array([
+            (float(bbox_min[0]) + float(bbox_max[0])) / 2,
+            (float(bbox_min[1]) + float(bbox_max[1])) / 2,
+        ])
+        self.perimeters = np.zeros(self.layer_count)
+        self.areas = np.zeros(self.layer_count)
+
+    def add(self, vectors):
+        vectors = np.asarray(vectors)
+        if vectors.size == 0:
+            return
+
+        z = vectors[:, :, 2]
+        # z_k = z0 + (k + 0.5) * h düzlemlerinden üçgenin z aralığına düşenler
+        k_lo = np.ceil((z.min(axis=1) - self.z0) / self.layer_height - 0.5).astype(np.int64)
+        k_hi = np.floor((z.max(axis=1) - self.z0) / self.layer_height - 0.5).astype(np.int64)
+        k_lo = np.maximum(k_lo, 0)
+        k_hi = np.minimum(k_hi, self.layer_count - 1)
+        counts = np.maximum(k_hi - k_lo + 1, 0)
+
+        # Çift sayısı sınırı aşmayacak şekilde üçgenleri gruplara böl
+        cumulative = np.cumsum(counts)
+        start = 0
+        while start < len(vectors):
+            done = cumulative[start - 1] if start > 0 else 0
+            end = int(np.searchsorted(cumulative, done + MAX_PAIRS_PER_BATCH, side='right'))
+            end = max(end, start + 1)
+            self._add_pairs(vectors[start:end], k_lo[start:end], counts[start:end])
+            start = end
+
+    def _add_pairs(self, vectors, k_lo, counts):
+        total = int(counts.sum())
+        if total == 0:
+            return
+
+        # Her üçgeni kestiği katman sayısı kadar tekrarla
+        tri_index = np.repeat(np.arange(len(vectors)), counts)
+        offsets = np.cumsum(counts) - counts
+        layer = k_lo[tri_index] + (np.arange(total) - offsets[tri_index])
+
+        tris = vectors[tri_index].astype(np.float64)
+        tris[:, :, :2] -= self.xy_origin
+        plane = self.z0 + (layer + 0.5) * self.layer_height
+
+        z = tris[:, :, 2]
+        above = z > plane[:, None]
+        a = tris[:, _EDGE_START, :]
+        b = tris[:, _EDGE_END, :]
+        crossing = above[:, _EDGE_START] != above[:, _EDGE_END]
+
+        # Kesişmeyen kenarlarda sıfıra bölmeyi önle, bu noktalar zaten seçilmez
+        dz = np.where(crossing, b[:, :, 2] - a[:, :, 2], 1.0)
+        t = (plane[:, None] - a[:, :, 2]) / dz
+        points = a[:, :, :2] + t[:, :, None] * (b[:, :, :2] - a[:, :, :2])
+
+        valid = crossing.sum(axis=1) == 2
+        if not valid.all():
+            points, crossing, tris, layer = points[valid], crossing[valid], tris[valid], layer[valid]
+        if len(layer) == 0:
+            return
+
+        # Kesişen iki kenarın noktalarını seç
+        order = np.argsort(~crossing, axis=1, kind='stable')[:, :2]
+        rows = np.arange(len(layer))
+        p0 = points[rows, order[:, 0]]
+        p1 = points[rows, order[:, 1]]
+
+        # Parçayı z x n yönüne çevir: dış konturlar saat yönünün tersine döner
+        normal = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+        tangent = np.stack([-normal[:, 1], normal[:, 0]], axis=1)
+        segment = p1 - p0
+        flip = np.einsum('ij,ij->i', segment, tangent) < 0
+        p0, p1 = np.where(flip[:, None], p1, p0), np.where(flip[:, None], p0, p1)
+
+        lengths = np.hypot(segment[:, 0], segment[:, 1])
+        signed_areas = 0.5 * (p0[:, 0] * p1[:, 1] - p1[:, 0] * p0[:, 1])
+
+        self.perimeters += np.bincount(layer, weights=lengths, minlength=self.layer_count)
+        self.areas += np.bincount(layer, weights=signed_areas, minlength=self.layer_count)
+
+    def result(self):
+        return {
+            'layer_height': self.layer_height,
+            'layer_count': self.layer_count,
+            'perimeters_mm': self.perimeters,
+            'areas_mm2': np.abs(self.areas),
+        }
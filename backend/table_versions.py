@@ -0,0 +1,94 @@
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+import models
+
+# Değişiklik sayacı tutulan tablolar (ETag üretilen okuma uçlarının kaynakları)
+VERSIONED_TABLES = ("products", "orders", "order_items", "custom_designs")
+
+_versions = models.TableVersion.__table__
+
+
+def bump_table_versions(connection, table_names):
+    """Verilen tabloların sayaçlarını verilen bağlantının işlemi içinde artırır"""
+    for table_name in sorted(table_names):
+        result = connection.execute(
+            update(_versions)
+            .where(_versions.c.table_name == table_name)
+            .values(version=_versions.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(_versions.insert().values(table_name=table_name, version=1))
+
+
+def ensure_table_versions(bind):
+    """Eksik sayaç satırlarını oluşturur, böylece artırma işlemi tek UPDATE olur"""
+    with bind.begin() as connection:
+        existing = set(connection.execute(select(_versions.c.table_name)).scalars())
+        for table_name in VERSIONED_TABLES:
+            if table_name not in existing:
+                connection.execute(_versions.insert().values(table_name=table_name, version=0))
+
+
+# Değişen tabloların sayaçları commit'ten hemen önce, yazan işlemin içinde
+# artırılır: veri ve sürüm birlikte kalıcı olur ya da birlikte geri alınır.
+# Sayaç satırı yalnızca commit anında kilitlenir, işlem boyunca değil; böylece
+# eşzamanlı siparişler bu satırda sıraya girmez.
+_PENDING_KEY = "table_versions_changed"
+
+
+def _mark_changed(session, table_names):
+    changed = set(table_names) & set(VERSIONED_TABLES)
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_after_flush(session, flush_context):
+    changed = set()
+    for obj in list(session.new) + list(session.deleted):
+        changed.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            changed.add(obj.__table__.name)
+    _mark_changed(session, changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_statement(orm_execute_state):
+    # Toplu UPDATE/DELETE/INSERT ifadeleri flush'tan geçmez
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None:
+        _mark_changed(orm_execute_state.session, {table.name})
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session):
+    # Bekleyen değişiklikler flush edilmeden hangi tabloların değiştiği bilinemez
+    session.flush()
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        bump_table_versions(session.connection(), changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _versions_query(table_names):
+    return select(_versions.c.table_name, _versions.c.version).where(
+        _versions.c.table_name.in_(table_names)
+    )
+
+
+def get_table_versions(db: Session, table_names):
+    rows = db.execute(_versions_query(table_names)).all()
+    return tuple(sorted(rows))
+
+
+async def get_table_versions_async(db, table_names):
+    rows = (await db.execute(_versions_query(table_names))).all()
+    return tuple(sorted(rows))
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+import models
+from analysis_cache import AnalysisCache, analysis_params_key, file_sha256
+
+
+def test_cache_survives_memory_eviction(session_factory):
+    """Bellekten düşen sonuç veritabanı katmanından geri gelmeli"""
+    cache = AnalysisCache(max_entries=1, session_factory=session_factory)
+    pla_key = analysis_params_key()
+    abs_key = analysis_params_key(filament_type='ABS', infill_ratio=0.35)
+
+    assert pla_key != abs_key
+    assert pla_key == analysis_params_key(filament_type='PLA', infill_ratio=0.25)
+    assert cache.get("abc", pla_key) is None
+
+    cache.set("abc", pla_key, {'weight_grams': 1.0})
+    cache.set("abc", abs_key, {'weight_grams': 2.0})
+    # Aynı anahtarı ikinci kez yazmak hata vermemeli
+    cache.set("abc", abs_key, {'weight_grams': 2.0})
+
+    cache.clear_memory()
+    assert cache.get("abc", pla_key) == {'weight_grams': 1.0}
+    assert cache.get("abc", abs_key) == {'weight_grams': 2.0}
+
+    db = session_factory()
+    try:
+        assert db.query(models.STLAnalysisCache).count() == 2
+    finally:
+        db.close()
+
+
+def test_file_hash_matches_content():
+    """Aynı içerikli dosyalar aynı özeti vermeli"""
+    uploads_dir = os.path.join(os.path.dirname(__file__), "uploads")
+    first = file_sha256(os.path.join(uploads_dir, "test.stl"))
+    second = file_sha256(os.path.join(uploads_dir, "anahatarlıkkkkkksonnnnnnnnnnnnnnnnn.stl"))
+    print(f"🔑 Dosya özeti: {first}")
+
+    assert len(first) == 64
+    assert first == second
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
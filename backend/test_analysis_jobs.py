@@ -0,0 +1,140 @@
+import os
+import shutil
+import sys
+import threading
+import time
+
+import pytest
+
+import models
+from analysis_cache import AnalysisCache
+from analysis_jobs import JOB_COMPLETED, JOB_PENDING, JOB_RUNNING, AnalysisJobQueue
+
+
+def wait_for_job(queue, session_factory, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        db = session_factory()
+        try:
+            job = queue.get(db, job_id)
+            if job.status not in (JOB_PENDING, JOB_RUNNING):
+                return job
+        finally:
+            db.close()
+        time.sleep(0.05)
+    raise AssertionError("Analiz işi zamanında tamamlanmadı")
+
+
+def copy_model(tmp_path):
+    source = os.path.join(os.path.dirname(__file__), "uploads", "test.stl")
+    shutil.copy(source, os.path.join(tmp_path, "model.stl"))
+    return str(tmp_path)
+
+
+def record_result_threads(queue):
+    """Sonuç yazan iş parçacıklarının adlarını toplar"""
+    names = []
+    on_done = queue._on_done
+
+    def recording(*args):
+        names.append(threading.current_thread().name)
+        on_done(*args)
+
+    queue._on_done = recording
+    return names
+
+
+def test_job_runs_in_pool_and_attaches_result(session_factory, tmp_path):
+    """İş havuzda çalışmalı, sonucu önbelleğe ve özel tasarıma yazmalı"""
+    cache = AnalysisCache(session_factory=session_factory)
+
+    uploads_dir = copy_model(tmp_path)
+    queue = AnalysisJobQueue(session_factory=session_factory, cache=cache,
+                             uploads_dir=uploads_dir, max_workers=1)
+    finished_on = record_result_threads(queue)
+
+    db = session_factory()
+    try:
+        db.add(models.CustomDesign(customer_name="Test", customer_phone="1",
+                                   description="Test", file_path="model.stl",
+                                   created_at="2024-01-01T00:00:00"))
+        db.commit()
+
+        job = queue.submit(db, "model.stl")
+        assert job.status == JOB_RUNNING
+        # Bekleyen aynı iş tekrar oluşturulmamalı
+        assert queue.submit(db, "model.stl").id == job.id
+        job_id = job.id
+    finally:
+        db.close()
+
+    finished = wait_for_job(queue, session_factory, job_id)
+    print(f"📊 İş sonucu: {finished.status} {finished.result}")
+    assert finished.status == JOB_COMPLETED
+    # Veritabanı yazmaları havuzun yönetim iş parçacığını bekletmemeli
+    assert finished_on == ["analysis-results"]
+
+    db = session_factory()
+    try:
+        design = db.query(models.CustomDesign).first()
+        assert design.weight_grams is not None
+
+        # Aynı dosya için yeni iş önbellekten hemen tamamlanmalı
+        cached_job = queue.submit(db, "model.stl")
+        assert cached_job.status == JOB_COMPLETED
+        assert cached_job.id != job_id
+    finally:
+        db.close()
+        queue.shutdown()
+
+
+def test_pending_job_is_resumed_by_one_worker(session_factory, tmp_path):
+    """Aynı anda açılan iki işçiden yalnızca biri bekleyen işi almalı"""
+    uploads_dir = copy_model(tmp_path)
+    queues = [
+        AnalysisJobQueue(session_factory=session_factory, cache=AnalysisCache(session_factory=session_factory),
+                         uploads_dir=uploads_dir, max_workers=1)
+        for _ in range(2)
+    ]
+    db = session_factory()
+    try:
+        db.add_all([
+            models.AnalysisJob(file_path="model.stl", file_hash="a", params_key="k", status=JOB_PENDING,
+                               created_at="2024-01-01T00:00:00"),
+            # İşlemi çökmüş, uzun süredir "İşleniyor" kalan iş yeniden alınmalı
+            models.AnalysisJob(file_path="model.stl", file_hash="b", params_key="k", status=JOB_RUNNING,
+                               created_at="2024-01-01T00:00:00", started_at="2024-01-01T00:00:00"),
+            # Yeni alınmış iş başka işçiye geçmemeli
+            models.AnalysisJob(file_path="model.stl", file_hash="c", params_key="k", status=JOB_RUNNING,
+                               created_at="2024-01-01T00:00:00", started_at="2999-01-01T00:00:00"),
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    dispatched = []
+    for queue in queues:
+        dispatch = queue._dispatch
+        queue._dispatch = lambda job_id, *args, dispatch=dispatch: (dispatched.append(job_id), dispatch(job_id, *args))
+
+    try:
+        results = []
+        threads = [threading.Thread(target=lambda q=q: results.append(q.resume_pending())) for q in queues]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"🔁 Devralınan işler: {results}, çalıştırılan: {sorted(dispatched)}")
+        assert sorted(dispatched) == [1, 2]
+        assert sum(results) == 2
+
+        for job_id in (1, 2):
+            assert wait_for_job(queues[0], session_factory, job_id).status == JOB_COMPLETED
+    finally:
+        for queue in queues:
+            queue.shutdown()
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
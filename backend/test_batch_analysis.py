@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_analysis import iter_batch_analysis
+
+
+def test_batch_streams_each_file_once():
+    """Her dosya için bir sonuç dönmeli, aynı içerik tek kez analiz edilmeli"""
+    source = os.path.join(os.path.dirname(__file__), "uploads", "test.stl")
+
+    with tempfile.TemporaryDirectory() as uploads_dir:
+        shutil.copy(source, os.path.join(uploads_dir, "a.stl"))
+        shutil.copy(source, os.path.join(uploads_dir, "b.stl"))
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(iter_batch_analysis(
+                ["a.stl", "b.stl", "yok.stl", "../a.stl"], executor,
+                cache=None, uploads_dir=uploads_dir
+            ))
+
+    for result in results:
+        print(f"📄 {result['item']}: {result['status']}")
+
+    by_item = {result["item"]: result for result in results}
+    assert len(results) == 4
+    assert by_item["a.stl"]["status"] == "ok"
+    assert by_item["a.stl"]["analysis"] == by_item["b.stl"]["analysis"]
+    assert by_item["yok.stl"]["status"] == "error"
+    assert by_item["../a.stl"]["status"] == "error"
+
+
+if __name__ == "__main__":
+    test_batch_streams_each_file_once()
+    print("✅ Toplu analiz testleri başarılı")
@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bench_api import compare_reports, cube_stl, parse_mix, percentile
+
+
+def test_percentile_nearest_rank():
+    """Yüzdelikler en yakın sıra yöntemiyle hesaplanmalı"""
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.5) == 0.0
+
+
+def test_parse_mix():
+    """Senaryo ağırlıkları okunmalı, bilinmeyen senaryo reddedilmeli"""
+    assert parse_mix("browse=3, upload=1") == {"browse": 3.0, "upload": 1.0}
+    for spec in ("browse=1,bilinmeyen=2", "browse=0"):
+        try:
+            parse_mix(spec)
+        except ValueError:
+            continue
+        raise AssertionError(f"{spec} reddedilmeliydi")
+
+
+def test_cube_stl_is_valid_binary():
+    """Üretilen küp 12 üçgenli ikili STL olmalı"""
+    content = cube_stl(10)
+    assert len(content) == 84 + 12 * 50
+    assert int.from_bytes(content[80:84], "little") == 12
+
+
+def test_compare_reports_flags_p95_regressions():
+    """Toleransı aşan p95 artışı gerileme sayılmalı"""
+    baseline = {"endpoints": {"GET /products/": {"p95_ms": 10.0}, "POST /orders/": {"p95_ms": 10.0}}}
+    current = {"endpoints": {"GET /products/": {"p95_ms": 10.5}, "POST /orders/": {"p95_ms": 20.0},
+                             "GET /yeni": {"p95_ms": 99.0}}}
+    regressions = compare_reports(baseline, current)
+    assert [r["endpoint"] for r in regressions] == ["POST /orders/"]
+
+
+def test_benchmark_run_reports_every_endpoint(tmp_path):
+    """Kısa bir ölçüm hatasız tamamlanmalı ve uç nokta başına yüzdelikleri raporlamalı"""
+    output = str(tmp_path / "report.json")
+    completed = subprocess.run(
+        [sys.executable, "bench_api.py", "--scenarios", "40", "--concurrency", "4", "--warmup", "4",
+         "--products", "50", "--users", "5", "--output", output],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True
+    )
+    assert completed.returncode == 0, completed.stderr
+    with open(output, encoding="utf-8") as f:
+        report = json.load(f)
+    print(f"⏱️  {report['total_requests']} istek, {report['throughput_rps']} istek/sn")
+
+    assert report["total_errors"] == 0
+    assert report["total_requests"] > 40
+    for stats in report["endpoints"].values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+
+
+if __name__ == "__main__":
+    # Dosya yazan testler pytest'in geçici dizin fikstürünü kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
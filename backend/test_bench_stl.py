@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+from bench_stl import MESH_BUILDERS, build_corpus, run_benchmark
+from stl_analyzer import compute_mesh_properties, geometry_volume_cm3
+
+
+def test_reference_meshes_are_closed():
+    """Üretilen küp, küre ve simit kapalı olmalı, hacimleri analitik değere yakın çıkmalı"""
+    for shape, builder in MESH_BUILDERS.items():
+        vectors, volume_mm3 = builder(5000)
+        geometry = compute_mesh_properties(vectors)
+        error = abs(geometry_volume_cm3(geometry) - volume_mm3 / 1000) / (volume_mm3 / 1000)
+        print(f"📐 {shape}: {geometry['triangle_count']} üçgen, hacim hatası {error:.2e}")
+
+        assert geometry['is_watertight']
+        assert geometry['volume_mm3'] > 0
+        assert abs(geometry['triangle_count'] - 5000) < 500
+        assert error < 1e-2
+
+
+def test_corpus_formats_agree(tmp_path):
+    """ASCII ve binary dosyalar aynı hacmi ve üçgen sayısını vermeli"""
+    corpus_dir = str(tmp_path)
+    reports = run_benchmark(corpus_dir, sizes=(1000,), repeat=1)
+    assert len(reports) == 6
+
+    by_file = {(r["shape"], r["format"]): r for r in reports}
+    for shape in ("cube", "sphere", "torus"):
+        binary, ascii_ = by_file[(shape, "binary")], by_file[(shape, "ascii")]
+        assert binary["is_watertight"] and ascii_["is_watertight"]
+        assert binary["volume_cm3"] == ascii_["volume_cm3"]
+        assert binary["file_bytes"] == 84 + 50 * binary["triangles"]
+        for name in ("calculate_volume", "analyze_stl_file"):
+            assert binary[name]["triangles_per_second"] > 0
+            assert binary[name]["peak_memory_mb"] > 0
+    assert by_file[("cube", "binary")]["volume_relative_error"] < 1e-9
+
+    # Aşama süreleri izlenen (yavaş) çalıştırmadan değil, en hızlı çalıştırmadan gelmeli
+    for r in reports:
+        analysis = r["analyze_stl_file"]
+        assert sum(analysis["phase_timings"].values()) <= analysis["seconds"]
+
+    # Var olan dosyalar yeniden yazılmadan kullanılmalı
+    assert [entry["path"] for entry in build_corpus(corpus_dir, sizes=(1000,))] == \
+        [os.path.join(corpus_dir, r["file"]) for r in reports]
+
+
+if __name__ == "__main__":
+    # Dosya yazan testler pytest'in geçici dizin fikstürünü kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,65 @@
+import asyncio
+import sys
+
+import pytest
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import crud
+import crud_async
+import models
+from database import make_async_engine
+from migrations import ensure_indexes
+
+
+def count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+async def read_cart(url, user_id):
+    """Sepeti uç noktanın kullandığı asenkron fonksiyonla okur, çalışan SQL ifadelerini sayar"""
+    engine = make_async_engine(url)
+    try:
+        statements = count_statements(engine.sync_engine)
+        async with async_sessionmaker(engine)() as db:
+            return await crud_async.get_user_cart(db, user_id), statements
+    finally:
+        await engine.dispose()
+
+
+def test_cart_is_read_with_single_query(db_engine, db):
+    """30 ürünlü sepet tek SQL sorgusuyla okunmalı"""
+    for i in range(30):
+        db.add(models.Product(name=f"Ürün {i}", description="", price=10.0 + i, stock=5))
+    db.commit()
+    for product_id in range(1, 31):
+        crud.add_to_user_cart(db, 1, product_id, 2)
+
+    cart, statements = asyncio.run(read_cart(str(db_engine.url), 1))
+    print(f"🛒 Sepet: {len(cart)} ürün, {len(statements)} sorgu")
+
+    assert len(cart) == 30
+    assert len(statements) == 1
+    assert cart[0]["product_name"] == "Ürün 0"
+    assert cart[29]["product_price"] == 39.0
+    assert all(item["quantity"] == 2 for item in cart)
+
+
+def test_ensure_indexes_adds_missing_index(db_engine):
+    """Eski veritabanında eksik olan sepet indeksi sonradan eklenmeli"""
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_user_carts_user_product")
+
+    ensure_indexes(db_engine)
+    ensure_indexes(db_engine)
+
+    names = {index["name"] for index in inspect(db_engine).get_indexes("user_carts")}
+    assert "ix_user_carts_user_product" in names
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
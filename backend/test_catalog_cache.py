@@ -0,0 +1,46 @@
+from catalog_cache import TTLCache, catalog_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_and_evict():
+    """Süresi dolan kayıt dönmemeli, boyut aşılınca en eski sayfa düşmeli"""
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, max_entries=2, clock=clock)
+
+    cache.set(catalog_key(), ["tüm ürünler"])
+    cache.set(catalog_key("ev"), ["vazo"])
+    assert cache.get(catalog_key()) == ["tüm ürünler"]
+    cache.set(catalog_key("oyuncak"), ["figür"])
+    assert cache.get(catalog_key("ev")) is None
+
+    clock.now = 11
+    assert cache.get(catalog_key()) is None
+
+    stats = cache.stats()
+    print(f"📦 Önbellek: {stats}")
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 2, 1)
+
+
+def test_invalidate_drops_stale_reads():
+    """Yazma sırasında başlamış bir okuma eski listeyi önbelleğe koymamalı"""
+    cache = TTLCache(ttl=10, max_entries=10)
+    generation = cache.generation
+    cache.invalidate()
+
+    assert cache.set(catalog_key(), ["eski liste"], generation) is False
+    assert cache.get(catalog_key()) is None
+    assert cache.set(catalog_key(), ["yeni liste"], cache.generation) is True
+    assert cache.stats()["invalidations"] == 1
+
+
+if __name__ == "__main__":
+    test_entries_expire_and_evict()
+    test_invalidate_drops_stale_reads()
+    print("✅ Katalog önbelleği testleri başarılı")
@@ -0,0 +1,77 @@
+import asyncio
+import sys
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import crud_async
+import models
+import schemas
+from catalog_cache import catalog_cache
+from database import make_async_engine
+from table_versions import get_table_versions_async
+
+
+async def run_product_flow(url):
+    engine = make_async_engine(url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            vase = await crud_async.create_product(db, schemas.ProductCreate(name="Vazo", price=100.0, stock=3, category="ev"))
+            await crud_async.create_product(db, schemas.ProductCreate(name="Anahtarlık", price=25.0, stock=8))
+
+            assert [p["name"] for p in await crud_async.get_products(db)] == ["Vazo", "Anahtarlık"]
+            assert [p["name"] for p in await crud_async.get_products(db, category="ev")] == ["Vazo"]
+
+            product, error = await crud_async.update_product_stock(db, vase.id, 7)
+            assert error is None and product.stock == 7
+            assert (await crud_async.update_product_stock(db, 999, 1))[1] == "Ürün bulunamadı"
+
+            db.add(models.UserCart(user_id=1, product_id=vase.id, quantity=2, added_at="2024-01-01"))
+            await db.commit()
+            cart = await crud_async.get_user_cart(db, 1)
+            assert cart[0]["product_name"] == "Vazo" and cart[0]["quantity"] == 2
+
+            assert await crud_async.delete_product(db, vase.id) is True
+            assert await crud_async.delete_product(db, vase.id) is False
+            assert await crud_async.get_product(db, vase.id) is None
+    finally:
+        await engine.dispose()
+
+
+async def run_cross_process_write(url):
+    engine = make_async_engine(url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            vase = await crud_async.create_product(db, schemas.ProductCreate(name="Vazo", price=100.0, stock=3))
+            version = dict(await get_table_versions_async(db, ("products",)))["products"]
+            assert [p["stock"] for p in await crud_async.get_products(db, version=version)] == [3]
+
+            # Başka bir işlemdeki yazma: bu işlemin önbelleği temizlenmez, sayaç artar
+            (await db.get(models.Product, vase.id)).stock = 1
+            generation = catalog_cache.generation
+            await db.commit()
+            assert catalog_cache.generation == generation
+
+            new_version = dict(await get_table_versions_async(db, ("products",)))["products"]
+            assert new_version > version
+            assert [p["stock"] for p in await crud_async.get_products(db, version=new_version)] == [1]
+    finally:
+        await engine.dispose()
+
+
+def test_async_product_crud(db_engine):
+    """Asenkron ürün ve sepet fonksiyonları senkron karşılıklarıyla aynı sonucu vermeli"""
+    asyncio.run(run_product_flow(str(db_engine.url)))
+    print("⚡ Asenkron ürün işlemleri tamam")
+
+
+def test_catalog_cache_follows_etag_version(db_engine):
+    """Önbellek anahtarı ETag sayacını içerdiği için yeni sayaçla eski liste dönmemeli"""
+    asyncio.run(run_cross_process_write(str(db_engine.url)))
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
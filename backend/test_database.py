@@ -0,0 +1,47 @@
+import sys
+
+import pytest
+from sqlalchemy import text
+
+from database import make_engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Uygulamanın pragmalarıyla açılan geçici SQLite motoru"""
+    engine = make_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_sqlite_pragmas_are_applied(engine):
+    """Her bağlantı WAL kipinde ve ayarlı pragmalarla açılmalı"""
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+    print(f"🗄️  Havuz: {engine.pool.status()}")
+
+
+def test_reads_do_not_wait_for_writes(engine):
+    """Açık bir yazma işlemi sırasında okuyucu beklemeden eski veriyi görmeli"""
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE products (id INTEGER PRIMARY KEY, stock INTEGER)"))
+        conn.execute(text("INSERT INTO products (stock) VALUES (5)"))
+
+    writer = engine.connect()
+    transaction = writer.begin()
+    writer.execute(text("UPDATE products SET stock = 4"))
+    try:
+        with engine.connect() as reader:
+            assert reader.execute(text("SELECT stock FROM products")).scalar() == 5
+    finally:
+        transaction.commit()
+        writer.close()
+
+    with engine.connect() as reader:
+        assert reader.execute(text("SELECT stock FROM products")).scalar() == 4
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,94 @@
+import sys
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import crud
+import models
+import schemas
+import table_versions
+from http_cache import etag_matches, make_etag
+from table_versions import get_table_versions
+
+
+def test_writes_bump_table_versions(db):
+    """ORM ve toplu yazmalar ilgili tablonun sürümünü artırmalı, okumalar artırmamalı"""
+    versions = lambda: dict(get_table_versions(db, ("products", "orders", "order_items")))
+    assert versions() == {"products": 0, "orders": 0, "order_items": 0}
+
+    db.add(models.Product(name="Vazo", description="", price=100.0, stock=5))
+    db.commit()
+    assert versions()["products"] == 1
+
+    order = crud.create_order(db, schemas.OrderCreate(
+        customer_name="Ali", customer_address="Adres", customer_phone="555",
+        total_price=100.0, products="1x1"
+    ))
+    after_order = versions()
+    print(f"🔢 Tablo sürümleri: {after_order}")
+    assert after_order["products"] == 2  # koşullu stok UPDATE'i
+    assert after_order["orders"] == 1 and after_order["order_items"] == 1
+
+    crud.get_orders(db)
+    crud.update_order_status(db, order.id, "Tamamlandı")
+    assert versions()["orders"] == 2
+    assert versions()["products"] == 2
+
+
+def test_versions_bump_with_commit(session_factory, db):
+    """Sayaç commit anında aynı işlemde artırılmalı; geri alınan yazma artırmamalı"""
+    reader = session_factory()
+    versions = lambda: dict(get_table_versions(reader, ("products",)))["products"]
+
+    db.add(models.Product(name="Vazo", description="", price=100.0, stock=5))
+    db.flush()
+    # Flush sayaç satırına dokunmaz, eşzamanlı siparişler işlem boyunca bu satırda beklemez
+    assert db.execute(models.TableVersion.__table__.select()).all() == reader.execute(
+        models.TableVersion.__table__.select()).all()
+    db.rollback()
+    reader.rollback()
+    assert versions() == 0
+
+    db.add(models.Product(name="Vazo", description="", price=100.0, stock=5))
+    db.commit()
+    reader.rollback()
+    assert versions() == 1
+    reader.close()
+
+
+def test_failed_bump_rolls_back_the_write(db):
+    """Sayaç artırılamazsa veri de kaydedilmemeli; commit hatası gerçek sonucu yansıtır"""
+
+    def locked(connection, table_names):
+        raise OperationalError("UPDATE table_versions", {}, Exception("database is locked"))
+
+    original = table_versions.bump_table_versions
+    table_versions.bump_table_versions = locked
+    try:
+        db.add(models.Product(name="Vazo", description="", price=100.0, stock=5))
+        try:
+            db.commit()
+            assert False, "commit hata vermeliydi"
+        except OperationalError:
+            db.rollback()
+    finally:
+        table_versions.bump_table_versions = original
+
+    assert db.query(models.Product).count() == 0
+    assert dict(get_table_versions(db, ("products",)))["products"] == 0
+
+
+def test_etag_comparison():
+    """Zayıf ETag karşılaştırması ve çoklu değerler desteklenmeli"""
+    etag = make_etag((("products", 3),), 0, 100, None)
+    assert etag == make_etag((("products", 3),), 0, 100, None)
+    assert etag != make_etag((("products", 4),), 0, 100, None)
+    assert etag_matches(f'"abc", {etag}', etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,131 @@
+import io
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from log_config import parse_levels, setup_logging, setup_worker_logging, stop_logging
+
+
+class Expensive:
+    """Biçimlendirilirse sayaç artar"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "pahalı"
+
+    __repr__ = __str__
+
+
+def read_lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_records_include_extra_fields():
+    """JSON kaydı seviye, logger, mesaj ve extra alanlarını içermeli"""
+    stream = io.StringIO()
+    setup_logging(level="INFO", levels="", log_format="json", stream=stream)
+    try:
+        logging.getLogger("crud").info("Sipariş %s oluşturuldu", 7, extra={"order_id": 7})
+    finally:
+        stop_logging()
+
+    entry = read_lines(stream)[-1]
+    print(f"📝 Kayıt: {entry}")
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "crud"
+    assert entry["msg"] == "Sipariş 7 oluşturuldu"
+    assert entry["order_id"] == 7
+
+
+def test_exception_is_formatted():
+    """logger.exception hata izini kayda eklemeli"""
+    stream = io.StringIO()
+    setup_logging(level="INFO", levels="", log_format="json", stream=stream)
+    try:
+        try:
+            raise ValueError("bozuk")
+        except ValueError:
+            logging.getLogger("main").exception("İşlem başarısız")
+    finally:
+        stop_logging()
+
+    entry = read_lines(stream)[-1]
+    assert entry["level"] == "ERROR"
+    assert "ValueError: bozuk" in entry["exc"]
+
+
+def test_debug_arguments_are_not_formatted_below_level():
+    """Seviye altındaki kayıtların argümanları hiç biçimlendirilmemeli"""
+    stream = io.StringIO()
+    setup_logging(level="INFO", levels="crud=DEBUG", log_format="json", stream=stream)
+    value = Expensive()
+    try:
+        logging.getLogger("analysis_jobs").debug("Değer: %s", value)
+        assert value.calls == 0
+
+        # Modül bazlı seviye DEBUG kayıtlarını açar
+        logging.getLogger("crud").debug("Değer: %s", value)
+    finally:
+        stop_logging()
+        logging.getLogger("crud").setLevel(logging.NOTSET)
+
+    # pytest'in kendi yakalama işleyicileri de biçimlendirebilir
+    assert value.calls >= 1
+    assert [entry["logger"] for entry in read_lines(stream)] == ["crud"]
+
+
+def _init_worker(path):
+    setup_worker_logging(level="INFO", levels="", log_format="json", stream=open(path, "a", encoding="utf-8"))
+
+
+def _warn_in_worker():
+    logging.getLogger("stl_analyzer").warning("İşçide uyarı")
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+    return [type(handler).__name__ for handler in logging.getLogger().handlers]
+
+
+def test_pool_worker_records_are_written(tmp_path):
+    """İşlem havuzundaki kayıtlar devralınan kuyrukta kalmamalı, akışa yazılmalı"""
+    path = str(tmp_path / "worker.log")
+    setup_logging(level="INFO", levels="", log_format="json", stream=io.StringIO())
+    try:
+        with ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(path,)) as executor:
+            handlers = executor.submit(_warn_in_worker).result()
+    finally:
+        stop_logging()
+
+    # pytest kendi işleyicilerini de ekleyebilir
+    assert "_QueueHandler" not in handlers
+    assert "StreamHandler" in handlers
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert [(e["logger"], e["msg"]) for e in entries] == [("stl_analyzer", "İşçide uyarı")]
+
+
+def test_stop_logging_detaches_queue_handler():
+    """stop_logging sonrası kök logger'da kuyruk işleyicisi kalmamalı"""
+    setup_logging(level="INFO", levels="", log_format="json", stream=io.StringIO())
+    assert len(logging.getLogger().handlers) >= 1
+    stop_logging()
+    assert not [h for h in logging.getLogger().handlers if type(h).__name__ == "_QueueHandler"]
+
+
+def test_parse_levels():
+    """Modül seviyeleri virgülle ayrılmış listeden okunmalı"""
+    assert parse_levels("crud=debug, sqlalchemy.engine=INFO,bozuk,") == {
+        "crud": "DEBUG", "sqlalchemy.engine": "INFO"
+    }
+    assert parse_levels("") == {}
+
+
+if __name__ == "__main__":
+    # Dosya yazan testler pytest'in geçici dizin fikstürünü kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
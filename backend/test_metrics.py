@@ -0,0 +1,96 @@
+import os
+
+from sqlalchemy import create_engine, text
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from metrics import Counter, Histogram, MetricsMiddleware, Registry, instrument_engine
+from stl_analyzer import STLAnalyzer
+
+
+def test_text_exposition_format():
+    """Sayaç ve histogramlar Prometheus metin biçiminde yazılmalı"""
+    registry = Registry()
+    requests = registry.register(Counter("test_requests_total", "İstekler", ("route",)))
+    latency = registry.register(Histogram("test_latency_seconds", "Süre", ("route",), buckets=(0.1, 1.0)))
+
+    requests.inc(route="/products/")
+    requests.inc(2, route="/products/")
+    latency.observe(0.05, route="/products/")
+    latency.observe(0.5, route="/products/")
+    latency.observe(5.0, route="/products/")
+
+    output = registry.render()
+    print(output)
+    assert "# TYPE test_requests_total counter" in output
+    assert 'test_requests_total{route="/products/"} 3' in output
+    assert 'test_latency_seconds_bucket{route="/products/",le="0.1"} 1' in output
+    assert 'test_latency_seconds_bucket{route="/products/",le="1.0"} 2' in output
+    assert 'test_latency_seconds_bucket{route="/products/",le="+Inf"} 3' in output
+    assert 'test_latency_seconds_count{route="/products/"} 3' in output
+
+
+def test_engine_query_metrics():
+    """Engine üzerindeki sorgular işlem türüne göre sayılmalı"""
+    import metrics
+
+    engine = instrument_engine(create_engine("sqlite://"))
+    before = metrics.db_queries_total.value(operation="SELECT")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    assert metrics.db_queries_total.value(operation="SELECT") == before + 2
+
+
+def test_streaming_request_metrics():
+    """Akış yanıtları parça parça iletilmeli, istek son parçadan sonra bir kez sayılmalı"""
+    import metrics
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    seen = []
+
+    async def lines():
+        for i in range(3):
+            # Önceki parçalar sayılmadan istemciye gitmiş olmalı
+            seen.append(metrics.http_requests_total.value(method="GET", route="/stream/{name}", status="200"))
+            yield f"{i}\n"
+
+    @app.get("/stream/{name}")
+    def stream(name: str):
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    before = metrics.http_requests_total.value(method="GET", route="/stream/{name}", status="200")
+    in_flight = metrics.http_requests_in_flight.value()
+    with TestClient(app) as client:
+        with client.stream("GET", "/stream/a") as response:
+            body = "".join(response.iter_text())
+        missing = client.get("/missing")
+
+    assert body == "0\n1\n2\n"
+    assert seen == [before] * 3
+    assert metrics.http_requests_total.value(method="GET", route="/stream/{name}", status="200") == before + 1
+    assert metrics.http_requests_total.value(method="GET", route="unmatched", status="404") >= 1
+    assert missing.status_code == 404
+    assert metrics.http_requests_in_flight.value() == in_flight
+
+
+def test_analysis_phase_timings():
+    """Analiz, ayrıştırma, geometri ve fiyatlandırma sürelerini ayrı ayrı bildirmeli"""
+    analyzer = STLAnalyzer()
+    result = analyzer.analyze_stl_file(os.path.join(os.path.dirname(__file__), "uploads", "test.stl"))
+    print(f"⏱️  Aşama süreleri: {analyzer.phase_timings}")
+
+    assert result is not None
+    assert set(analyzer.phase_timings) == {"parse", "geometry", "pricing"}
+    assert all(seconds >= 0 for seconds in analyzer.phase_timings.values())
+
+
+if __name__ == "__main__":
+    test_text_exposition_format()
+    test_engine_query_metrics()
+    test_streaming_request_metrics()
+    test_analysis_phase_timings()
+    print("✅ Metrik testleri başarılı")
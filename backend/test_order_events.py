@@ -0,0 +1,109 @@
+import asyncio
+import json
+import sys
+import threading
+
+import pytest
+
+import crud
+import schemas
+from order_events import OrderEventBus, customer_filter, format_sse, iter_sse, order_events
+
+
+def test_publish_from_worker_thread():
+    """Başka iş parçacığından yayınlanan olay yalnızca eşleşen aboneye ulaşmalı"""
+    async def scenario():
+        bus = OrderEventBus()
+        admin = bus.subscribe()
+        customer = bus.subscribe(customer_filter("Ali", "555"))
+
+        thread = threading.Thread(target=lambda: [
+            bus.publish({"type": "order_status", "order_id": 1, "customer_name": "Veli", "customer_phone": "444"}),
+            bus.publish({"type": "order_status", "order_id": 2, "customer_name": "Ali", "customer_phone": "555"}),
+        ])
+        thread.start()
+        thread.join()
+
+        first, second = await admin.get(timeout=1), await admin.get(timeout=1)
+        assert [first["order_id"], second["order_id"]] == [1, 2]
+        assert second["id"] > first["id"]
+
+        event = await customer.get(timeout=1)
+        assert event["order_id"] == 2
+        assert await customer.get(timeout=0.05) is None
+
+        admin.close()
+        customer.close()
+        assert bus.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_drops_oldest_and_replays_missed():
+    """Dolu kuyrukta en eski olay atılmalı; Last-Event-ID sonrası olaylar tekrar gelmeli"""
+    async def scenario():
+        bus = OrderEventBus()
+        slow = bus.subscribe(max_queue=2)
+        for order_id in range(1, 4):
+            bus.publish({"type": "order_status", "order_id": order_id})
+        await asyncio.sleep(0)
+
+        assert slow.dropped == 1
+        assert [(await slow.get(timeout=1))["order_id"] for _ in range(2)] == [2, 3]
+
+        replay = bus.subscribe(last_event_id=1)
+        assert [(await replay.get(timeout=1))["id"] for _ in range(2)] == [2, 3]
+
+    asyncio.run(scenario())
+
+
+def test_sse_stream_format():
+    """Akış yeniden deneme süresiyle başlamalı, olayları SSE biçiminde ve boşta keepalive göndermeli"""
+    event = {"id": 7, "type": "order_created", "order_id": 3, "customer_name": "Ayşe"}
+    text = format_sse(event)
+    print(f"📡 SSE: {text!r}")
+    assert text.startswith("id: 7\nevent: order_created\ndata: ")
+    assert text.endswith("\n\n")
+    assert json.loads(text.split("data: ", 1)[1]) == {"type": "order_created", "order_id": 3, "customer_name": "Ayşe"}
+
+    async def scenario():
+        bus = OrderEventBus()
+        subscription = bus.subscribe()
+        disconnected = iter([False, False, True])
+
+        async def is_disconnected():
+            return next(disconnected)
+
+        bus.publish({"type": "order_status", "order_id": 5})
+        chunks = [chunk async for chunk in iter_sse(subscription, is_disconnected, keepalive=0.01)]
+        assert chunks[0].startswith("retry: ")
+        assert chunks[1].startswith("id: 1\nevent: order_status")
+        assert chunks[2] == ": keepalive\n\n"
+        assert bus.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_crud_publishes_order_changes(db):
+    """Sipariş oluşturma ve durum güncellemesi olay yayınlamalı"""
+    async def scenario():
+        subscription = order_events.subscribe(customer_filter("Zeynep", "777"))
+        try:
+            order = crud.create_order(db, schemas.OrderCreate(
+                customer_name="Zeynep", customer_address="Adres", customer_phone="777", total_price=0, products=""
+            ))
+            crud.update_order_status(db, order.id, "Tamamlandı")
+
+            created = await subscription.get(timeout=1)
+            updated = await subscription.get(timeout=1)
+            assert (created["type"], created["order_id"]) == ("order_created", order.id)
+            assert (updated["type"], updated["status"]) == ("order_status", "Tamamlandı")
+        finally:
+            subscription.close()
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,130 @@
+import sys
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+import crud
+import models
+import schemas
+from migrations import backfill_order_items
+
+
+@pytest.fixture
+def db(db):
+    """conftest.py'deki oturuma iki ürün ekler"""
+    db.add_all([
+        models.Product(name="Vazo", description="", price=100.0, stock=10),
+        models.Product(name="Anahtarlık", description="", price=25.0, stock=3),
+    ])
+    db.commit()
+    return db
+
+
+def order_for(products):
+    return schemas.OrderCreate(
+        customer_name="Ali", customer_address="Adres", customer_phone="555",
+        total_price=0, products=products
+    )
+
+
+def test_order_creates_items_and_updates_stock(db):
+    """Sipariş kalemleri tabloya yazılmalı, stoklar tek seferde düşmeli"""
+    order = crud.create_order(db, order_for("1x2,2x1,1x1,99x4,bozuk"))
+
+    items = {item.product_id: (item.quantity, item.unit_price) for item in order.items}
+    assert items == {1: (3, 100.0), 2: (1, 25.0)}
+    assert crud.get_product(db, 1).stock == 7
+    assert crud.get_product(db, 2).stock == 2
+
+
+def test_insufficient_stock_rejects_whole_order(db):
+    """Stok yetmezse sipariş hiç oluşmamalı, diğer ürünlerin stoku da değişmemeli"""
+    crud.create_order(db, order_for("2x2"))
+
+    try:
+        crud.create_order(db, order_for("1x4,2x2"))
+        assert False, "Yetersiz stokta hata bekleniyordu"
+    except crud.InsufficientStockError as e:
+        print(f"🚫 {e}")
+        assert (e.product_id, e.requested, e.available) == (2, 2, 1)
+
+    assert crud.get_product(db, 1).stock == 10
+    assert crud.get_product(db, 2).stock == 1
+    assert db.query(models.Order).count() == 1
+    assert db.query(models.OrderItem).count() == 1
+
+
+def test_best_sellers_report(db):
+    """Rapor adet ve ciroyu SQL ile hesaplamalı, iptal edilenleri saymamalı"""
+    crud.create_order(db, order_for("2x2"))
+    crud.create_order(db, order_for("1x1,2x1"))
+    cancelled = crud.create_order(db, order_for("1x5"))
+    crud.update_order_status(db, cancelled.id, "İptal")
+
+    report = crud.get_best_sellers(db)
+    print(f"📊 En çok satanlar: {report}")
+    assert report[0] == {"product_id": 2, "product_name": "Anahtarlık", "quantity_sold": 3, "revenue": 75.0}
+    assert report[1]["quantity_sold"] == 1
+
+
+def test_backfill_old_orders(db_engine, db):
+    """Eski metin biçimli siparişlerden kalemler bir kez üretilmeli"""
+    db.add(models.Order(customer_name="Ali", customer_address="", customer_phone="555",
+                        total_price=0, products="1x2,2x1"))
+    db.add(models.Order(customer_name="Ali", customer_address="", customer_phone="555",
+                        total_price=0, products="Özel Tasarım", order_type="custom_design"))
+    db.commit()
+
+    assert backfill_order_items(db_engine) == 2
+    assert backfill_order_items(db_engine) == 0
+    assert db.query(models.OrderItem).count() == 2
+
+    # Bir kez çalıştıktan sonra kalemsiz siparişler her açılışta yeniden taranmamalı
+    db.add(models.Order(customer_name="Ali", customer_address="", customer_phone="555",
+                        total_price=0, products="1x1"))
+    db.commit()
+    assert backfill_order_items(db_engine) == 0
+
+
+def test_concurrent_backfill_does_not_duplicate(db_engine, db):
+    """Aynı anda başlayan iki işlem kalemleri çoğaltmamalı"""
+    db.add(models.Order(customer_name="Ali", customer_address="", customer_phone="555",
+                        total_price=0, products="1x2,2x1"))
+    db.commit()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(backfill_order_items(db_engine))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [0, 2]
+    assert db.query(models.OrderItem).count() == 2
+
+
+def test_backfill_survives_lock_timeout(db_engine, db):
+    """Kilit busy_timeout'tan uzun sürerse açılış hata vermemeli, göç sonra tamamlanmalı"""
+    db.add(models.Order(customer_name="Ali", customer_address="", customer_phone="555",
+                        total_price=0, products="1x2,2x1"))
+    db.commit()
+
+    # Başka bir işlemin uzun süren yazma işlemi
+    holder = db_engine.raw_connection()
+    holder.execute("BEGIN IMMEDIATE")
+    impatient = create_engine(str(db_engine.url), connect_args={"timeout": 0.05})
+    try:
+        assert backfill_order_items(impatient) == 0
+    finally:
+        holder.rollback()
+        holder.close()
+
+    assert db.query(models.OrderItem).count() == 0
+    assert backfill_order_items(impatient) == 2
+    impatient.dispose()
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,52 @@
+import sys
+
+import pytest
+
+import crud
+import models
+from pagination import InvalidCursorError, decode_cursor, encode_cursor, next_cursor
+
+
+def add_orders(db, order_count):
+    db.add_all([
+        models.Order(customer_name=f"Müşteri {i}", customer_address="", customer_phone="555",
+                     total_price=i, products="")
+        for i in range(order_count)
+    ])
+    db.commit()
+
+
+def test_cursor_round_trip():
+    """İmleç opak olmalı, bozuk imleçler reddedilmeli"""
+    cursor = encode_cursor(12345)
+    assert "12345" not in cursor
+    assert decode_cursor(cursor) == 12345
+
+    for bad in ("", "bozuk!", encode_cursor("12"), "eyJpZCI6dHJ1ZX0"):
+        try:
+            decode_cursor(bad)
+            assert False, f"Geçersiz imleç kabul edildi: {bad}"
+        except InvalidCursorError:
+            pass
+
+
+def test_keyset_pages_match_offset_pages(db):
+    """İmleçle gezilen sayfalar OFFSET sayfalarıyla aynı siparişleri vermeli"""
+    add_orders(db, 25)
+    keyset_ids, cursor = [], None
+    while True:
+        after_id = decode_cursor(cursor) if cursor else None
+        page = crud.get_orders(db, limit=10, after_id=after_id)
+        keyset_ids.append([order.id for order in page])
+        cursor = next_cursor(page, 10)
+        if cursor is None:
+            break
+
+    offset_ids = [[order.id for order in crud.get_orders(db, skip=skip, limit=10)] for skip in (0, 10, 20)]
+    print(f"📄 Sayfa boyutları: {[len(ids) for ids in keyset_ids]}")
+    assert keyset_ids == offset_ids
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,89 @@
+import asyncio
+import sys
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import crud_async
+import models
+import product_search
+from database import make_async_engine
+from product_search import build_match_query, ensure_product_search
+
+
+def make_catalog(engine, extra_products=0):
+    with engine.begin() as conn:
+        conn.execute(models.Product.__table__.insert(), [
+            {"name": "Kırmızı Işıklı Vazo", "description": "Salon için dekoratif vazo", "price": 120.0, "category": "ev"},
+            {"name": "İstanbul Silüeti", "description": "Duvar süsü", "price": 300.0, "category": "ev"},
+            {"name": "Ejderha Figürü", "description": "Kırmızı boyalı figür", "price": 80.0, "category": "oyuncak"},
+            {"name": "Anahtarlık", "description": "Kişiye özel anahtarlık", "price": 25.0, "category": "aksesuar"},
+        ] + [
+            {"name": f"Parça {i}", "description": f"Yedek parça numara {i}", "price": float(i % 500), "category": "parça"}
+            for i in range(extra_products)
+        ])
+    assert ensure_product_search(engine) is True
+    return str(engine.url)
+
+
+async def search(url, query, **filters):
+    engine = make_async_engine(url)
+    try:
+        async with async_sessionmaker(engine)() as db:
+            started = time.perf_counter()
+            products = await crud_async.search_products(db, query, **filters)
+            return [p.name for p in products], time.perf_counter() - started
+    finally:
+        await engine.dispose()
+
+
+def test_turkish_folding_and_prefix(db_engine):
+    """Türkçe karakterler ve büyük/küçük harf fark etmeden, kelime başıyla bulunmalı"""
+    url = make_catalog(db_engine)
+    assert build_match_query("IŞIK vazo!") == '"işik"* "vazo"*'
+
+    assert asyncio.run(search(url, "kirmizi"))[0] == ["Kırmızı Işıklı Vazo", "Ejderha Figürü"]
+    assert asyncio.run(search(url, "ISIKLI"))[0] == ["Kırmızı Işıklı Vazo"]
+    assert asyncio.run(search(url, "istanb"))[0] == ["İstanbul Silüeti"]
+    assert asyncio.run(search(url, "kırmızı", category="oyuncak"))[0] == ["Ejderha Figürü"]
+    assert asyncio.run(search(url, "kirmizi", max_price=100))[0] == ["Ejderha Figürü"]
+    assert asyncio.run(search(url, "***"))[0] == []
+
+
+def test_index_follows_product_changes(db_engine):
+    """Tetikleyiciler ürün ekleme, güncelleme ve silmede dizini güncel tutmalı"""
+    url = make_catalog(db_engine)
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE products SET name = 'Mavi Vazo' WHERE name = 'Kırmızı Işıklı Vazo'")
+        conn.exec_driver_sql("DELETE FROM products WHERE name = 'Anahtarlık'")
+        conn.exec_driver_sql("INSERT INTO products (name, description, price) VALUES ('Çiçeklik', 'Balkon', 40)")
+
+    assert asyncio.run(search(url, "mavi"))[0] == ["Mavi Vazo"]
+    assert asyncio.run(search(url, "anahtarlik"))[0] == []
+    assert asyncio.run(search(url, "ciceklik"))[0] == ["Çiçeklik"]
+
+
+def test_search_speed_on_large_catalog(db_engine):
+    """Büyük katalogda arama dizinden yapılmalı"""
+    url = make_catalog(db_engine, extra_products=20000)
+    asyncio.run(search(url, "vazo"))
+    names, elapsed = asyncio.run(search(url, "vazo"))
+    print(f"🔎 20.000 ürün içinde arama: {elapsed * 1000:.2f} ms")
+    assert names == ["Kırmızı Işıklı Vazo"]
+    assert elapsed < 0.05
+
+
+def test_like_fallback(db_engine):
+    """FTS5 yoksa LIKE ile arama yapılmalı"""
+    url = make_catalog(db_engine)
+    product_search.fts_enabled = False
+    try:
+        assert asyncio.run(search(url, "vazo"))[0] == ["Kırmızı Işıklı Vazo"]
+    finally:
+        product_search.fts_enabled = True
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,139 @@
+import asyncio
+import sys
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import crud
+import crud_async
+import models
+import schemas
+from database import make_async_engine
+
+
+@pytest.fixture
+def db(db):
+    """conftest.py'deki oturuma kullanıcı, admin ve ürünler ekler"""
+    db.add(models.User(username="ali", email="ali@example.com", password_hash="x", full_name="Ali", phone="555"))
+    db.add(models.Admin(username="admin", password_hash="x"))
+    db.add_all([
+        models.Product(name=f"Ürün {i}", description="", price=10.0, stock=100, category="ev")
+        for i in range(5)
+    ])
+    db.commit()
+    return db
+
+
+def capture_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Toplu ifadelerin planı ilk parametre kümesiyle incelenir
+        statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def query_plan(engine, statement, parameters):
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan):
+    # "SCAN tablo" tam tablo taramasıdır; kapsayan indeks taraması da tüm indeksi okur
+    return [step for step in plan if step.startswith("SCAN ")]
+
+
+def check_plans(engine, statements, name, failures):
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            continue
+        plan = query_plan(engine, statement, parameters)
+        print(f"🔍 {name}: {' | '.join(plan)}")
+        if full_scans(plan):
+            failures.append(f"{name}: {' | '.join(plan)}\n    {statement}")
+
+
+def test_hot_queries_use_indexes(db_engine, db):
+    """Sık çalışan crud sorguları tablo taraması yapmamalı"""
+    hot_queries = {
+        "kullanıcı adı": lambda: crud.get_user_by_username(db, "ali"),
+        "e-posta": lambda: crud.get_user_by_email(db, "ali@example.com"),
+        "admin": lambda: crud.get_admin_by_username(db, "admin"),
+        "sepete ekle": lambda: crud.add_to_user_cart(db, 1, 2, 1),
+        "sipariş": lambda: crud.create_order(db, schemas.OrderCreate(
+            customer_name="Ali", customer_address="Adres", customer_phone="555",
+            total_price=10.0, products="1x1,2x1"
+        )),
+        "sipariş sayfası": lambda: crud.get_orders(db, limit=10, after_id=1),
+        "müşteri siparişleri": lambda: crud.get_user_orders(db, "Ali", "555"),
+        "tasarım": lambda: crud.get_custom_design_by_id(db, 1),
+        "tasarım sayfası": lambda: crud.get_custom_designs(db, limit=10, after_id=1),
+    }
+
+    statements = capture_statements(db_engine)
+    failures = []
+    for name, run in hot_queries.items():
+        del statements[:]
+        db.expire_all()
+        run()
+        check_plans(db_engine, statements, name, failures)
+
+    assert not failures, "Tablo taraması yapan sorgular:\n" + "\n".join(failures)
+
+
+async def run_async_queries(url, hot_queries):
+    """Asenkron sorguları çalıştırır, her birinin SQL ifadelerini toplar"""
+    engine = make_async_engine(url)
+    try:
+        statements = capture_statements(engine.sync_engine)
+        captured = {}
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            for name, run in hot_queries.items():
+                del statements[:]
+                await run(db)
+                captured[name] = list(statements)
+        return captured
+    finally:
+        await engine.dispose()
+
+
+def test_async_hot_queries_use_indexes(db_engine, db):
+    """Ürün ve sepet uç noktalarının asenkron sorguları tablo taraması yapmamalı"""
+    crud.add_to_user_cart(db, 1, 2, 1)
+    hot_queries = {
+        "admin": lambda adb: crud_async.get_admin_by_username(adb, "admin"),
+        "sepet": lambda adb: crud_async.get_user_cart(adb, 1),
+        "ürün": lambda adb: crud_async.get_product(adb, 3),
+        # Önbellek araya girmesin diye doğrudan veritabanı sorgusu
+        "kategori": lambda adb: crud_async.query_products(adb, category="ev"),
+        "ürün sayfası": lambda adb: crud_async.query_products(adb, limit=2, after_id=2),
+        "stok": lambda adb: crud_async.update_product_stock(adb, 4, 50),
+        "ürün sil": lambda adb: crud_async.delete_product(adb, 5),
+    }
+
+    captured = asyncio.run(run_async_queries(str(db_engine.url), hot_queries))
+    failures = []
+    for name, statements in captured.items():
+        assert statements, f"{name}: sorgu çalışmadı"
+        check_plans(db_engine, statements, name, failures)
+
+    assert not failures, "Tablo taraması yapan sorgular:\n" + "\n".join(failures)
+
+
+def test_customer_order_lookup_needs_no_sort(db_engine, db):
+    """Müşteri sipariş geçmişi indeks sırasıyla okunmalı, ayrıca sıralanmamalı"""
+    statements = capture_statements(db_engine)
+    crud.get_user_orders(db, "Ali", "555")
+
+    plan = query_plan(db_engine, *statements[-1])
+    assert any("ix_orders_customer_lookup" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+
+if __name__ == "__main__":
+    # Veritabanı testleri conftest.py'deki fikstürleri kullanır
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,52 @@
+import os
+
+import stl_analyzer
+from stl_analyzer import STLAnalyzer
+
+
+def test_quote_matrix_matches_single_analysis():
+    """Tablodaki her seçenek tek tek analizle aynı sonucu vermeli"""
+    analyzer = STLAnalyzer()
+    test_file = os.path.join(os.path.dirname(__file__), "uploads", "test.stl")
+
+    quotes = analyzer.quote_matrix(test_file)
+    print(f"📊 Seçenek sayısı: {len(quotes)}")
+    assert len(quotes) == len(analyzer.filament_densities) * len(analyzer.infill_ratios)
+
+    for quote in quotes:
+        single = analyzer.analyze_stl_file(test_file, quote['filament_type'], quote['infill_ratio'])
+        assert quote['weight_grams'] == single['weight_grams']
+        assert quote['print_time_hours'] == single['print_time_hours']
+        assert quote['sales_price'] == single['sales_price']
+
+
+def test_file_is_parsed_once():
+    """Geometri ve katmanlar aynı ayrıştırmadan hesaplanmalı, sonuç yeniden okumayla aynı olmalı"""
+    analyzer = STLAnalyzer()
+    test_file = os.path.join(os.path.dirname(__file__), "uploads", "test.stl")
+    reads = []
+    iter_stl_triangles = stl_analyzer.iter_stl_triangles
+    stl_analyzer.iter_stl_triangles = lambda path, *args: reads.append(path) or iter_stl_triangles(path, *args)
+    try:
+        analyzer.analyze_stl_file(test_file)
+        assert len(reads) == 1
+        analyzer.quote_matrix(test_file)
+        assert len(reads) == 2
+
+        # Bellek sınırı aşılınca parçalar tutulmaz, katmanlar dosyadan okunur
+        geometry, chunks = analyzer.load_mesh(test_file, max_retained_bytes=0)
+        assert chunks is None
+        from_file = analyzer.slice_layers(test_file, geometry)
+    finally:
+        stl_analyzer.iter_stl_triangles = iter_stl_triangles
+
+    geometry, chunks = analyzer.load_mesh(test_file)
+    from_chunks = analyzer.slice_layers(test_file, geometry, chunks=chunks)
+    assert from_chunks['layer_count'] == from_file['layer_count']
+    assert list(from_chunks['areas_mm2']) == list(from_file['areas_mm2'])
+
+
+if __name__ == "__main__":
+    test_quote_matrix_matches_single_analysis()
+    test_file_is_parsed_once()
+    print("✅ Fiyat tablosu testleri başarılı")
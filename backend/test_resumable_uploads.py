@@ -0,0 +1,91 @@
+import hashlib
+import os
+import tempfile
+import time
+
+from resumable_uploads import ResumableUploadStore, UploadOffsetError, UploadSessionNotFoundError
+
+
+def test_upload_resumes_from_received_offset():
+    """Kopan yükleme alınan bayttan devam etmeli ve özetle kaydedilmeli"""
+    payload = os.urandom(3000)
+
+    with tempfile.TemporaryDirectory() as uploads_dir:
+        store = ResumableUploadStore(staging_dir=os.path.join(uploads_dir, ".partial"),
+                                     uploads_dir=uploads_dir)
+        upload = store.create("parca.stl", len(payload))
+        upload_id = upload["upload_id"]
+
+        store.write_chunk(upload_id, 0, payload[:1000])
+        # Aynı parçanın tekrar gönderilmesi sorun olmamalı
+        store.write_chunk(upload_id, 0, payload[:1000])
+
+        # Boşluk bırakan parça reddedilmeli
+        try:
+            store.write_chunk(upload_id, 2000, payload[2000:])
+        except UploadOffsetError as e:
+            assert e.received_bytes == 1000
+        else:
+            raise AssertionError("Boşluklu parça kabul edildi")
+
+        # Eksik yükleme tamamlanamamalı
+        try:
+            store.finalize(upload_id)
+        except UploadOffsetError:
+            pass
+        else:
+            raise AssertionError("Eksik yükleme tamamlandı")
+
+        received = store.status(upload_id)["received_bytes"]
+        print(f"🔁 Devam edilen konum: {received}")
+        store.write_chunk(upload_id, received, payload[received:])
+
+        stored_name, file_hash, size, original_filename = store.finalize(upload_id)
+        assert file_hash == hashlib.sha256(payload).hexdigest()
+        assert stored_name == f"{file_hash}.stl"
+        assert size == len(payload)
+        assert original_filename == "parca.stl"
+        assert os.listdir(os.path.join(uploads_dir, ".partial")) == []
+
+
+def test_unknown_ids_do_not_create_locks():
+    """Olmayan yükleme kimlikleri kilit sözlüğünü büyütmemeli"""
+    with tempfile.TemporaryDirectory() as uploads_dir:
+        store = ResumableUploadStore(staging_dir=os.path.join(uploads_dir, ".partial"),
+                                     uploads_dir=uploads_dir)
+        for upload_id in ("abc123", "def456"):
+            try:
+                store.write_chunk(upload_id, 0, b"x")
+            except UploadSessionNotFoundError:
+                continue
+            raise AssertionError("Olmayan yüklemeye yazıldı")
+        assert store._locks == {}
+
+
+def test_cleanup_ages_uploads_by_part_file():
+    """Devam eden yükleme .json eski olsa da silinmemeli; eskiyen yükleme tüm dosyalarıyla silinmeli"""
+    with tempfile.TemporaryDirectory() as uploads_dir:
+        staging_dir = os.path.join(uploads_dir, ".partial")
+        store = ResumableUploadStore(staging_dir=staging_dir, uploads_dir=uploads_dir)
+        active = store.create("aktif.stl", 10)["upload_id"]
+        stale = store.create("eski.stl", 10)["upload_id"]
+        store.write_chunk(active, 0, b"12345")
+        store.write_chunk(stale, 0, b"12345")
+
+        two_days_ago = time.time() - 2 * 24 * 60 * 60
+        # Aktif yüklemenin yalnızca bilgi dosyası eski; eski yüklemenin iki dosyası da eski
+        os.utime(os.path.join(staging_dir, f"{active}.json"), (two_days_ago, two_days_ago))
+        for name in (f"{stale}.json", f"{stale}.part"):
+            os.utime(os.path.join(staging_dir, name), (two_days_ago, two_days_ago))
+
+        assert store.cleanup_stale() == 1
+        assert sorted(os.listdir(staging_dir)) == sorted([f"{active}.json", f"{active}.part"])
+        assert store.status(active)["received_bytes"] == 5
+        assert stale not in store._locks
+
+
+if __name__ == "__main__":
+    test_upload_resumes_from_received_offset()
+    test_unknown_ids_do_not_create_locks()
+    test_cleanup_ages_uploads_by_part_file()
+    print("✅ Parçalı yükleme testleri başarılı")
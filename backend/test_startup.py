@@ -0,0 +1,22 @@
+from bench_startup import measure_import
+
+
+def test_api_does_not_load_geometry_stack():
+    """API modülleri numpy ve STL analiz modüllerini yüklememeli"""
+    for module in ("crud", "analysis_jobs", "batch_analysis"):
+        report = measure_import(module)
+        print(f"⏱️  {module}: {report['wall_seconds'] * 1000:.0f} ms")
+        assert report["module_count"] > 0
+        assert report["heavy_modules"] == []
+
+
+def test_worker_loads_geometry_stack():
+    """Analiz modülü ölçümde ağır modülleri göstermeli"""
+    report = measure_import("stl_analyzer")
+    assert "numpy" in report["heavy_modules"]
+
+
+if __name__ == "__main__":
+    test_api_does_not_load_geometry_stack()
+    test_worker_loads_geometry_stack()
+    print("✅ Başlangıç süresi testleri başarılı")
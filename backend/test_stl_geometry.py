@@ -0,0 +1,56 @@
+import numpy as np
+from stl_analyzer import compute_mesh_properties, geometry_volume_cm3
+
+# 10 mm'lik küp, normaller dışa bakacak şekilde
+CUBE_CORNERS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=np.float32) * 10
+CUBE_FACES = [
+    [0, 2, 1], [0, 3, 2], [4, 5, 6], [4, 6, 7],
+    [0, 1, 5], [0, 5, 4], [1, 2, 6], [1, 6, 5],
+    [2, 3, 7], [2, 7, 6], [3, 0, 4], [3, 4, 7],
+]
+
+
+def cube_vectors(offset=0.0):
+    return CUBE_CORNERS[np.array(CUBE_FACES)] + np.float32(offset)
+
+
+def test_closed_cube():
+    """Kapalı küpte hacim, alan ve sınır kutusu tam çıkmalı"""
+    geometry = compute_mesh_properties(cube_vectors(offset=-3.0))
+    print(f"📊 Küp geometrisi: {geometry}")
+
+    assert abs(geometry['volume_mm3'] - 1000.0) < 1e-6
+    assert abs(geometry['surface_area_mm2'] - 600.0) < 1e-6
+    assert geometry['bbox_min'] == [-3.0, -3.0, -3.0]
+    assert geometry['bbox_max'] == [7.0, 7.0, 7.0]
+    assert geometry['triangle_count'] == 12
+    assert geometry['is_watertight']
+    assert abs(geometry_volume_cm3(geometry) - 1.0) < 1e-9
+
+
+def test_open_mesh_falls_back_to_bbox():
+    """Açık yüzeyde hacim sınır kutusu tahminine düşmeli"""
+    geometry = compute_mesh_properties(cube_vectors()[:-1])
+    print(f"📊 Açık küp geometrisi: {geometry}")
+
+    assert not geometry['is_watertight']
+    assert abs(geometry_volume_cm3(geometry) - 0.3) < 1e-9
+
+
+def test_flipped_mesh_volume_is_positive():
+    """Ters yönlendirilmiş küpte de hacim pozitif olmalı"""
+    geometry = compute_mesh_properties(cube_vectors()[:, ::-1, :])
+
+    assert geometry['is_watertight']
+    assert geometry['volume_mm3'] < 0
+    assert abs(geometry_volume_cm3(geometry) - 1.0) < 1e-9
+
+
+if __name__ == "__main__":
+    test_closed_cube()
+    test_open_mesh_falls_back_to_bbox()
+    test_flipped_mesh_volume_is_positive()
+    print("✅ Geometri testleri başarılı")
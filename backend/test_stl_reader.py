@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+import numpy as np
+
+import stl_reader
+from stl_reader import BINARY_RECORD_DTYPE, is_binary_stl, iter_stl_triangles
+from test_stl_geometry import cube_vectors
+
+
+def write_binary_stl(path, vectors):
+    records = np.zeros(len(vectors), dtype=BINARY_RECORD_DTYPE)
+    records['vertices'] = vectors
+    with open(path, 'wb') as f:
+        # Bazı dışa aktarıcılar binary başlığa da "solid" yazar
+        f.write(b'solid binary'.ljust(80, b' '))
+        f.write(np.uint32(len(vectors)).tobytes())
+        f.write(records.tobytes())
+
+
+def write_ascii_stl(path, vectors):
+    with open(path, 'w') as f:
+        f.write("solid test\n")
+        for triangle in vectors:
+            f.write("  facet normal 0 0 0\n    outer loop\n")
+            for x, y, z in triangle:
+                f.write(f"      vertex {x:e} {y:e} {z:e}\n")
+            f.write("    endloop\n  endfacet\n")
+        f.write("endsolid test\n")
+
+
+def test_binary_and_ascii_read_same_triangles():
+    """Binary ve ASCII okuyucu aynı üçgenleri parça parça döndürmeli"""
+    vectors = cube_vectors(offset=1.5)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        binary_path = os.path.join(tmp_dir, "cube_binary.stl")
+        ascii_path = os.path.join(tmp_dir, "cube_ascii.stl")
+        write_binary_stl(binary_path, vectors)
+        write_ascii_stl(ascii_path, vectors)
+
+        assert is_binary_stl(binary_path)
+        assert not is_binary_stl(ascii_path)
+
+        binary_chunks = list(iter_stl_triangles(binary_path, chunk_triangles=5))
+        assert [len(c) for c in binary_chunks] == [5, 5, 2]
+        assert np.array_equal(np.concatenate(binary_chunks), vectors)
+
+        # Blok sınırlarının satır ortasına denk gelmesi için küçük blok boyutu
+        original_read_bytes = stl_reader.ASCII_READ_BYTES
+        stl_reader.ASCII_READ_BYTES = 37
+        try:
+            ascii_chunks = list(iter_stl_triangles(ascii_path, chunk_triangles=5))
+        finally:
+            stl_reader.ASCII_READ_BYTES = original_read_bytes
+
+        print(f"📊 ASCII parça boyutları: {[len(c) for c in ascii_chunks]}")
+        assert np.allclose(np.concatenate(ascii_chunks), vectors)
+
+
+if __name__ == "__main__":
+    test_binary_and_ascii_read_same_triangles()
+    print("✅ STL okuyucu testleri başarılı")
@@ -0,0 +1,50 @@
+import numpy as np
+
+from stl_analyzer import STLAnalyzer, compute_mesh_properties
+from stl_slicer import LayerSlicer
+from test_stl_geometry import cube_vectors
+
+
+def slice_vectors(vectors, layer_height=0.2):
+    geometry = compute_mesh_properties(vectors)
+    slicer = LayerSlicer(layer_height, geometry['bbox_min'], geometry['bbox_max'])
+    # Küçük parçalarla eklemek tek seferde eklemekle aynı sonucu vermeli
+    for start in range(0, len(vectors), 5):
+        slicer.add(vectors[start:start + 5])
+    return slicer.result()
+
+
+def test_cube_cross_sections():
+    """10 mm küpün her katmanı 40 mm çevre ve 100 mm² alan vermeli"""
+    layers = slice_vectors(cube_vectors(offset=2.5))
+    print(f"📐 Katman sayısı: {layers['layer_count']}")
+
+    assert layers['layer_count'] == 50
+    assert np.allclose(layers['perimeters_mm'], 40.0)
+    assert np.allclose(layers['areas_mm2'], 100.0)
+
+
+def test_flipped_cube_has_positive_area():
+    """Ters yönlendirilmiş yüzeyde de kesit alanı pozitif olmalı"""
+    layers = slice_vectors(cube_vectors()[:, ::-1, :])
+
+    assert np.allclose(layers['areas_mm2'], 100.0)
+
+
+def test_print_time_grows_with_infill():
+    """Dolgu oranı arttıkça baskı süresi artmalı"""
+    analyzer = STLAnalyzer()
+    layers = slice_vectors(cube_vectors())
+
+    low = analyzer.estimate_layer_print_time(layers, infill_ratio=0.15)
+    high = analyzer.estimate_layer_print_time(layers, infill_ratio=0.95)
+    print(f"⏱️ Baskı süresi: {low:.3f} - {high:.3f} saat")
+
+    assert 0 < low < high
+
+
+if __name__ == "__main__":
+    test_cube_cross_sections()
+    test_flipped_cube_has_positive_area()
+    test_print_time_grows_with_infill()
+    print("✅ Katman dilimleme testleri başarılı")
@@ -0,0 +1,48 @@
+import hashlib
+import io
+import os
+import tempfile
+
+from upload_storage import UploadTooLargeError, save_upload_stream
+
+
+def test_upload_is_streamed_and_content_addressed():
+    """Dosya parça parça yazılmalı ve içerik özetiyle adlandırılmalı"""
+    payload = os.urandom(10_000)
+    expected_hash = hashlib.sha256(payload).hexdigest()
+
+    with tempfile.TemporaryDirectory() as uploads_dir:
+        stored_name, file_hash, size = save_upload_stream(
+            io.BytesIO(payload), uploads_dir=uploads_dir, chunk_size=1024
+        )
+        print(f"💾 Kayıt adı: {stored_name}")
+
+        assert file_hash == expected_hash
+        assert stored_name == f"{expected_hash}.stl"
+        assert size == len(payload)
+
+        # Aynı içerik ikinci kez yüklendiğinde tek dosya kalmalı
+        assert save_upload_stream(io.BytesIO(payload), uploads_dir=uploads_dir)[0] == stored_name
+        assert os.listdir(uploads_dir) == [stored_name]
+        with open(os.path.join(uploads_dir, stored_name), "rb") as f:
+            assert f.read() == payload
+
+
+def test_upload_aborts_over_limit():
+    """Sınır aşıldığında kopyalama durmalı ve geçici dosya kalmamalı"""
+    with tempfile.TemporaryDirectory() as uploads_dir:
+        try:
+            save_upload_stream(io.BytesIO(b"x" * 5000), uploads_dir=uploads_dir,
+                               max_bytes=4096, chunk_size=1024)
+        except UploadTooLargeError as e:
+            print(f"⛔ Beklenen hata: {e}")
+        else:
+            raise AssertionError("Boyut sınırı uygulanmadı")
+
+        assert os.listdir(uploads_dir) == []
+
+
+if __name__ == "__main__":
+    test_upload_is_streamed_and_content_addressed()
+    test_upload_aborts_over_limit()
+    print("✅ Yükleme testleri başarılı")
@@ -0,0 +1,68 @@
+import hashlib
+import os
+import tempfile
+
+# Yüklenen dosyaların klasörü; test ve ölçümlerde geçici bir klasör verilebilir
+UPLOADS_DIR = os.environ.get("UPLOADS_DIR", os.path.join(os.path.dirname(__file__), "uploads"))
+
+# Tek seferde kopyalanacak parça boyutu
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Kabul edilecek en büyük dosya boyutu (bayt)
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+def content_addressed_name(file_hash):
+    """Dosya içeriğinin özetinden kayıt adı üretir"""
+    return f"{file_hash}.stl"
+
+
+def store_content_addressed(temp_path, file_hash, uploads_dir=UPLOADS_DIR):
+    """Geçici dosyayı içerik özetine göre adlandırılmış yerine taşır"""
+    stored_name = content_addressed_name(file_hash)
+    stored_path = os.path.join(uploads_dir, stored_name)
+    if os.path.exists(stored_path):
+        # Aynı içerik zaten kayıtlı, kopyaya gerek yok
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, stored_path)
+    return stored_name
+
+
+def save_upload_stream(source, uploads_dir=UPLOADS_DIR, max_bytes=MAX_UPLOAD_BYTES,
+                       chunk_size=UPLOAD_CHUNK_SIZE):
+    """Yüklenen dosyayı parça parça diske yazar ve SHA-256 özetini yolda hesaplar
+
+    Bellek kullanımı dosya boyutundan bağımsız olarak bir parça kadardır;
+    boyut sınırı aşıldığında kopyalama hemen durdurulur ve geçici dosya
+    silinir. Dönüş: (kayıt adı, özet, boyut)
+    """
+    os.makedirs(uploads_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, temp_path = tempfile.mkstemp(prefix=".upload-", suffix=".part", dir=uploads_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Dosya boyutu sınırı aşıldı ({max_bytes / 1024 / 1024:.0f} MB)"
+                    )
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    file_hash = digest.hexdigest()
+    stored_name = store_content_addressed(temp_path, file_hash, uploads_dir)
+    return stored_name, file_hash, size
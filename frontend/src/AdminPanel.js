@@ -53,6 +53,27 @@ function AdminPanel() {
     }
   }, [adminUser, isLoading]);
 
+  // Sipariş değişikliklerini sunucudan canlı olarak al (Server-Sent Events)
+  useEffect(() => {
+    if (!adminUser) return;
+
+    const events = new EventSource("http://localhost:8000/orders/events");
+
+    events.addEventListener("order_status", (e) => {
+      const event = JSON.parse(e.data);
+      setOrders(prev => prev.map(order =>
+        order.id === event.order_id ? { ...order, status: event.status } : order
+      ));
+    });
+    events.addEventListener("order_created", () => fetchOrders());
+    events.addEventListener("custom_design_created", () => {
+      fetchCustomDesigns();
+      fetchOrders();
+    });
+
+    return () => events.close();
+  }, [adminUser]);
+
   const fetchCustomDesigns = async () => {
     try {
       const response = await axios.get("http://localhost:8000/custom-designs/");
@@ -74,8 +95,8 @@ function AdminPanel() {
   const updateOrderStatus = async (orderId, status) => {
     try {
       await axios.put(`http://localhost:8000/orders/${orderId}/status?status=${status}`);
-      // Siparişleri yeniden yükle
-      fetchOrders();
+      // Listeyi yeniden yüklemek yerine yalnızca bu siparişi güncelle
+      setOrders(prev => prev.map(order => order.id === orderId ? { ...order, status } : order));
     } catch (error) {
       console.error("Sipariş durumu güncellenemedi:", error);
     }
@@ -20,6 +20,21 @@ function CustomDesignForm() {
     }
   };
 
+  // Analiz işi tamamlanana kadar sonucu sorgula
+  const waitForAnalysis = async (jobId) => {
+    for (let attempt = 0; attempt < 60; attempt++) {
+      const response = await axios.get(`http://localhost:8000/analysis-jobs/${jobId}`);
+      if (response.data.status === "Tamamlandı") {
+        setAnalysis(response.data.result);
+        return;
+      }
+      if (response.data.status === "Hata") {
+        return;
+      }
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     if (!file) {
@@ -38,9 +53,13 @@ function CustomDesignForm() {
         headers: { "Content-Type": "multipart/form-data" }
       });
 
-      // Analiz sonuçlarını kaydet
+      // Analiz sonuçlarını kaydet, hazır değilse arka planda bekle
       if (uploadResponse.data.analysis) {
         setAnalysis(uploadResponse.data.analysis);
+      } else if (uploadResponse.data.analysis_job_id) {
+        waitForAnalysis(uploadResponse.data.analysis_job_id).catch(error => {
+          console.error("Analiz sonucu alınamadı:", error);
+        });
       }
 
       // Sonra custom design kaydını oluştur
@@ -49,6 +68,7 @@ function CustomDesignForm() {
         customer_phone: phone,
         description: description,
         file_path: uploadResponse.data.filename,
+        original_filename: uploadResponse.data.original_filename,
         created_at: new Date().toISOString()
       };
 
@@ -62,7 +82,6 @@ function CustomDesignForm() {
       setPhone("");
       setDescription("");
       setFile(null);
-      setAnalysis(null);
     } catch (error) {
       console.error("Gönderim hatası:", error);
       if (error.response && error.response.data && error.response.data.detail) {
@@ -125,6 +144,30 @@ function CustomDesignForm() {
               <span className="analysis-value">{analysis.sales_price} TL</span>
             </div>
           </div>
+          {analysis.quotes && (
+            <table className="quote-table">
+              <thead>
+                <tr>
+                  <th>Filament</th>
+                  <th>Doluluk</th>
+                  <th>Ağırlık</th>
+                  <th>Süre</th>
+                  <th>Fiyat</th>
+                </tr>
+              </thead>
+              <tbody>
+                {analysis.quotes.map(quote => (
+                  <tr key={`${quote.filament_type}-${quote.infill}`}>
+                    <td>{quote.filament_type}</td>
+                    <td>{quote.infill}</td>
+                    <td>{quote.weight_grams.toFixed(1)} g</td>
+                    <td>{quote.print_time_hours.toFixed(1)} saat</td>
+                    <td>{quote.sales_price} TL</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          )}
           <p className="analysis-note">
             * Bu değerler tahminidir. Gerçek değerler baskı ayarlarına göre değişebilir.
           </p>
@@ -25,9 +25,34 @@ function MyOrders() {
     }
   }, []);
 
-  const fetchOrders = async (customerName, customerPhone) => {
+  // Sipariş değişikliklerini sunucudan canlı olarak al (Server-Sent Events)
+  useEffect(() => {
+    if (!userData) return;
+
+    const events = new EventSource(
+      `http://localhost:8000/user/orders/${encodeURIComponent(userData.full_name)}/${encodeURIComponent(userData.phone)}/events`
+    );
+
+    events.addEventListener("order_status", (e) => {
+      const event = JSON.parse(e.data);
+      setOrders(prev => prev.map(order =>
+        order.id === event.order_id ? { ...order, status: event.status } : order
+      ));
+    });
+
+    const onOrderCreated = () => {
+      // Yeni siparişin tüm alanları için listeyi bir kez yenile
+      fetchOrders(userData.full_name, userData.phone, false);
+    };
+    events.addEventListener("order_created", onOrderCreated);
+    events.addEventListener("custom_design_created", onOrderCreated);
+
+    return () => events.close();
+  }, [userData]);
+
+  const fetchOrders = async (customerName, customerPhone, showLoading = true) => {
     try {
-      setLoading(true);
+      if (showLoading) setLoading(true);
       const response = await axios.get(`http://localhost:8000/user/orders/${encodeURIComponent(customerName)}/${encodeURIComponent(customerPhone)}`);
       setOrders(response.data.orders);
     } catch (error) {